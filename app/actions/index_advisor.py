@@ -0,0 +1,333 @@
+"""
+Советник по индексам: сравнивает модели (`Base.metadata`) с живой БД.
+
+Находит:
+    - внешние ключи без индекса (удаление/обновление родительской строки с ON DELETE CASCADE
+      сканирует всю дочернюю таблицу);
+    - поля, по которым фильтрует `CrudManager` (`get_all_by_field`, `get_by_fields`,
+      `get_all_by_field_with_relations`, `update_many`, `delete_many`), без индекса.
+
+Поле считается проиндексированным, если оно первое в каком-либо индексе,
+уникальном ограничении или первичном ключе таблицы в БД.
+
+Запуск (из каталога app):
+    python -m actions.index_advisor            # только отчёт
+    python -m actions.index_advisor --write    # отчёт и ревизия Alembic с недостающими индексами
+"""
+
+import argparse
+import ast
+import asyncio
+import logging
+import warnings
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+from alembic.autogenerate import render_python_code
+from alembic.config import Config
+from alembic.operations import ops
+from alembic.script import ScriptDirectory
+from alembic.util import rev_id
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core import db_helper
+from core.config import BASE_DIR, settings
+from models import Base
+
+log = logging.getLogger(__name__)
+
+
+# Методы CrudManager, фильтрующие по полям модели
+CRUD_FILTER_METHODS = (
+    "get_all_by_field",
+    "get_all_by_field_with_relations",
+    "get_by_fields",
+    "update_many",
+    "delete_many",
+)
+
+# Методы, принимающие фильтры именованными аргументами (`поле=значение`)
+CRUD_KEYWORD_FILTER_METHODS = ("get_by_fields", "update_many", "delete_many")
+
+
+class IndexSuggestion:
+    """
+    Недостающий индекс.
+
+    Attributes:
+        table (str): Таблица
+        column (str): Поле
+        reason (str): Почему нужен индекс
+    """
+
+    __slots__ = ("table", "column", "reason")
+
+    def __init__(self, table: str, column: str, reason: str) -> None:
+        self.table = table
+        self.column = column
+        self.reason = reason
+
+    @property
+    def index_name(self) -> str:
+        # Совпадает с naming_convention: "ix_%(column_0_label)s"
+        return f"ix_{self.table}_{self.column}"
+
+    def __repr__(self) -> str:
+        return f"{self.table}.{self.column} ({self.reason})"
+
+
+def collect_crud_filters(paths: Iterable[Path]) -> set[tuple[str, str]]:
+    """
+    Находит в исходном коде поля, по которым фильтрует `CrudManager`.
+
+    Учитываются вызовы вида `CrudManager(session, Model).get_by_fields(field=...)`
+    и `manager = CrudManager(session, Model)` с последующим `manager.get_all_by_field("field", ...)`.
+
+    Args:
+        paths (Iterable[Path]): Файлы с исходным кодом
+
+    Returns:
+        set[tuple[str, str]]: Пары (имя модели, поле)
+    """
+    filters: set[tuple[str, str]] = set()
+    for path in paths:
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+
+        managers: dict[str, str] = {}  # имя переменной -> модель
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign) and len(node.targets) == 1:
+                model = _crud_manager_model(node.value)
+                target = node.targets[0]
+                if model and isinstance(target, (ast.Name, ast.Attribute)):
+                    managers[ast.unparse(target)] = model
+
+        for node in ast.walk(tree):
+            if not (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in CRUD_FILTER_METHODS
+            ):
+                continue
+            owner = node.func.value
+            model = _crud_manager_model(owner) or managers.get(ast.unparse(owner))
+            if model is None:
+                continue
+            if node.func.attr in CRUD_KEYWORD_FILTER_METHODS:
+                fields = [keyword.arg for keyword in node.keywords if keyword.arg]
+            else:
+                fields = [
+                    arg.value
+                    for arg in node.args[:1]
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+                ]
+            filters.update((model, field) for field in fields)
+    return filters
+
+
+def _crud_manager_model(node: ast.AST) -> Optional[str]:
+    """Имя модели, если узел — вызов `CrudManager(session, Model)`."""
+    if not isinstance(node, ast.Call):
+        return None
+    func = node.func.value if isinstance(node.func, ast.Subscript) else node.func
+    if not (isinstance(func, ast.Name) and func.id == "CrudManager"):
+        return None
+    model = node.args[1] if len(node.args) > 1 else None
+    for keyword in node.keywords:
+        if keyword.arg == "model_db":
+            model = keyword.value
+    return ast.unparse(model) if model is not None else None
+
+
+def find_missing_indexes(
+    connection: Connection,
+    metadata: MetaData,
+    crud_filters: set[tuple[str, str]],
+) -> list[IndexSuggestion]:
+    """
+    Сравнивает модели с БД и возвращает недостающие индексы.
+
+    Args:
+        connection (Connection): Синхронное соединение с БД
+        metadata (MetaData): Метаданные моделей
+        crud_filters (set[tuple[str, str]]): Поля фильтров CrudManager (модель, поле)
+
+    Returns:
+        list[IndexSuggestion]: Недостающие индексы
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    models = {mapper.class_.__name__: mapper for mapper in Base.registry.mappers}
+
+    suggestions: list[IndexSuggestion] = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            log.warning("Таблица %r отсутствует в БД (миграции не применены?)", table.name)
+            continue
+
+        with warnings.catch_warnings():
+            # Индексы по выражениям (например, lower(email)) не учитываются: в SQLite
+            # их отражение не поддерживается, а поле в них не является первым
+            warnings.simplefilter("ignore", SAWarning)
+            indexes = inspector.get_indexes(table.name)
+            unique_constraints = inspector.get_unique_constraints(table.name)
+
+        leading = {
+            columns[0]
+            for columns in (
+                inspector.get_pk_constraint(table.name).get("constrained_columns") or [],
+                *(index["column_names"] for index in indexes),
+                *(constraint["column_names"] for constraint in unique_constraints),
+            )
+            if columns
+        }
+
+        candidates: dict[str, str] = {}
+        for foreign_key in table.foreign_key_constraints:
+            column = foreign_key.column_keys[0]
+            candidates.setdefault(
+                column, f"внешний ключ на {foreign_key.referred_table.name}"
+            )
+        for model_name, field in sorted(crud_filters):
+            mapper = models.get(model_name)
+            if mapper is None or mapper.local_table is not table:
+                continue
+            if field in table.columns:
+                candidates.setdefault(field, "фильтр CrudManager")
+
+        suggestions.extend(
+            IndexSuggestion(table.name, column, reason)
+            for column, reason in candidates.items()
+            if column not in leading
+        )
+    return suggestions
+
+
+def _autocommit_block(code: str) -> str:
+    """Оборачивает код операций ревизии в `autocommit_block()` (CONCURRENTLY вне транзакции)."""
+    return "with op.get_context().autocommit_block():\n        " + code.replace("\n", "\n    ")
+
+
+def render_operations(suggestions: list[IndexSuggestion]) -> tuple[str, str]:
+    """
+    Код `upgrade()` и `downgrade()` ревизии с недостающими индексами.
+
+    Индексы создаются и удаляются с CONCURRENTLY, как в ревизиях проекта:
+    построение индекса не блокирует запись в таблицу, но не может выполняться
+    внутри транзакции, поэтому операции идут в `autocommit_block()`.
+
+    Args:
+        suggestions (list[IndexSuggestion]): Недостающие индексы
+
+    Returns:
+        tuple[str, str]: Код операций upgrade и downgrade
+    """
+    upgrade_ops = ops.UpgradeOps(
+        ops=[
+            ops.CreateIndexOp(
+                suggestion.index_name,
+                suggestion.table,
+                [suggestion.column],
+                postgresql_concurrently=True,
+            )
+            for suggestion in suggestions
+        ]
+    )
+    downgrade_ops = ops.DowngradeOps(
+        ops=[
+            ops.DropIndexOp(
+                suggestion.index_name,
+                table_name=suggestion.table,
+                postgresql_concurrently=True,
+            )
+            for suggestion in reversed(suggestions)
+        ]
+    )
+    return (
+        _autocommit_block(render_python_code(upgrade_ops)),
+        _autocommit_block(render_python_code(downgrade_ops)),
+    )
+
+
+def write_revision(suggestions: list[IndexSuggestion], message: str) -> Path:
+    """
+    Создаёт ревизию Alembic, добавляющую недостающие индексы.
+
+    Args:
+        suggestions (list[IndexSuggestion]): Недостающие индексы
+        message (str): Описание ревизии
+
+    Returns:
+        Path: Файл ревизии
+    """
+    upgrades, downgrades = render_operations(suggestions)
+    script_directory = ScriptDirectory.from_config(
+        Config(str(BASE_DIR / "alembic.ini"))
+    )
+    script = script_directory.generate_revision(
+        rev_id(),
+        message,
+        head="head",
+        upgrades=upgrades,
+        downgrades=downgrades,
+    )
+    return Path(script.path)
+
+
+async def advise_indexes(
+    engine: AsyncEngine,
+    source_dir: Path = BASE_DIR,
+) -> list[IndexSuggestion]:
+    """
+    Находит недостающие индексы для моделей приложения.
+
+    Args:
+        engine (AsyncEngine): Движок БД
+        source_dir (Path): Каталог исходного кода для поиска фильтров CrudManager
+
+    Returns:
+        list[IndexSuggestion]: Недостающие индексы
+    """
+    paths = [
+        path
+        for path in source_dir.rglob("*.py")
+        if "alembic" not in path.relative_to(source_dir).parts
+    ]
+    crud_filters = collect_crud_filters(paths)
+    async with engine.connect() as connection:
+        return await connection.run_sync(
+            find_missing_indexes, Base.metadata, crud_filters
+        )
+
+
+async def main(write: bool = False) -> None:
+    suggestions = await advise_indexes(db_helper.engine)
+    await db_helper.dispose()
+    if not suggestions:
+        log.info("Недостающих индексов не найдено.")
+        return
+    for suggestion in suggestions:
+        log.warning("Нет индекса: %r", suggestion)
+    if write:
+        path = write_revision(suggestions, message="add missing indexes")
+        log.info("Создана ревизия %s, проверьте её перед применением.", path.name)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=settings.logging.log_level_value,
+        format=settings.logging.log_format,
+    )
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--write",
+        action="store_true",
+        help="создать ревизию Alembic с недостающими индексами",
+    )
+    asyncio.run(main(write=parser.parse_args().write))
@@ -11,8 +11,8 @@ from core.auth.dependencies import (
     get_users_db_context,
     user_manager_context,
     get_access_token_db_context,
+    get_backend_strategy,
 )
-from core.auth.strategy import get_database_strategy
 
 log = logging.getLogger(__name__)
 
@@ -40,7 +40,8 @@ class AdminAuth(AuthenticationBackend):
                             log.warning("Суперпользователь не найден: %r", email)
                             return False
 
-                        is_valid, _ = user_manager.password_helper.verify_and_update(
+                        # Проверка пароля выполняется в пуле, не блокируя цикл событий
+                        is_valid, _ = await user_manager.verify_password(
                             password, user.hashed_password
                         )
                         if not is_valid:
@@ -51,7 +52,7 @@ class AdminAuth(AuthenticationBackend):
                         async with get_access_token_db_context(
                             session
                         ) as access_token_db:
-                            strategy = get_database_strategy(access_token_db)
+                            strategy = get_backend_strategy(access_token_db)
                             token = await strategy.write_token(user)
 
                         request.session.update({"fastapiusersauth": token})
@@ -90,7 +91,7 @@ class AdminAuth(AuthenticationBackend):
                         async with get_access_token_db_context(
                             session
                         ) as access_token_db:
-                            strategy = get_database_strategy(access_token_db)
+                            strategy = get_backend_strategy(access_token_db)
                             user = await strategy.read_token(cookie, user_manager)
                             if (
                                 not user
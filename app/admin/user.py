@@ -1,13 +1,13 @@
-from fastapi_users.password import PasswordHelper
 from sqladmin import ModelView
 from starlette.requests import Request
 
+from core.auth.password_helper import password_helper
+from core.auth.token_cache import token_cache
+from core.cache.decorator import invalidate_tags
+from core.config import settings
 from models.user import User
 
 
-password_helper = PasswordHelper()
-
-
 class UserAdmin(ModelView, model=User):
     """Админка для модели User"""
 
@@ -76,5 +76,39 @@ class UserAdmin(ModelView, model=User):
         raw_password = data.get("hashed_password") or password_helper.generate()
         if is_created or model.hashed_password != raw_password:
             data.update(
-                hashed_password=password_helper.hash(raw_password),
+                hashed_password=await password_helper.hash_async(raw_password),
             )
+
+    async def after_model_change(
+        self,
+        data: dict,
+        model: User,
+        is_created: bool,
+        request: Request,
+    ) -> None:
+        """
+        Метод вызывается после создания или изменения модели.
+        Удаляет токены пользователя из кэша токенов, чтобы изменения (например, is_active) применились сразу,
+        и инвалидирует кэш списка пользователей.
+        """
+        if not is_created:
+            await token_cache.invalidate_user(model.id)
+        await invalidate_tags(
+            settings.cache.tag.users_list,
+            settings.cache.tag.user.format(id=model.id),
+        )
+
+    async def after_model_delete(
+        self,
+        model: User,
+        request: Request,
+    ) -> None:
+        """
+        Метод вызывается после удаления модели.
+        Удаляет токены пользователя из кэша токенов и инвалидирует кэш списка пользователей.
+        """
+        await token_cache.invalidate_user(model.id)
+        await invalidate_tags(
+            settings.cache.tag.users_list,
+            settings.cache.tag.user.format(id=model.id),
+        )
@@ -0,0 +1,108 @@
+"""create table outbox_emails
+
+Revision ID: 3b9e4f1c2a7d
+Revises: 7dd5dc316d4e
+Create Date: 2026-10-18 12:00:41.512304
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9e4f1c2a7d"
+down_revision: Union[str, Sequence[str], None] = "7dd5dc316d4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "outbox_emails",
+        sa.Column(
+            "kind",
+            sa.String(length=64),
+            nullable=False,
+            comment="Тип письма (verification, reset_password, email_confirmed)",
+        ),
+        sa.Column(
+            "payload",
+            sa.JSON(),
+            nullable=False,
+            comment="Параметры письма (id пользователя, ссылки)",
+        ),
+        sa.Column(
+            "status",
+            sa.String(length=16),
+            server_default="pending",
+            nullable=False,
+            comment="Статус задания",
+        ),
+        sa.Column(
+            "attempts",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+            comment="Количество попыток отправки",
+        ),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="Не раньше этого времени задание может быть взято в работу",
+        ),
+        sa.Column(
+            "last_error",
+            sa.Text(),
+            nullable=True,
+            comment="Последняя ошибка отправки",
+        ),
+        sa.Column(
+            "sent_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Дата отправки",
+        ),
+        sa.Column(
+            "id",
+            sa.Integer(),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="Дата создания записи",
+        ),
+        sa.PrimaryKeyConstraint(
+            "id",
+            name=op.f("pk_outbox_emails"),
+        ),
+    )
+    op.create_index(
+        "ix_outbox_emails_status_next_attempt_at",
+        "outbox_emails",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_outbox_emails_created_at"),
+        "outbox_emails",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_outbox_emails_created_at"), table_name="outbox_emails")
+    op.drop_index(
+        "ix_outbox_emails_status_next_attempt_at",
+        table_name="outbox_emails",
+    )
+    op.drop_table("outbox_emails")
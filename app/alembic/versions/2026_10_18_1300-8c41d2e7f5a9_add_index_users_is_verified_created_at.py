@@ -0,0 +1,42 @@
+"""add index users is_verified created_at
+
+Revision ID: 8c41d2e7f5a9
+Revises: 3b9e4f1c2a7d
+Create Date: 2026-10-18 13:00:12.804117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41d2e7f5a9"
+down_revision: Union[str, Sequence[str], None] = "3b9e4f1c2a7d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в users на время построения индекса,
+    # но не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_is_verified_created_at",
+            "users",
+            ["is_verified", "created_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_is_verified_created_at",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
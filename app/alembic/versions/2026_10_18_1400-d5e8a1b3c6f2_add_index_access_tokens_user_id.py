@@ -0,0 +1,42 @@
+"""add index access_tokens user_id
+
+Revision ID: d5e8a1b3c6f2
+Revises: 8c41d2e7f5a9
+Create Date: 2026-10-18 14:00:37.219846
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d5e8a1b3c6f2"
+down_revision: Union[str, Sequence[str], None] = "8c41d2e7f5a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в access_tokens на время построения индекса,
+    # но не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_access_tokens_user_id"),
+            "access_tokens",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_access_tokens_user_id"),
+            table_name="access_tokens",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,44 @@
+"""add index users lower(email)
+
+Revision ID: e7b2f4a9c1d3
+Revises: d5e8a1b3c6f2
+Create Date: 2026-10-18 15:00:12.408519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b2f4a9c1d3"
+down_revision: Union[str, Sequence[str], None] = "d5e8a1b3c6f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Уникальный индекс по lower(email): регистрация уже проверяет email без учёта
+    # регистра, поэтому дубликатов, отличающихся только регистром, быть не должно.
+    # CONCURRENTLY не блокирует запись в users на время построения индекса,
+    # но не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email_lower",
+            "users",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_email_lower",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
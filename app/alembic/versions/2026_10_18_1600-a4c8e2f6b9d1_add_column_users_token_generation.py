@@ -0,0 +1,38 @@
+"""add column users token_generation
+
+Revision ID: a4c8e2f6b9d1
+Revises: e7b2f4a9c1d3
+Create Date: 2026-10-18 16:00:41.715302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e2f6b9d1"
+down_revision: Union[str, Sequence[str], None] = "e7b2f4a9c1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Константный DEFAULT не перезаписывает таблицу (PostgreSQL 11+)
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_generation",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+            comment="Поколение подписанных токенов: увеличение отзывает все выданные ранее",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_generation")
@@ -3,6 +3,7 @@ from fastapi.security import HTTPBearer
 
 from .users import router as users_router
 from .auth import router as auth_router
+from .metrics import router as metrics_router
 
 from core.config import settings
 
@@ -16,3 +17,4 @@ router = APIRouter(
 
 router.include_router(users_router)
 router.include_router(auth_router)
+router.include_router(metrics_router)
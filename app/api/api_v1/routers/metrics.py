@@ -0,0 +1,51 @@
+from typing import Any
+from fastapi import APIRouter, Depends
+
+from api.dependencies import current_active_superuser
+from core import db_helper
+from core.auth.password_helper import password_helper
+from core.auth.tasks import exclusive_jobs
+from core.config import settings
+
+
+router = APIRouter(
+    prefix=settings.api.v1.metrics,
+    tags=["Metrics 📊"],
+    dependencies=[Depends(current_active_superuser)],
+)
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics() -> dict[str, Any]:
+    """
+    Состояние пула соединений с БД текущего воркера.
+
+    Возвращает размер пула, количество занятых и свободных соединений, overflow,
+    а также гистограммы времени ожидания соединения и времени подключения к БД.
+    Доступно только суперпользователю.
+    """
+    return db_helper.pool_stats()
+
+
+@router.get("/password-hashing")
+async def get_password_hashing_metrics() -> dict[str, Any]:
+    """
+    Состояние пула хеширования паролей текущего воркера.
+
+    Возвращает размер пула, ограничение одновременных операций, текущую и наибольшую
+    длину очереди, а также гистограммы времени ожидания в очереди и времени хеширования.
+    Доступно только суперпользователю.
+    """
+    return password_helper.stats()
+
+
+@router.get("/scheduler")
+async def get_scheduler_metrics() -> dict[str, Any]:
+    """
+    Состояние фоновых задач, выполняемых одним экземпляром на кластер.
+
+    Для каждой задачи возвращает время и длительность последнего запуска в кластере,
+    его результат и экземпляр, который его выполнил, а также количество запусков
+    и пропусков в текущем воркере. Доступно только суперпользователю.
+    """
+    return {job_id: await job.stats() for job_id, job in exclusive_jobs.items()}
@@ -1,14 +1,18 @@
-from typing import Annotated, TYPE_CHECKING
-from fastapi import APIRouter, Depends
+from typing import Annotated, AsyncIterator, TYPE_CHECKING
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
 from core.auth.dependencies.fastapi_users import fastapi_users
-from core.auth.dependencies.users_db import get_users_db
+from core.auth.dependencies.users_db import get_read_users_db
 
 from core.cache.key_builder import users_list_key_builder
 from core.cache.decorator import conditional_cache as cache
 
 from core.config import settings
+from schemas.pagination import CursorPage
 from schemas.user import UserRead, UserUpdate
+from utils.cursor import encode_cursor, decode_cursor
+from utils.serialization import trusted_response
 
 if TYPE_CHECKING:
     from core.models.user import SQLAlchemyUserDatabase  # noqa
@@ -16,21 +20,110 @@ if TYPE_CHECKING:
 
 router = APIRouter(prefix=settings.api.v1.users, tags=["Users 👥"])
 
+# Количество строк NDJSON, отправляемых клиенту одним куском
+STREAM_CHUNK_SIZE = 100
 
-@router.get("", response_model=list[UserRead])
+
+def _cursor_to_user_id(cursor: str | None) -> int | None:
+    """
+    Извлекает id последнего пользователя из курсора пагинации.
+
+    Raises:
+        HTTPException: 400, если курсор повреждён
+    """
+    if cursor is None:
+        return None
+    try:
+        user_id = decode_cursor(cursor)["id"]
+    except (ValueError, KeyError):
+        user_id = None
+    if not isinstance(user_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="INVALID_CURSOR",
+        )
+    return user_id
+
+
+@router.get("", response_model=CursorPage[UserRead])
 @cache(
     expire=60,
+    stale_ttl=30,
     key_builder=users_list_key_builder,
     namespace=settings.cache.namespace.users_list,
+    tags=(settings.cache.tag.users_list,),
 )
 async def get_users_list(
     users_db: Annotated[
         "SQLAlchemyUserDatabase",
-        Depends(get_users_db),
+        Depends(get_read_users_db),
+    ],
+    limit: Annotated[
+        int,
+        Query(ge=1, le=500, description="Количество пользователей на странице"),
+    ] = 50,
+    cursor: Annotated[
+        str | None,
+        Query(description="Курсор страницы из `next_cursor` предыдущего ответа"),
+    ] = None,
+) -> Response:
+    """
+    Возвращает страницу пользователей (keyset-пагинация по id).
+
+    Для получения следующей страницы передайте `next_cursor` из ответа в параметр `cursor`.
+    """
+    users = await users_db.get_users(
+        after_id=_cursor_to_user_id(cursor),
+        limit=limit + 1,  # +1 строка, чтобы узнать, есть ли следующая страница
+    )
+
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor({"id": users[-1].id})
+
+    # Строки из БД собираются в схему без валидации и сразу сериализуются в JSON;
+    # готовый ответ FastAPI не валидирует повторно по response_model
+    return trusted_response(
+        CursorPage[UserRead],
+        {"items": users, "next_cursor": next_cursor},
+    )
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def stream_users_list(
+    users_db: Annotated[
+        "SQLAlchemyUserDatabase",
+        Depends(get_read_users_db),
     ],
-) -> list[UserRead]:
-    users = await users_db.get_users()
-    return [UserRead.model_validate(user) for user in users]
+    cursor: Annotated[
+        str | None,
+        Query(description="Начать после пользователя из курсора"),
+    ] = None,
+) -> StreamingResponse:
+    """
+    Потоково отдаёт всех пользователей в формате NDJSON (один `UserRead` на строку).
+
+    Пользователи читаются из БД серверным курсором, поэтому потребление памяти
+    не зависит от размера таблицы.
+    """
+    after_id = _cursor_to_user_id(cursor)
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        lines = []
+        async for user in users_db.stream_users(after_id=after_id):
+            lines.append(UserRead.model_validate(user).model_dump_json())
+            if len(lines) >= STREAM_CHUNK_SIZE:
+                yield "\n".join(lines) + "\n"
+                lines.clear()
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 # /me
@@ -1,5 +1,8 @@
 __all__ = (
     "get_db",
+    "get_read_db",
+    "get_uow_db",
+    "UnitOfWorkSession",
     "optional_user",
     "current_active_user",
     "current_active_verified_user",
@@ -7,7 +10,7 @@ __all__ = (
 )
 
 
-from .get_db import get_db
+from .get_db import get_db, get_read_db, get_uow_db, UnitOfWorkSession
 from .current_user import (
     optional_user,
     current_active_user,
@@ -1,7 +1,9 @@
-from typing import AsyncGenerator
+from typing import Annotated, AsyncGenerator
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.db_helper import db_helper
+from repositories import unit_of_work
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -14,3 +16,33 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     async for session in db_helper.session_getter():
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Асинхронная зависимость для получения сессии SQLAlchemy только для чтения.
+
+    Предоставляет сессию реплики через `db_helper.read_session_getter()` (или основной БД,
+    если реплики не заданы или недавно была запись). Запись через такую сессию запрещена.
+    Используется в FastAPI-роутерах только для чтения через `Depends(get_read_db)`.
+    """
+    async for session in db_helper.read_session_getter():
+        yield session
+
+
+async def get_uow_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Асинхронная зависимость для получения сессии SQLAlchemy в режиме единицы работы.
+
+    `CrudManager` с этой сессией только выполняет `flush`, а все изменения обработчика
+    фиксируются одним `commit` после его завершения (при исключении — откат).
+    Используйте через `UnitOfWorkSession`: с `scope="function"` транзакция
+    фиксируется до отправки ответа, и ошибка `commit` возвращается клиенту.
+    """
+    async for session in db_helper.session_getter():
+        async with unit_of_work(session):
+            yield session
+
+
+# Сессия единицы работы для обработчиков: `session: UnitOfWorkSession`
+UnitOfWorkSession = Annotated[AsyncSession, Depends(get_uow_db, scope="function")]
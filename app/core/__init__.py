@@ -1,9 +1,11 @@
 __all__ = (
     "db_helper",
+    "redis_helper",
     "limiter",
     "templates",
 )
 
 from .db_helper import db_helper
+from .redis_helper import redis_helper
 from .limiter import limiter
 from .templates import templates
@@ -1,16 +1,27 @@
 from fastapi_users.authentication import AuthenticationBackend
 
+from core.config import settings
 from .transport import (
     # bearer_transport,
     cookie_transport,
 )
-from .strategy import get_database_strategy
+from .strategy import get_database_strategy, get_signed_token_strategy
 
 
 # Используется в FastAPI Users для защиты маршрутов (можно выбрать bearer или cookie).
-authentication_backend = AuthenticationBackend(
-    name="access-token-db",
-    # transport=bearer_transport,
-    transport=cookie_transport,
-    get_strategy=get_database_strategy,  # Хранение токенов в БД
-)
+if settings.access_token.strategy == "signed":
+    # Подписанные токены: проверка без обращения к БД, отзыв через token_revocation
+    get_signed_token_strategy()  # Проверка настроек при старте
+    authentication_backend = AuthenticationBackend(
+        name="access-token-signed",
+        # transport=bearer_transport,
+        transport=cookie_transport,
+        get_strategy=get_signed_token_strategy,
+    )
+else:
+    authentication_backend = AuthenticationBackend(
+        name="access-token-db",
+        # transport=bearer_transport,
+        transport=cookie_transport,
+        get_strategy=get_database_strategy,  # Хранение токенов в БД
+    )
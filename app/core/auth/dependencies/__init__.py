@@ -6,9 +6,11 @@ __all__ = (
     "current_active_superuser",
     "get_access_tokens_db",
     "get_access_token_db_context",
+    "get_backend_strategy",
     "make_user_manager",
     "user_manager_context",
     "get_users_db",
+    "get_read_users_db",
     "get_users_db_context",
     "get_user_manager",
 )
@@ -21,6 +23,7 @@ from .fastapi_users import (
     current_active_superuser,
 )
 from .access_tokens_db import get_access_tokens_db, get_access_token_db_context
+from .strategy import get_backend_strategy
 from .make_user_manager import make_user_manager, user_manager_context
-from .users_db import get_users_db, get_users_db_context
+from .users_db import get_users_db, get_read_users_db, get_users_db_context
 from .user_manager import get_user_manager
@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+
+from core.auth.backend import authentication_backend
+from core.config import settings
+
+if TYPE_CHECKING:
+    from fastapi_users.authentication.strategy import Strategy  # noqa
+    from fastapi_users.authentication.strategy.db import AccessTokenDatabase  # noqa
+
+
+def get_backend_strategy(access_token_db: "AccessTokenDatabase") -> "Strategy":
+    """
+    Возвращает стратегию настроенного бэкенда аутентификации (`authentication_backend`)
+    для ручного использования (в админке, CLI).
+
+    Используется, когда нельзя использовать зависимость `get_strategy` бэкенда.
+
+    Args:
+        access_token_db (AccessTokenDatabase): Адаптер таблицы токенов
+            (нужен только стратегии, хранящей токены в БД)
+
+    Returns:
+        Strategy: Стратегия (токены в БД или подписанные токены)
+    """
+    if settings.access_token.strategy == "signed":
+        return authentication_backend.get_strategy()
+    return authentication_backend.get_strategy(access_token_db)
@@ -29,3 +29,22 @@ async def get_users_db(
 
 
 get_users_db_context = contextlib.asynccontextmanager(get_users_db)
+
+
+async def get_read_users_db(
+    session: Annotated["AsyncSession", Depends(db_helper.read_session_getter)],
+):
+    """
+    Зависимость для получения базы данных пользователей только для чтения.
+
+    Работает через сессию реплики: `get`, `get_by_email`, `get_users` и `stream_users`
+    читают из реплики. Используется только в обработчиках без записи —
+    изменение пользователей через эту базу завершится ошибкой.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия реплики
+
+    Yields:
+        SQLAlchemyUserDatabase: Адаптер для User
+    """
+    yield User.get_db(session=session)
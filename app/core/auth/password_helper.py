@@ -0,0 +1,208 @@
+import asyncio
+import time
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Literal, Optional, TypeVar
+
+from fastapi_users.password import PasswordHelper
+
+from core.config import settings
+from core.pool_metrics import Histogram
+
+T = TypeVar("T")
+
+# Хешер процесса: в пуле процессов создаётся заново в каждом дочернем процессе
+_helper: Optional[PasswordHelper] = None
+
+# Хеши, заранее вычисленные в пуле для текущего вызова (пароль -> хеш)
+_prehashed: ContextVar[Optional[dict[str, str]]] = ContextVar("prehashed", default=None)
+
+
+def _get_helper() -> PasswordHelper:
+    global _helper
+    if _helper is None:
+        _helper = PasswordHelper()
+    return _helper
+
+
+def _hash(password: str) -> str:
+    return _get_helper().hash(password)
+
+
+def _verify_and_update(
+    plain_password: str,
+    hashed_password: str,
+) -> tuple[bool, Optional[str]]:
+    return _get_helper().verify_and_update(plain_password, hashed_password)
+
+
+class ExecutorPasswordHelper(PasswordHelper):
+    """
+    `PasswordHelper`, выполняющий хеширование и проверку паролей в пуле потоков или процессов.
+
+    Argon2/bcrypt занимают десятки миллисекунд CPU; синхронный вызов в `async`-коде
+    останавливает цикл событий воркера для всех остальных запросов.
+    `hash_async` и `verify_and_update_async` переносят эту работу в пул, а количество
+    одновременных операций ограничено `max_concurrency`: остальные ждут в очереди,
+    не занимая пул. Синхронные методы `PasswordHelperProtocol` сохранены для кода,
+    которому нужен синхронный вызов.
+
+    Синхронный `hash` внутри блока `prehashed` возвращает хеш, заранее вычисленный в пуле:
+    так код `fastapi-users`, вызывающий `password_helper.hash` синхронно, не занимает
+    цикл событий.
+
+    Attributes:
+        executor_type (str): `thread` (argon2-cffi и bcrypt освобождают GIL) или `process`
+        max_workers (int): Размер пула
+        max_concurrency (int): Максимальное количество одновременных операций
+        waiting (int): Операций в очереди сейчас
+        running (int): Операций в пуле сейчас
+        max_waiting (int): Наибольшая длина очереди
+        queue_wait (Histogram): Время ожидания в очереди
+        duration (Histogram): Время выполнения операции в пуле
+
+    Args:
+        executor_type (str): `thread` или `process`
+        max_workers (int): Размер пула
+        max_concurrency (int | None): Максимальное количество одновременных операций
+            (None — равно `max_workers`)
+    """
+
+    def __init__(
+        self,
+        executor_type: Literal["thread", "process"] = "thread",
+        max_workers: int = 2,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.queue_wait = Histogram()
+        self.duration = Histogram()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password",
+                )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        self.queue_wait.observe(started_at - queued_at)
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.running -= 1
+            self.duration.observe(time.perf_counter() - started_at)
+            self._semaphore.release()
+
+    async def hash_async(self, password: str) -> str:
+        """
+        Хеширует пароль в пуле.
+
+        Args:
+            password (str): Пароль
+
+        Returns:
+            str: Хеш пароля
+        """
+        return await self._run(_hash, password)
+
+    @asynccontextmanager
+    async def prehashed(self, *passwords: str) -> AsyncIterator[None]:
+        """
+        Хеширует пароли в пуле; внутри блока `hash` возвращает готовые хеши.
+
+        Args:
+            *passwords (str): Пароли, которые будут хешироваться внутри блока
+
+        Yields:
+            None
+        """
+        hashes = dict(_prehashed.get() or {})
+        for password in passwords:
+            hashes[password] = await self.hash_async(password)
+        token = _prehashed.set(hashes)
+        try:
+            yield
+        finally:
+            _prehashed.reset(token)
+
+    def hash(self, password: str) -> str:
+        """Хеширует пароль (готовый хеш из блока `prehashed`, иначе синхронно)."""
+        hashes = _prehashed.get()
+        if hashes is not None and password in hashes:
+            return hashes[password]
+        return super().hash(password)
+
+    async def verify_and_update_async(
+        self,
+        plain_password: str,
+        hashed_password: str,
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Проверяет пароль в пуле.
+
+        Args:
+            plain_password (str): Пароль
+            hashed_password (str): Хеш пароля
+
+        Returns:
+            tuple[bool, str | None]: Верен ли пароль и новый хеш, если алгоритм устарел
+        """
+        return await self._run(_verify_and_update, plain_password, hashed_password)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Состояние пула хеширования паролей.
+
+        Returns:
+            dict[str, Any]: Настройки, глубина очереди и гистограммы ожидания и выполнения
+        """
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "running": self.running,
+            "max_waiting": self.max_waiting,
+            "queue_wait": self.queue_wait.snapshot(),
+            "duration": self.duration.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        """Останавливает пул. Вызывается при завершении работы приложения."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Глобальный экземпляр для использования в приложении
+password_helper = ExecutorPasswordHelper(
+    executor_type=settings.password_hashing.executor,
+    max_workers=settings.password_hashing.max_workers,
+    max_concurrency=settings.password_hashing.max_concurrency,
+)
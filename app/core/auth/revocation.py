@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import time
+
+from contextlib import suppress
+from typing import Any
+
+import orjson
+
+from redis.exceptions import RedisError
+
+from core.cache.bloom import BloomFilter
+from core.config import settings
+from core.redis_helper import redis_helper
+
+log = logging.getLogger(__name__)
+
+
+class TokenRevocation:
+    """
+    Список отозванных подписанных токенов (`SignedTokenStrategy`).
+
+    Подписанный токен проверяется без обращения к БД, поэтому выход и принудительный
+    отзыв не могут просто удалить строку из `access_tokens`. Вместо этого:
+
+    - при выходе `jti` токена добавляется в фильтр Блума каждого воркера и в точное
+      множество в Redis (ZSET, вес — момент истечения токена);
+    - при принудительном отзыве всех токенов пользователя (`revoke_user`) увеличивается
+      его поколение токенов: токены с меньшим поколением считаются отозванными.
+
+    Изменения рассылаются воркерам через Redis pub/sub. Проверка `is_revoked`
+    для неотозванного токена выполняется в памяти воркера; Redis запрашивается только
+    при срабатывании фильтра Блума (отозванный токен или ложноположительный ответ).
+    При (пере)подключении подписки состояние загружается из Redis заново.
+
+    `load` строит новые фильтр и поколения рядом с текущими и подменяет их целиком;
+    отзывы, применённые во время загрузки (сообщения подписки и `revoke` этого воркера),
+    запоминаются и повторяются в новом состоянии, поэтому не теряются.
+
+    Без Redis (`use_redis=False`) точное множество хранится в памяти процесса,
+    и отзыв действует только в нём.
+
+    Attributes:
+        prefix (str): Префикс ключей и канала в Redis
+        use_redis (bool): Используется ли Redis
+        bloom (BloomFilter): Фильтр отозванных `jti`
+
+    Args:
+        prefix (str): Префикс ключей и канала в Redis
+        capacity (int): Ожидаемое количество отозванных токенов за срок жизни токена
+        error_rate (float): Доля ложноположительных ответов фильтра Блума
+        use_redis (bool): Использовать ли Redis
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        use_redis: bool = True,
+    ) -> None:
+        self.prefix = prefix
+        self.use_redis = use_redis
+        self.bloom = BloomFilter(capacity, error_rate)
+        # Точное множество (jti -> момент истечения), если Redis не используется
+        self._revoked: dict[str, float] = {}
+        # Минимальное действующее поколение токенов: id пользователя -> (поколение, до какого момента)
+        self._generations: dict[str, tuple[int, float]] = {}
+        # Изменения, применённые во время выполняющихся `load` (по одному списку на загрузку)
+        self._loading: list[list[tuple]] = []
+        self._task: asyncio.Task | None = None
+
+    @property
+    def channel(self) -> str:
+        return f"{self.prefix}:revocation"
+
+    @property
+    def _tokens_key(self) -> str:
+        return f"{self.prefix}:revoked-tokens"
+
+    @property
+    def _users_key(self) -> str:
+        return f"{self.prefix}:revoked-users"
+
+    def _add_token(self, jti: str, expires_at: float) -> None:
+        self._put_token(self.bloom, self._revoked, jti, expires_at)
+        for changes in self._loading:
+            changes.append(("token", jti, expires_at))
+
+    def _add_generation(self, user_id: Any, generation: int, expires_at: float) -> None:
+        self._put_generation(self._generations, user_id, generation, expires_at)
+        for changes in self._loading:
+            changes.append(("user", user_id, generation, expires_at))
+
+    def _put_token(
+        self,
+        bloom: BloomFilter,
+        revoked: dict[str, float],
+        jti: str,
+        expires_at: float,
+    ) -> None:
+        bloom.add(jti)
+        if not self.use_redis:
+            revoked[jti] = expires_at
+
+    @staticmethod
+    def _put_generation(
+        generations: dict[str, tuple[int, float]],
+        user_id: Any,
+        generation: int,
+        expires_at: float,
+    ) -> None:
+        current = generations.get(str(user_id))
+        if current is None or current[0] <= generation:
+            generations[str(user_id)] = (generation, expires_at)
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Отзывает токен (например, при выходе).
+
+        Args:
+            jti (str): Идентификатор токена
+            expires_at (float): Момент истечения токена (Unix time); после него запись не нужна
+        """
+        self._add_token(jti, expires_at)
+        if not self.use_redis:
+            return
+
+        try:
+            async with redis_helper.client.pipeline(transaction=False) as pipe:
+                pipe.zadd(self._tokens_key, {jti: expires_at})
+                pipe.publish(self.channel, orjson.dumps({"jti": jti, "exp": expires_at}))
+                await pipe.execute()
+        except RedisError as exc:
+            log.warning("Token revocation: Redis is unavailable: %r", exc)
+
+    async def revoke_user(self, user_id: Any, generation: int, expires_at: float) -> None:
+        """
+        Отзывает все токены пользователя с поколением меньше `generation`.
+
+        Args:
+            user_id: ID пользователя
+            generation (int): Новое поколение токенов пользователя
+            expires_at (float): Момент истечения последнего выданного ранее токена (Unix time)
+        """
+        self._add_generation(user_id, generation, expires_at)
+        if not self.use_redis:
+            return
+
+        try:
+            async with redis_helper.client.pipeline(transaction=False) as pipe:
+                pipe.zadd(self._users_key, {f"{user_id}:{generation}": expires_at})
+                pipe.publish(
+                    self.channel,
+                    orjson.dumps({"user": str(user_id), "gen": generation, "exp": expires_at}),
+                )
+                await pipe.execute()
+        except RedisError as exc:
+            log.warning("Token revocation: Redis is unavailable: %r", exc)
+
+    async def is_revoked(self, jti: str, user_id: Any, generation: int) -> bool:
+        """
+        Проверяет, отозван ли токен.
+
+        Args:
+            jti (str): Идентификатор токена
+            user_id: ID пользователя из токена
+            generation (int): Поколение токена
+
+        Returns:
+            bool: True, если токен отозван
+        """
+        minimal = self._generations.get(str(user_id))
+        if minimal is not None and generation < minimal[0]:
+            return True
+        if jti not in self.bloom:
+            return False
+
+        if not self.use_redis:
+            return jti in self._revoked
+        try:
+            return await redis_helper.client.zscore(self._tokens_key, jti) is not None
+        except RedisError as exc:
+            # Фильтр сработал: токен, скорее всего, отозван — не пропускаем его без проверки
+            log.warning("Token revocation: Redis is unavailable: %r", exc)
+            return True
+
+    async def load(self) -> None:
+        """
+        Перестраивает фильтр Блума и поколения без истёкших записей
+        (из Redis или из памяти процесса). Вызывается при подключении подписки
+        и периодически, так как из фильтра Блума нельзя удалять.
+
+        Новое состояние строится отдельно и подменяет текущее без ожиданий между ними;
+        отзывы, пришедшие во время чтения из Redis, повторяются в нём.
+        """
+        changes: list[tuple] = []
+        self._loading.append(changes)
+        try:
+            now = time.time()
+            if not self.use_redis:
+                tokens = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+                users = [(user_id, *entry) for user_id, entry in self._generations.items()]
+            else:
+                try:
+                    async with redis_helper.client.pipeline(transaction=False) as pipe:
+                        pipe.zremrangebyscore(self._tokens_key, "-inf", now)
+                        pipe.zremrangebyscore(self._users_key, "-inf", now)
+                        pipe.zrangebyscore(self._tokens_key, now, "+inf", withscores=True)
+                        pipe.zrangebyscore(self._users_key, now, "+inf", withscores=True)
+                        *_, token_rows, user_rows = await pipe.execute()
+                except RedisError as exc:
+                    log.warning("Token revocation: state not loaded: %r", exc)
+                    return
+                tokens = {jti.decode(): exp for jti, exp in token_rows}
+                users = []
+                for member, exp in user_rows:
+                    user_id, generation = member.decode().rsplit(":", 1)
+                    users.append((user_id, int(generation), exp))
+
+            bloom = BloomFilter(self.bloom.capacity, self.bloom.error_rate)
+            revoked: dict[str, float] = {}
+            generations: dict[str, tuple[int, float]] = {}
+            for jti, exp in tokens.items():
+                self._put_token(bloom, revoked, jti, exp)
+            for user_id, generation, exp in users:
+                if exp > now:
+                    self._put_generation(generations, user_id, generation, exp)
+            # Отзывы, применённые к текущему состоянию во время загрузки
+            for kind, *change in changes:
+                if kind == "token":
+                    self._put_token(bloom, revoked, *change)
+                else:
+                    self._put_generation(generations, *change)
+
+            self.bloom, self._revoked, self._generations = bloom, revoked, generations
+        finally:
+            self._loading = [pending for pending in self._loading if pending is not changes]
+
+    def _handle(self, data: Any) -> None:
+        try:
+            message = orjson.loads(data)
+            if "jti" in message:
+                self._add_token(message["jti"], message["exp"])
+            elif "user" in message:
+                self._add_generation(message["user"], message["gen"], message["exp"])
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            log.warning("Token revocation: malformed message %r", data)
+
+    async def listen(self) -> None:
+        """
+        Слушает канал отзывов до отмены задачи, переподключаясь при ошибках Redis.
+        """
+        backoff = 1
+        while True:
+            pubsub = redis_helper.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # Загрузка после подписки: отзывы во время загрузки придут сообщениями
+                await self.load()
+                backoff = 1
+                async for message in pubsub.listen():
+                    self._handle(message["data"])
+            except RedisError as exc:
+                log.warning("Token revocation: subscription lost: %r", exc)
+            finally:
+                with suppress(RedisError):
+                    await pubsub.aclose()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def start(self) -> None:
+        """Запускает фоновую подписку на отзывы (при старте приложения)."""
+        if self.use_redis and self._task is None:
+            self._task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        """Останавливает подписку (при завершении приложения)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+# Глобальный экземпляр для использования в приложении
+token_revocation = TokenRevocation(
+    prefix=f"{settings.cache.prefix}:auth",
+    capacity=settings.token_revocation.capacity,
+    error_rate=settings.token_revocation.error_rate,
+    use_redis=settings.site.environment != "testing",
+)
@@ -1,13 +1,76 @@
-from typing import TYPE_CHECKING, Annotated
+import jwt
+import secrets
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Annotated, Any, Optional
 from fastapi import Depends
+from fastapi_users import exceptions
+from fastapi_users.authentication.strategy import JWTStrategy
 from fastapi_users.authentication.strategy.db import DatabaseStrategy
+from fastapi_users.jwt import decode_jwt, generate_jwt
 
 from .dependencies.access_tokens_db import get_access_tokens_db
+from .revocation import token_revocation
+from .token_cache import token_cache
 from core.config import settings
 
 if TYPE_CHECKING:
     from core.models import AccessToken  # noqa
     from fastapi_users.authentication.strategy.db import AccessTokenDatabase  # noqa
+    from fastapi_users.manager import BaseUserManager  # noqa
+    from models.user import User  # noqa
+
+
+class CachedDatabaseStrategy(DatabaseStrategy):
+    """
+    Стратегия хранения токенов в БД с кэшированием результата `read_token`.
+
+    Для повторных запросов с тем же токеном пользователь берётся из `token_cache`
+    (память воркера → Redis), без запросов к `access_tokens` и `users`.
+    При промахе выполняется обычная проверка в БД, а результат кэшируется
+    не дольше срока жизни токена.
+    """
+
+    async def read_token(
+        self,
+        token: Optional[str],
+        user_manager: "BaseUserManager[User, int]",
+    ) -> Optional["User"]:
+        if token is None:
+            return None
+
+        user, version = await token_cache.get(token)
+        if user is not None:
+            return user
+
+        max_age = None
+        if self.lifetime_seconds:
+            max_age = datetime.now(timezone.utc) - timedelta(
+                seconds=self.lifetime_seconds
+            )
+
+        access_token = await self.database.get_by_token(token, max_age)
+        if access_token is None:
+            return None
+
+        try:
+            parsed_id = user_manager.parse_id(access_token.user_id)
+            user = await user_manager.get(parsed_id)
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        expires_at = None
+        if self.lifetime_seconds:
+            expires_at = access_token.created_at + timedelta(
+                seconds=self.lifetime_seconds
+            )
+        await token_cache.set(token, user, expires_at=expires_at, version=version)
+        return user
+
+    async def destroy_token(self, token: str, user: "User") -> None:
+        # Сначала БД: промах кэша, начатый после удаления из кэша, не найдёт токен
+        await super().destroy_token(token, user)
+        await token_cache.delete(token)
 
 
 def get_database_strategy(
@@ -21,7 +84,7 @@ def get_database_strategy(
 
     Эта стратегия используется для управления жизненным циклом токенов хранящихся в базе данных:
     - Создание
-    - Проверка
+    - Проверка (с кэшированием в памяти воркера и Redis)
     - Удаление (например, при выходе)
     - Контроль срока жизни
 
@@ -31,7 +94,113 @@ def get_database_strategy(
     Returns:
         DatabaseStrategy: Экземпляр стратегии, использующей БД для хранения токенов.
     """
-    return DatabaseStrategy(
+    return CachedDatabaseStrategy(
         database=access_token_db,
         lifetime_seconds=settings.access_token.lifetime_seconds,
     )
+
+
+class SignedTokenStrategy(JWTStrategy):
+    """
+    Стратегия подписанных токенов, проверяемых без обращения к БД.
+
+    Токен (JWT, HS256) содержит id пользователя (`sub`), поколение токенов
+    пользователя (`gen`), время выдачи и истечения и уникальный идентификатор (`jti`).
+    Вход не пишет в БД, а проверка токена на горячем пути выполняется в памяти воркера:
+    подпись и срок — CPU, отзыв — `token_revocation` (фильтр Блума), пользователь —
+    локальный уровень `token_cache`. БД читается только при промахе кэша.
+
+    Отзыв на стороне сервера:
+        - `destroy_token` (выход) добавляет `jti` в список отозванных токенов;
+        - `UserManager.revoke_tokens` увеличивает поколение токенов пользователя,
+          и все выданные ранее токены перестают приниматься.
+
+    Args:
+        secret (str): Ключ подписи
+        lifetime_seconds (int): Срок жизни токена (в секундах)
+    """
+
+    def __init__(self, secret: str, lifetime_seconds: int) -> None:
+        super().__init__(secret=secret, lifetime_seconds=lifetime_seconds)
+
+    def _decode(self, token: str) -> Optional[dict[str, Any]]:
+        """Проверяет подпись и срок токена (None — токен недействителен)."""
+        try:
+            payload = decode_jwt(
+                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+            )
+        except jwt.PyJWTError:
+            return None
+        if not all(key in payload for key in ("sub", "gen", "jti", "exp")):
+            return None
+        return payload
+
+    async def read_token(
+        self,
+        token: Optional[str],
+        user_manager: "BaseUserManager[User, int]",
+    ) -> Optional["User"]:
+        if token is None:
+            return None
+        payload = self._decode(token)
+        if payload is None:
+            return None
+        try:
+            user_id = user_manager.parse_id(payload["sub"])
+        except exceptions.InvalidID:
+            return None
+
+        if await token_revocation.is_revoked(payload["jti"], user_id, payload["gen"]):
+            return None
+
+        user, version = await token_cache.get(token)
+        if user is None:
+            try:
+                user = await user_manager.get(user_id)
+            except exceptions.UserNotExists:
+                return None
+            expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+            await token_cache.set(token, user, expires_at=expires_at, version=version)
+
+        # Поколение из БД: отзыв, сделанный до загрузки пользователя в кэш
+        if user.token_generation != payload["gen"]:
+            return None
+        return user
+
+    async def write_token(self, user: "User") -> str:
+        data = {
+            "sub": str(user.id),
+            "gen": user.token_generation,
+            "jti": secrets.token_urlsafe(12),
+            "iat": int(datetime.now(timezone.utc).timestamp()),
+            "aud": self.token_audience,
+        }
+        return generate_jwt(
+            data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm
+        )
+
+    async def destroy_token(self, token: str, user: "User") -> None:
+        payload = self._decode(token)
+        if payload is not None:
+            await token_revocation.revoke(payload["jti"], payload["exp"])
+        await token_cache.delete(token)
+
+
+def get_signed_token_strategy() -> SignedTokenStrategy:
+    """
+    Возвращает стратегию аутентификации с подписанными токенами (без хранения в БД).
+
+    Returns:
+        SignedTokenStrategy: Экземпляр стратегии
+
+    Raises:
+        RuntimeError: Если не задан ключ подписи `access_token.signing_secret`
+    """
+    if settings.access_token.signing_secret is None:
+        raise RuntimeError(
+            "Для стратегии signed задайте APP_CONFIG__ACCESS_TOKEN__SIGNING_SECRET"
+        )
+    return SignedTokenStrategy(
+        secret=settings.access_token.signing_secret.get_secret_value(),
+        lifetime_seconds=settings.access_token.lifetime_seconds,
+    )
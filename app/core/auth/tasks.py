@@ -1,72 +1,164 @@
 import logging
 
 from datetime import datetime, timedelta, timezone
+from typing import Any
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy import delete
 
 from models.access_token import AccessToken
+from models.outbox_email import OutboxEmail
 from models.user import User
 
 from core import db_helper
+from core.auth.revocation import token_revocation
+from core.auth.token_cache import token_cache
+from core.chunked_delete import ChunkedDeleter
 from core.config import settings
+from core.scheduler import ExclusiveJob, aligned_interval_trigger
 
 log = logging.getLogger(__name__)
 
 
 scheduler = AsyncIOScheduler()
 
+# Задачи, выполняемые одним экземпляром на кластер (id задачи -> задача)
+exclusive_jobs: dict[str, ExclusiveJob] = {}
 
-async def cleanup_expired_tokens():
-    """Фоновая задача по очистке просроченных токенов из БД"""
-    async with db_helper.session_factory() as session:
-        try:
-            now = datetime.now(timezone.utc)
-            threshold = now - timedelta(seconds=settings.access_token.lifetime_seconds)
-            statement = delete(AccessToken).where(AccessToken.created_at < threshold)
-            result = await session.execute(statement)
-            await session.commit()
 
-            if result.rowcount > 0:
-                log.info(f"Cleanup: Removed {result.rowcount} expired tokens from DB.")
-        except Exception as e:
-            log.error(f"Error during token cleanup: {e}")
-            await session.rollback()
+def _chunked_deleter() -> ChunkedDeleter:
+    return ChunkedDeleter(
+        db_helper.session_factory,
+        batch_size=settings.cleanup.batch_size,
+        pause=settings.cleanup.pause,
+        time_budget=settings.cleanup.time_budget,
+    )
+
 
+async def cleanup_expired_tokens() -> dict[str, Any]:
+    """Фоновая задача по очистке просроченных токенов из БД (пачками)"""
+    now = datetime.now(timezone.utc)
+    threshold = now - timedelta(seconds=settings.access_token.lifetime_seconds)
+    report = await _chunked_deleter().delete(
+        AccessToken,
+        AccessToken.created_at < threshold,
+    )
+    if report.deleted > 0:
+        log.info(
+            "Cleanup: Removed %r expired tokens from DB (%.0f rows/s).",
+            report.deleted,
+            report.rows_per_second,
+        )
+    return report.as_dict()
 
-async def cleanup_unverified_users():
-    """Удаляет неподтвержденных юзеров через 24 часа"""
-    async with db_helper.session_factory() as session:
-        try:
-            now_utc = datetime.now(timezone.utc)
-            threshold = now_utc - timedelta(hours=24)
 
-            statement = delete(User).where(
-                User.is_verified == False, User.created_at < threshold
-            )
-            result = await session.execute(statement)
-            await session.commit()
+async def cleanup_unverified_users() -> dict[str, Any]:
+    """Удаляет неподтвержденных юзеров через 24 часа (пачками)"""
+    now_utc = datetime.now(timezone.utc)
+    threshold = now_utc - timedelta(hours=settings.cleanup.unverified_users_hours)
+    # Условие совпадает с индексом ix_users_is_verified_created_at
+    # Токены удалённых пользователей удаляются из кэша всех воркеров после каждой пачки
+    report = await _chunked_deleter().delete(
+        User,
+        User.is_verified == False,
+        User.created_at < threshold,
+        on_deleted=token_cache.invalidate_users,
+    )
+    if report.deleted > 0:
+        log.info(
+            "Cleanup: Removed %r unverified users (%.0f rows/s).",
+            report.deleted,
+            report.rows_per_second,
+        )
+    return report.as_dict()
+
+
+async def cleanup_outbox_emails() -> dict[str, Any]:
+    """Удаляет из очереди писем отправленные и dead задания старше срока хранения (пачками)"""
+    now_utc = datetime.now(timezone.utc)
+    threshold = now_utc - timedelta(hours=settings.cleanup.outbox_retention_hours)
+    # Условие совпадает с индексом ix_outbox_emails_status_next_attempt_at
+    report = await _chunked_deleter().delete(
+        OutboxEmail,
+        OutboxEmail.status.in_(("sent", "dead")),
+        OutboxEmail.next_attempt_at < threshold,
+    )
+    if report.deleted > 0:
+        log.info(
+            "Cleanup: Removed %r outbox emails (%.0f rows/s).",
+            report.deleted,
+            report.rows_per_second,
+        )
+    return report.as_dict()
 
-            if result.rowcount > 0:
-                log.info(f"Cleanup: Removed {result.rowcount} unverified users.")
-        except Exception as e:
-            log.error(f"User cleanup error: {e}")
-            await session.rollback()
+
+async def purge_token_cache():
+    """
+    Удаляет просроченные токены из кэша и списка отозванных токенов в памяти воркера
+    (выполняется в каждом воркере)
+    """
+    # Просроченные токены в Redis удаляются по TTL, в памяти воркера — здесь
+    purged = token_cache.purge_expired()
+    if purged > 0:
+        log.info(f"Cleanup: Removed {purged} expired tokens from token cache.")
+    if settings.access_token.strategy == "signed":
+        # Из фильтра Блума нельзя удалять: перестраиваем его без истёкших токенов
+        await token_revocation.load()
+
+
+def add_exclusive_job(
+    func,
+    interval: timedelta,
+    job_id: str,
+    jitter: int = 0,
+) -> ExclusiveJob:
+    """
+    Добавляет в планировщик задачу, выполняемую одним экземпляром на кластер.
+
+    Args:
+        func: Асинхронная задача
+        interval (timedelta): Интервал запуска
+        job_id (str): Идентификатор задачи
+        jitter (int): Случайное смещение запуска (в секундах)
+
+    Returns:
+        ExclusiveJob: Задача
+    """
+    job = ExclusiveJob(job_id, func, interval)
+    exclusive_jobs[job_id] = job
+    scheduler.add_job(
+        job,
+        aligned_interval_trigger(interval, jitter=jitter),
+        id=job_id,
+        replace_existing=True,
+    )
+    return job
 
 
 def setup_auth_scheduler():
     """Настройка расписания задач для модуля Auth"""
-    scheduler.add_job(
+    add_exclusive_job(
         cleanup_expired_tokens,
-        "interval",
-        hours=12,
-        id="token_cleanup",
+        timedelta(hours=12),
+        job_id="token_cleanup",
         jitter=60,
     )
-    scheduler.add_job(
+    add_exclusive_job(
         cleanup_unverified_users,
-        "interval",
-        hours=24,
-        id="user_cleanup",
+        timedelta(hours=24),
+        job_id="user_cleanup",
         jitter=120,
     )
+    add_exclusive_job(
+        cleanup_outbox_emails,
+        timedelta(hours=24),
+        job_id="outbox_cleanup",
+        jitter=120,
+    )
+    scheduler.add_job(
+        purge_token_cache,
+        "interval",
+        hours=12,
+        id="token_cache_purge",
+        jitter=60,
+        replace_existing=True,
+    )
     return scheduler
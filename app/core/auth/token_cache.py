@@ -0,0 +1,338 @@
+import hashlib
+import logging
+import time
+
+from datetime import datetime
+from typing import Any, Iterable
+
+import orjson
+
+from redis.exceptions import RedisError
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from core.cache.invalidation import CacheInvalidator
+from core.cache.lru import LRUCache
+from core.config import settings
+from core.redis_helper import redis_helper
+from models.user import User
+
+log = logging.getLogger(__name__)
+
+
+# Колонки, которые не попадают в кэш: хеш пароля не должен храниться в общем Redis
+_UNCACHED_COLUMNS = frozenset({"hashed_password"})
+
+# Колонки пользователя, которые сохраняются в кэше, и те из них, что нужно восстанавливать как datetime
+_USER_COLUMNS = tuple(
+    attr.key
+    for attr in inspect(User).column_attrs
+    if attr.key not in _UNCACHED_COLUMNS
+)
+_USER_DATETIME_COLUMNS = frozenset(
+    attr.key
+    for attr in inspect(User).column_attrs
+    if isinstance(attr.columns[0].type, DateTime)
+)
+
+
+# Запись в Redis только если эпоха инвалидаций не изменилась с начала чтения
+# KEYS: эпоха, токен, токены пользователя; ARGV: эпоха чтения, запись, TTL записи, TTL набора
+_SET_TOKEN_SCRIPT = """
+if (redis.call("GET", KEYS[1]) or "0") ~= ARGV[1] then
+    return 0
+end
+redis.call("SET", KEYS[2], ARGV[2], "EX", ARGV[3])
+redis.call("SADD", KEYS[3], KEYS[2])
+redis.call("EXPIRE", KEYS[3], ARGV[4])
+return 1
+"""
+
+
+def _dump_user(user: User) -> dict[str, Any]:
+    """Снимок колонок пользователя для хранения в кэше."""
+    return {key: getattr(user, key) for key in _USER_COLUMNS}
+
+
+def _load_user(data: dict[str, Any]) -> User:
+    """
+    Восстанавливает пользователя из снимка в виде detached-объекта.
+
+    Объект не привязан к сессии, но имеет identity key, поэтому `session.add(user)`
+    в `SQLAlchemyUserDatabase.update` выполнит UPDATE, а не INSERT.
+
+    Колонки из `_UNCACHED_COLUMNS` (`hashed_password`) помечены как незагруженные:
+    пути записи, которым нужен хеш, загружают его из БД
+    (`await session.refresh(user, ["hashed_password"])` после `session.add(user)`).
+    """
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
+
+
+class TokenCache:
+    """
+    Двухуровневый кэш `access_token -> пользователь` для стратегии аутентификации.
+
+    Первый уровень — LRU в памяти воркера (без сетевых запросов), второй — общий Redis
+    для всех воркеров и узлов. Запись живёт не дольше, чем сам токен.
+
+    Инвалидация:
+        - `delete(token)` — при выходе (`destroy_token`)
+        - `invalidate_user(user_id)` / `invalidate_users(user_ids)` — при изменении
+          или удалении пользователей
+        - `purge_expired()` — при фоновой очистке просроченных токенов
+
+    Инвалидации рассылаются остальным воркерам через `invalidator` (Redis pub/sub,
+    отдельный канал), поэтому выход или блокировка пользователя действуют
+    со следующего запроса на любом воркере. Локальный уровень используется,
+    только пока активна подписка (`invalidator.active`).
+
+    Каждая инвалидация увеличивает эпоху (в памяти воркера и в Redis). `get` возвращает
+    эпоху, прочитанную до обращения к БД, а `set` не сохраняет запись, если эпоха
+    с тех пор изменилась: промах, начатый до выхода или изменения пользователя,
+    не вернёт в кэш устаревшие данные.
+
+    В Redis токены хранятся в виде хэша, чтобы не держать в нём секреты в открытом виде;
+    по тем же ключам хранится и локальный уровень, поэтому в канал инвалидаций
+    токены в открытом виде не попадают.
+
+    Attributes:
+        enabled (bool): Включён ли кэш
+        use_redis (bool): Используется ли уровень Redis
+        invalidator (CacheInvalidator): Локальный уровень и рассылка инвалидаций
+        local (LRUCache): Локальный уровень кэша
+
+    Args:
+        enabled (bool): Включён ли кэш
+        max_size (int): Максимальное количество токенов в памяти воркера
+        local_ttl (int): Время жизни записи в памяти воркера (в секундах)
+        use_redis (bool): Использовать ли уровень Redis
+        redis_ttl (int): Время жизни записи в Redis (в секундах)
+        prefix (str): Префикс ключей в Redis
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_size: int = 10_000,
+        local_ttl: int = 30,
+        use_redis: bool = True,
+        redis_ttl: int = 300,
+        prefix: str = "auth",
+    ) -> None:
+        self.enabled = enabled
+        self.use_redis = enabled and use_redis
+        self.redis_ttl = redis_ttl
+        self.prefix = prefix
+        self.invalidator = CacheInvalidator(
+            local=LRUCache(max_size=max_size, ttl=local_ttl),
+            channel=f"{prefix}:invalidate",
+            enabled=self.use_redis,
+        )
+        self.local = self.invalidator.local
+        self._epoch_key = f"{prefix}:epoch"
+        self._set_token = redis_helper.client.register_script(_SET_TOKEN_SCRIPT)
+
+    def _token_key(self, token: str) -> str:
+        digest = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+        return f"{self.prefix}:token:{digest}"
+
+    def _user_tokens_key(self, user_id: Any) -> str:
+        return f"{self.prefix}:user-tokens:{user_id}"
+
+    async def get(self, token: str) -> tuple[User | None, tuple[int, bytes]]:
+        """
+        Возвращает пользователя по токену из кэша.
+
+        Args:
+            token (str): Токен доступа
+
+        Returns:
+            tuple[User | None, tuple[int, bytes]]: Detached-объект пользователя
+                (None при промахе) и эпоха инвалидаций, которую нужно передать в `set`
+        """
+        epoch = self.invalidator.epoch
+        if not self.enabled:
+            return None, (epoch, b"0")
+
+        key = self._token_key(token)
+        if self.invalidator.active:
+            entry = self.local.get(key)
+            if entry is not None:
+                return _load_user(entry["user"]), (epoch, b"0")
+
+        if not self.use_redis:
+            return None, (epoch, b"0")
+
+        try:
+            async with redis_helper.client.pipeline(transaction=False) as pipe:
+                pipe.get(self._epoch_key)
+                pipe.get(key)
+                redis_epoch, raw = await pipe.execute()
+        except RedisError as exc:
+            log.warning("Token cache: Redis is unavailable: %r", exc)
+            return None, (epoch, b"")
+        version = (epoch, redis_epoch or b"0")
+        if raw is None:
+            return None, version
+
+        entry = orjson.loads(raw)
+        user_data = entry["user"]
+        for column in _USER_DATETIME_COLUMNS:
+            if user_data.get(column) is not None:
+                user_data[column] = datetime.fromisoformat(user_data[column])
+
+        self.invalidator.store(key, entry, epoch, ttl=self._remaining(entry["expires_at"]))
+        return _load_user(user_data), version
+
+    async def set(
+        self,
+        token: str,
+        user: User,
+        expires_at: datetime | None = None,
+        version: tuple[int, bytes] | None = None,
+    ) -> None:
+        """
+        Сохраняет пользователя по токену на обоих уровнях кэша.
+
+        Args:
+            token (str): Токен доступа
+            user (User): Пользователь, которому принадлежит токен
+            expires_at (datetime | None): Момент истечения токена
+            version (tuple[int, bytes] | None): Эпоха, возвращённая `get` до чтения из БД
+                (None — не проверять)
+        """
+        if not self.enabled:
+            return
+
+        entry = {
+            "user": _dump_user(user),
+            "expires_at": expires_at.timestamp() if expires_at else None,
+        }
+        ttl = self._remaining(entry["expires_at"])
+        if ttl <= 0:
+            return
+        epoch, redis_epoch = version or (self.invalidator.epoch, None)
+        if epoch != self.invalidator.epoch:
+            return
+
+        key = self._token_key(token)
+        if self.use_redis:
+            if redis_epoch == b"":
+                # Эпоху не удалось прочитать: Redis был недоступен
+                return
+            if redis_epoch is None:
+                try:
+                    redis_epoch = await redis_helper.client.get(self._epoch_key) or b"0"
+                except RedisError as exc:
+                    log.warning("Token cache: Redis is unavailable: %r", exc)
+                    return
+            redis_ttl = max(1, int(min(ttl, self.redis_ttl)))
+            try:
+                stored = await self._set_token(
+                    keys=[self._epoch_key, key, self._user_tokens_key(user.id)],
+                    args=[redis_epoch, orjson.dumps(entry), redis_ttl, self.redis_ttl],
+                )
+            except RedisError as exc:
+                log.warning("Token cache: Redis is unavailable: %r", exc)
+                return
+            # Без записи в наборе токенов пользователя инвалидация не дойдёт до других воркеров
+            if not stored:
+                return
+
+        self.invalidator.store(key, entry, epoch, ttl=ttl)
+
+    async def delete(self, token: str) -> None:
+        """Удаляет токен из кэша всех воркеров (например, при выходе пользователя)."""
+        if not self.enabled:
+            return
+
+        key = self._token_key(token)
+        if self.use_redis:
+            try:
+                async with redis_helper.client.pipeline(transaction=False) as pipe:
+                    pipe.incr(self._epoch_key)
+                    pipe.delete(key)
+                    await pipe.execute()
+            except RedisError as exc:
+                log.warning("Token cache: Redis is unavailable: %r", exc)
+        await self.invalidator.publish(keys=[key])
+
+    async def invalidate_user(self, user_id: Any) -> None:
+        """
+        Удаляет из кэша всех воркеров все токены пользователя.
+
+        Вызывается после изменения или удаления пользователя, чтобы следующие запросы
+        получили актуальные данные из БД.
+
+        Args:
+            user_id: ID пользователя
+        """
+        await self.invalidate_users([user_id])
+
+    async def invalidate_users(self, user_ids: Iterable[Any]) -> None:
+        """
+        Удаляет из кэша всех воркеров все токены пользователей (за два запроса к Redis).
+
+        Args:
+            user_ids (Iterable[Any]): ID пользователей
+        """
+        user_ids = set(user_ids)
+        if not self.enabled or not user_ids:
+            return
+
+        self.invalidator.evict()
+        self.local.delete_where(lambda key, entry: entry["user"]["id"] in user_ids)
+        if not self.use_redis:
+            return
+
+        user_tokens_keys = [self._user_tokens_key(user_id) for user_id in user_ids]
+        try:
+            async with redis_helper.client.pipeline(transaction=False) as pipe:
+                for user_tokens_key in user_tokens_keys:
+                    pipe.smembers(user_tokens_key)
+                members = await pipe.execute()
+            token_keys = [key.decode() for keys in members for key in keys]
+            async with redis_helper.client.pipeline(transaction=False) as pipe:
+                pipe.incr(self._epoch_key)
+                pipe.delete(*user_tokens_keys, *token_keys)
+                await pipe.execute()
+        except RedisError as exc:
+            log.warning("Token cache: Redis is unavailable: %r", exc)
+            # Токены пользователей неизвестны: другие воркеры очищают все токены
+            await self.invalidator.publish(prefix=f"{self.prefix}:token:")
+            return
+        await self.invalidator.publish(keys=token_keys)
+
+    def purge_expired(self) -> int:
+        """
+        Удаляет из памяти воркера записи с истёкшим временем жизни.
+
+        Записи в Redis удаляются самим Redis по TTL, который не превышает срок жизни токена.
+
+        Returns:
+            int: Количество удалённых записей
+        """
+        return self.local.purge_expired()
+
+    def _remaining(self, expires_at: float | None) -> float:
+        """Сколько секунд запись может храниться в кэше."""
+        if expires_at is None:
+            return float(self.redis_ttl)
+        return expires_at - time.time()
+
+
+# Глобальный экземпляр для использования в приложении
+token_cache = TokenCache(
+    enabled=settings.token_cache.enabled,
+    max_size=settings.token_cache.max_size,
+    local_ttl=settings.token_cache.local_ttl,
+    use_redis=(
+        settings.token_cache.use_redis
+        and settings.cache.enabled
+        and settings.site.environment != "testing"
+    ),
+    redis_ttl=settings.token_cache.redis_ttl,
+    prefix=f"{settings.cache.prefix}:auth",
+)
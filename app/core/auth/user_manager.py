@@ -1,14 +1,25 @@
+import jwt
 import logging
+import time
 
-from typing import Optional, TYPE_CHECKING
-from fastapi_users import BaseUserManager, IntegerIDMixin
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, Callable, Optional, TYPE_CHECKING
+from fastapi_users import BaseUserManager, IntegerIDMixin, exceptions, schemas
 from fastapi_users.db import BaseUserDatabase
+from fastapi_users.jwt import decode_jwt
 
+from core.auth.password_helper import (
+    ExecutorPasswordHelper,
+    password_helper as default_password_helper,
+)
+from core.auth.revocation import token_revocation
+from core.auth.token_cache import token_cache
 from core.auth.user_id_type import UserIdType
 from core.config import settings
-from core.cache.decorator import conditional_clear as clear_cache
+from core.cache.decorator import invalidate_tags
 
 from services.mailing import (
+    enqueue_email,
     send_verification_email,
     send_email_confirmed,
     send_reset_password,
@@ -17,15 +28,22 @@ from models.user import User
 
 if TYPE_CHECKING:
     from fastapi import Request, BackgroundTasks  # noqa
+    from fastapi.security import OAuth2PasswordRequestForm  # noqa
     from fastapi_users.password import PasswordHelperProtocol  # noqa
 
 
 log = logging.getLogger(__name__)
 
 
-async def _clear_users_cache():
-    """Асинхронная обёртка для безопасной очистки кэша списка пользователей."""
-    await clear_cache(namespace=settings.cache.namespace.users_list)
+async def _invalidate_users_cache(user_id: Optional[UserIdType] = None):
+    """
+    Асинхронная обёртка для безопасной инвалидации кэша списка пользователей
+    (и записей конкретного пользователя, если передан `user_id`).
+    """
+    tags = [settings.cache.tag.users_list]
+    if user_id is not None:
+        tags.append(settings.cache.tag.user.format(id=user_id))
+    await invalidate_tags(*tags)
 
 
 class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
@@ -36,6 +54,11 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
     Обеспечивает расширенную логику поверх стандартного `BaseUserManager` из `fastapi-users`,
     позволяя выполнять фоновые задачи (например, отправку писем) и сброс кэша при изменениях.
 
+    Хеширование и проверка паролей (`create`, `authenticate`, `forgot_password`,
+    `reset_password`, смена пароля в `update`) выполняются в пуле `ExecutorPasswordHelper`,
+    а не в цикле событий: хеши вычисляются заранее (`prehashed`), и методы
+    `BaseUserManager` получают готовый результат.
+
     Attributes:
         reset_password_token_secret (SecretStr): Секретный ключ для генерации токена сброса пароля.
         verification_token_secret (SecretStr): Секретный ключ для генерации токена подтверждения email.
@@ -43,14 +66,19 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
 
     Args:
         user_db (BaseUserDatabase[User, UserIdType]): База данных пользователей.
-        password_helper (PasswordHelperProtocol | None): Вспомогательный инструмент для хеширования паролей.
+        password_helper (PasswordHelperProtocol | None): Вспомогательный инструмент для хеширования паролей
+            (по умолчанию — общий `ExecutorPasswordHelper`).
         background_tasks (BackgroundTasks | None): Объект для асинхронного выполнения задач (опционально).
 
     Methods:
         on_after_register: Вызывается после успешной регистрации.
+        on_after_update: Вызывается после изменения пользователя.
         on_after_forgot_password: Вызывается при запросе сброса пароля.
+        on_after_reset_password: Вызывается после сброса пароля.
+        revoke_tokens: Отзывает все подписанные токены пользователя.
         on_after_request_verify: Вызывается при запросе подтверждения email.
         on_after_verify: Вызывается после успешного подтверждения email.
+        on_before_delete: Вызывается перед удалением пользователя.
         on_after_delete: Вызывается после удаления пользователя.
     """
 
@@ -67,9 +95,182 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
         password_helper: Optional["PasswordHelperProtocol"] = None,
         background_tasks: Optional["BackgroundTasks"] = None,
     ):
-        super().__init__(user_db, password_helper)
+        super().__init__(user_db, password_helper or default_password_helper)
         self.background_tasks = background_tasks
 
+    async def hash_password(self, password: str) -> str:
+        """Хеширует пароль вне цикла событий (если хешер это поддерживает)."""
+        if isinstance(self.password_helper, ExecutorPasswordHelper):
+            return await self.password_helper.hash_async(password)
+        return self.password_helper.hash(password)
+
+    async def verify_password(
+        self,
+        plain_password: str,
+        hashed_password: str,
+    ) -> tuple[bool, Optional[str]]:
+        """Проверяет пароль вне цикла событий (если хешер это поддерживает)."""
+        if isinstance(self.password_helper, ExecutorPasswordHelper):
+            return await self.password_helper.verify_and_update_async(
+                plain_password, hashed_password
+            )
+        return self.password_helper.verify_and_update(plain_password, hashed_password)
+
+    def prehashed(self, *passwords: str) -> AsyncContextManager[None]:
+        """
+        Блок, внутри которого синхронный `password_helper.hash` кода `BaseUserManager`
+        возвращает хеши, заранее вычисленные в пуле (если хешер это поддерживает).
+        """
+        if isinstance(self.password_helper, ExecutorPasswordHelper):
+            return self.password_helper.prehashed(*passwords)
+        return nullcontext()
+
+    async def create(
+        self,
+        user_create: schemas.UC,
+        safe: bool = False,
+        request: Optional["Request"] = None,
+    ) -> User:
+        """Создаёт пользователя; пароль хешируется в пуле."""
+        async with self.prehashed(user_create.password):
+            return await super().create(user_create, safe, request)
+
+    async def authenticate(
+        self,
+        credentials: "OAuth2PasswordRequestForm",
+    ) -> Optional[User]:
+        """
+        Проверяет email и пароль (как `BaseUserManager.authenticate`, с проверкой в пуле).
+
+        Устаревший хеш пароля обновляется на более стойкий. Проверяемый хеш становится
+        известен только после загрузки пользователя, поэтому метод повторяет код
+        fastapi-users 15; совпадение с ним проверяет `test_user_manager_overrides.py`.
+        """
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Хешируем пароль, чтобы время ответа не выдавало отсутствие пользователя
+            await self.hash_password(credentials.password)
+            return None
+
+        verified, updated_password_hash = await self.verify_password(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+        return user
+
+    async def forgot_password(
+        self,
+        user: User,
+        request: Optional["Request"] = None,
+    ) -> None:
+        """Начинает сброс пароля; отпечаток хеша пароля для токена вычисляется в пуле."""
+        async with self.prehashed(user.hashed_password):
+            await super().forgot_password(user, request)
+
+    async def reset_password(
+        self,
+        token: str,
+        password: str,
+        request: Optional["Request"] = None,
+    ) -> User:
+        """
+        Сбрасывает пароль (как `BaseUserManager.reset_password`, с проверкой в пуле).
+
+        Повторяет код fastapi-users 15 (см. `authenticate`).
+
+        Raises:
+            InvalidResetPasswordToken: Токен неверен или истёк
+            UserInactive: Пользователь неактивен
+        """
+        try:
+            data = decode_jwt(
+                token,
+                self.reset_password_token_secret,
+                [self.reset_password_token_audience],
+            )
+            user_id = data["sub"]
+            password_fingerprint = data["password_fgpt"]
+            parsed_id = self.parse_id(user_id)
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            raise exceptions.InvalidResetPasswordToken()
+
+        user = await self.get(parsed_id)
+
+        valid_password_fingerprint, _ = await self.verify_password(
+            user.hashed_password, password_fingerprint
+        )
+        if not valid_password_fingerprint:
+            raise exceptions.InvalidResetPasswordToken()
+
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        updated_user = await self._update(user, {"password": password})
+        await self.on_after_reset_password(user, request)
+        return updated_user
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        # Новый пароль хешируется в пуле; остальные поля обрабатывает BaseUserManager
+        password = update_dict.get("password")
+        if password is None:
+            return await super()._update(user, update_dict)
+        async with self.prehashed(password):
+            return await super()._update(user, update_dict)
+
+    async def revoke_tokens(self, user: User) -> User:
+        """
+        Отзывает все выданные ранее подписанные токены пользователя (стратегия `signed`).
+
+        Увеличивает поколение токенов пользователя в БД и рассылает отзыв воркерам
+        через `token_revocation`; новые токены выдаются с новым поколением.
+
+        Args:
+            user (User): Пользователь
+
+        Returns:
+            User: Пользователь с новым поколением токенов
+        """
+        generation = user.token_generation + 1
+        user = await self.user_db.update(user, {"token_generation": generation})
+        await token_revocation.revoke_user(
+            user.id,
+            generation,
+            expires_at=time.time() + settings.access_token.lifetime_seconds,
+        )
+        await token_cache.invalidate_user(user.id)
+        return user
+
+    async def _send_mail(
+        self,
+        kind: str,
+        send: Callable[..., Any],
+        user: User,
+        **params: str,
+    ):
+        """
+        Отправляет письмо пользователю способом из `settings.mail_outbox.delivery`.
+
+        В режиме `outbox` письмо сохраняется в очередь в той же БД и переживает
+        перезапуск процесса; отправляет его воркер `run_mail_worker.py`. Хуки вызываются
+        после того, как fastapi-users зафиксировал изменения пользователя, поэтому задание
+        фиксируется отдельной транзакцией (это не транзакционный outbox).
+        В режиме `background` письмо отправляется `send` через `BackgroundTasks`.
+
+        Args:
+            kind (str): Тип письма в очереди
+            send (Callable): Функция отправки для режима `background`
+            user (User): Получатель
+            **params (str): Параметры письма
+        """
+        if settings.mail_outbox.delivery == "outbox":
+            await enqueue_email(self.user_db.session, kind, user, **params)
+        elif self.background_tasks:
+            self.background_tasks.add_task(send, user=user, **params)
+
     async def on_after_register(
         self,
         user: User,
@@ -87,7 +288,7 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
             request (Request | None): HTTP-запрос, инициировавший регистрацию.
 
         Side effects:
-            - Очищает кэш: `namespace=settings.cache.namespace.users_list`
+            - Инвалидирует кэш: тег `users_list`
             - Логирует: "User {id} has registered."
         """
 
@@ -98,9 +299,34 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
         await self.request_verify(user, request)
 
         if self.background_tasks:
-            self.background_tasks.add_task(_clear_users_cache)
+            self.background_tasks.add_task(_invalidate_users_cache)
+        else:
+            await _invalidate_users_cache()
+
+    async def on_after_update(
+        self,
+        user: User,
+        update_dict: dict[str, Any],
+        request: Optional["Request"] = None,
+    ):
+        """
+        Вызывается после успешного изменения пользователя.
+
+        Args:
+            user (User): Обновлённый пользователь.
+            update_dict (dict[str, Any]): Изменённые поля.
+            request (Request | None): HTTP-запрос, инициировавший изменение.
+
+        Side effects:
+            - Удаляет токены пользователя из кэша токенов
+            - Отзывает подписанные токены деактивированного пользователя (стратегия `signed`)
+            - Инвалидирует кэш: теги `users_list` и `user:{id}`
+        """
+        if settings.access_token.strategy == "signed" and update_dict.get("is_active") is False:
+            await self.revoke_tokens(user)
         else:
-            await _clear_users_cache()
+            await token_cache.invalidate_user(user.id)
+        await _invalidate_users_cache(user.id)
 
     async def on_after_forgot_password(
         self,
@@ -120,7 +346,7 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
 
         Side effects:
             - Формирует ссылку: `{base_url}/password-reset?token={token}`
-            - Добавляет в фоновую очередь: отправку email через `send_reset_password`
+            - Ставит в очередь письмо со ссылкой (outbox или фоновая задача `send_reset_password`)
             - Логирует событие
         """
 
@@ -134,12 +360,34 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
             token=token
         )
 
-        self.background_tasks.add_task(
+        await self._send_mail(
+            "reset_password",
             send_reset_password,
-            user=user,
+            user,
             reset_password_link=str(reset_password_link),
         )
 
+    async def on_after_reset_password(
+        self,
+        user: User,
+        request: Optional["Request"] = None,
+    ):
+        """
+        Вызывается после успешного сброса пароля.
+
+        Args:
+            user (User): Пользователь, сбросивший пароль.
+            request (Request | None): HTTP-запрос, инициировавший сброс.
+
+        Side effects:
+            - Удаляет токены пользователя из кэша токенов
+            - Отзывает подписанные токены пользователя (стратегия `signed`)
+        """
+        if settings.access_token.strategy == "signed":
+            await self.revoke_tokens(user)
+        else:
+            await token_cache.invalidate_user(user.id)
+
     async def on_after_request_verify(
         self,
         user: User,
@@ -158,7 +406,7 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
 
         Side effects:
             - Формирует ссылку: `{base_url}/verify-email?token={token}`
-            - Добавляет в фоновую очередь: отправку письма через `send_verification_email`
+            - Ставит в очередь письмо со ссылкой (outbox или фоновая задача `send_verification_email`)
             - Логирует событие
         """
 
@@ -171,9 +419,10 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
             token=token
         )
 
-        self.background_tasks.add_task(
+        await self._send_mail(
+            "verification",
             send_verification_email,
-            user=user,
+            user,
             verification_link=str(verification_link),
         )
 
@@ -194,8 +443,9 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
             request (Request | None): HTTP-запрос, инициировавший подтверждение.
 
         Side effects:
-            - Добавляет в фоновую очередь: отправку письма `send_email_confirmed`
-            - Сбрасывает кэш: `users_list`
+            - Ставит в очередь уведомление (outbox или фоновая задача `send_email_confirmed`)
+            - Инвалидирует кэш: теги `users_list` и `user:{id}`
+            - Удаляет токены пользователя из кэша токенов
             - Логирует событие
         """
 
@@ -203,15 +453,31 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
             "User %r has been verified",
             user.id,
         )
+        await token_cache.invalidate_user(user.id)
+        await self._send_mail("email_confirmed", send_email_confirmed, user)
 
         if self.background_tasks:
-            self.background_tasks.add_task(
-                send_email_confirmed,
-                user=user,
-            )
-            self.background_tasks.add_task(_clear_users_cache)
+            self.background_tasks.add_task(_invalidate_users_cache, user.id)
         else:
-            await _clear_users_cache()
+            await _invalidate_users_cache(user.id)
+
+    async def on_before_delete(
+        self,
+        user: User,
+        request: Optional["Request"] = None,
+    ):
+        """
+        Вызывается перед удалением пользователя.
+
+        Args:
+            user (User): Удаляемый пользователь.
+            request (Request | None): HTTP-запрос, инициировавший удаление.
+
+        Side effects:
+            - Отзывает подписанные токены пользователя (стратегия `signed`)
+        """
+        if settings.access_token.strategy == "signed":
+            await self.revoke_tokens(user)
 
     async def on_after_delete(
         self,
@@ -230,12 +496,14 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, UserIdType]):
             request (Request | None): HTTP-запрос, инициировавший удаление.
 
         Side effects:
-            - Сбрасывает кэш: `users_list`
+            - Инвалидирует кэш: теги `users_list` и `user:{id}`
+            - Удаляет токены пользователя из кэша токенов
             - Логирует: "User {id} has been deleted."
         """
         log.warning("User %r has been deleted.", user.id)
+        await token_cache.invalidate_user(user.id)
 
         if self.background_tasks:
-            self.background_tasks.add_task(_clear_users_cache)
+            self.background_tasks.add_task(_invalidate_users_cache, user.id)
         else:
-            await _clear_users_cache()
+            await _invalidate_users_cache(user.id)
@@ -1,6 +1,22 @@
 __all__ = (
+    "BloomFilter",
+    "CacheInvalidator",
+    "CacheTags",
+    "CachedResponse",
+    "LRUCache",
+    "ResponseCoder",
+    "TieredBackend",
+    "cache_invalidator",
+    "cache_tags",
     "conditional_cache",
     "conditional_clear",
+    "invalidate_tags",
 )
 
-from .decorator import conditional_cache, conditional_clear
+from .backend import TieredBackend
+from .bloom import BloomFilter
+from .coder import CachedResponse, ResponseCoder
+from .decorator import conditional_cache, conditional_clear, invalidate_tags
+from .invalidation import CacheInvalidator, cache_invalidator
+from .lru import LRUCache
+from .tags import CacheTags, cache_tags
@@ -0,0 +1,107 @@
+import time
+
+from typing import Optional, Tuple
+
+from fastapi_cache.backends.redis import RedisBackend
+from redis.asyncio import Redis
+
+from .invalidation import CacheInvalidator
+from .single_flight import current_lookup, single_flight
+
+
+class TieredBackend(RedisBackend):
+    """
+    Двухуровневый бэкенд кэша: LRU в памяти воркера (L1) перед `RedisBackend` (L2).
+
+    Попадание в L1 обслуживается без сетевого запроса. Промах читает Redis и кладёт
+    значение в L1 на оставшееся время жизни (не дольше `local.ttl`).
+    `clear()` очищает Redis и рассылает инвалидацию L1 всем воркерам через `CacheInvalidator`.
+    Значение, прочитанное до инвалидации, в L1 не попадает (см. `CacheInvalidator.store`).
+
+    Stale-while-revalidate: если эндпоинт закэширован с `stale_ttl`, запись хранится
+    на `stale_ttl` секунд дольше срока свежести. Устаревшая запись отдаётся как есть,
+    и лишь один запрос (получивший блокировку обновления) обновляет её после ответа.
+
+    Запись, уже сохранённую владельцем single-flight, `set` повторно не сохраняет.
+
+    Args:
+        redis (Redis): Асинхронный клиент Redis
+        invalidator (CacheInvalidator): Локальный уровень и рассылка инвалидаций
+    """
+
+    def __init__(self, redis: Redis, invalidator: CacheInvalidator) -> None:
+        super().__init__(redis)
+        self.invalidator = invalidator
+
+    def _get_local(self, key: str) -> Tuple[float, Optional[bytes]]:
+        if not self.invalidator.active:
+            return 0, None
+        entry = self.invalidator.local.get(key)
+        if entry is None:
+            return 0, None
+        # В L1 хранится исходный срок жизни записи, а не урезанный до `local.ttl`
+        expires_at, value = entry
+        if expires_at is None:
+            return -1, value  # как и Redis: запись без срока жизни
+        return expires_at - time.monotonic(), value
+
+    def _set_local(self, key: str, value: bytes, ttl: Optional[float], epoch: int) -> None:
+        # Не кладём в L1 значение, если во время запроса к Redis пришла инвалидация
+        if ttl is not None and ttl > 0:
+            self.invalidator.store(key, (time.monotonic() + ttl, value), epoch, ttl=ttl)
+        else:
+            self.invalidator.store(key, (None, value), epoch)
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        ttl, value = self._get_local(key)
+        if value is None:
+            epoch = self.invalidator.epoch
+            ttl, value = await super().get_with_ttl(key)
+            if value is not None:
+                self._set_local(key, value, ttl, epoch)
+        if value is None:
+            return 0, None
+
+        lookup = current_lookup.get()
+        if lookup is None or lookup.key != key or not lookup.stale_ttl or ttl < 0:
+            return int(ttl), value
+
+        fresh_ttl = int(ttl) - lookup.stale_ttl
+        if fresh_ttl > 0:
+            return fresh_ttl, value
+        # Устаревшая запись отдаётся сразу; получивший блокировку запрос
+        # обновит её после ответа (см. `conditional_cache`)
+        lookup.refresh_token = await single_flight.try_refresh(key)
+        return 0, value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        _, value = self._get_local(key)
+        if value is not None:
+            return value
+        return await super().get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        expire: Optional[int] = None,
+    ) -> None:
+        lookup = current_lookup.get()
+        if lookup is not None and lookup.key == key and lookup.stored:
+            return  # запись уже сохранена владельцем single-flight
+
+        epoch = self.invalidator.epoch
+        await super().set(key, value, expire)
+        self._set_local(key, value, expire, epoch)
+
+    async def clear(
+        self,
+        namespace: Optional[str] = None,
+        key: Optional[str] = None,
+    ) -> int:
+        removed = await super().clear(namespace, key)
+        await self.invalidator.publish(
+            keys=[key] if key else (),
+            prefix=f"{namespace}:" if namespace else None,
+        )
+        return removed
@@ -0,0 +1,56 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: компактное множество строк с ложноположительными ответами.
+
+    `key in bloom` отвечает False, только если ключ точно не добавлялся; True означает
+    «возможно добавлялся» (с вероятностью ошибки около `error_rate` при заполнении
+    до `capacity`). Удаление не поддерживается — фильтр перестраивается целиком (`clear`).
+
+    Позиции битов вычисляются двойным хешированием одного дайджеста blake2b.
+
+    Attributes:
+        capacity (int): Ожидаемое количество ключей
+        error_rate (float): Доля ложноположительных ответов при `capacity` ключей
+        size (int): Размер фильтра (в битах)
+        hashes (int): Количество хеш-функций
+        count (int): Добавлено ключей
+
+    Args:
+        capacity (int): Ожидаемое количество ключей
+        error_rate (float): Допустимая доля ложноположительных ответов
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        """Добавляет ключ в фильтр."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def clear(self) -> None:
+        """Очищает фильтр."""
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
@@ -0,0 +1,97 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi.routing import APIRoute
+from fastapi_cache.coder import Coder
+from starlette.responses import Response
+
+from utils.serialization import type_adapter
+
+T = TypeVar("T")
+
+# Сериализатор результата эндпоинта текущего запроса (см. `response_serializer`)
+current_serializer: ContextVar[Optional[Callable[[Any], bytes]]] = ContextVar(
+    "current_serializer",
+    default=None,
+)
+
+
+def response_serializer(
+    route: Optional[APIRoute],
+    return_type: Any,
+) -> Optional[Callable[[Any], bytes]]:
+    """
+    Сериализатор результата эндпоинта в JSON-тело ответа, как у FastAPI.
+
+    Модель ответа — `response_model` маршрута, а если его нет — аннотация возвращаемого
+    значения эндпоинта. Результат валидируется по модели (`from_attributes=True`,
+    поля вне модели отбрасываются) и сериализуется с настройками `response_model_*`
+    маршрута.
+
+    Args:
+        route (APIRoute | None): Маршрут запроса
+        return_type: Аннотация возвращаемого значения эндпоинта
+
+    Returns:
+        Callable | None: Сериализатор или None, если модель ответа не объявлена
+    """
+    type_ = route.response_model if route is not None else None
+    if type_ is None:
+        type_ = return_type
+    if type_ is None or type_ is Any or (isinstance(type_, type) and issubclass(type_, Response)):
+        return None
+
+    adapter = type_adapter(type_)
+    options: dict[str, bool] = {"by_alias": True}
+    if route is not None:
+        options = {
+            "by_alias": route.response_model_by_alias,
+            "exclude_unset": route.response_model_exclude_unset,
+            "exclude_defaults": route.response_model_exclude_defaults,
+            "exclude_none": route.response_model_exclude_none,
+        }
+
+    def serialize(value: Any) -> bytes:
+        return adapter.dump_json(adapter.validate_python(value, from_attributes=True), **options)
+
+    return serialize
+
+
+class CachedResponse(Response):
+    """Ответ из кэша: тело — готовый JSON, сохранённый `ResponseCoder`."""
+
+    media_type = "application/json"
+
+
+class ResponseCoder(Coder):
+    """
+    Кодировщик кэша, хранящий итоговое тело ответа (JSON-байты).
+
+    При записи результат эндпоинта сериализуется так же, как это делает FastAPI
+    (`response_serializer`: по модели ответа маршрута или эндпоинта). Готовый
+    `Response` сохраняется как есть. Результат без объявленной модели ответа
+    не кэшируется (`TypeError`). При попадании байты не декодируются и не проходят
+    валидацию и повторную сериализацию: `decode` возвращает `CachedResponse`,
+    который FastAPI отдаёт как есть.
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        if isinstance(value, Response):
+            return bytes(value.body)
+
+        serialize = current_serializer.get()
+        if serialize is None:
+            raise TypeError(
+                f"Результат типа {type(value).__name__} нельзя закэшировать: у эндпоинта "
+                "нет модели ответа (верните Response или укажите response_model)"
+            )
+        return serialize(value)
+
+    @classmethod
+    def decode(cls, value: bytes) -> CachedResponse:
+        return CachedResponse(content=value)
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_: Optional[T]) -> CachedResponse:
+        return cls.decode(value)
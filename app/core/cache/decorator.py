@@ -1,26 +1,288 @@
+import logging
+
+from functools import partial, wraps
+from inspect import iscoroutinefunction, signature
+from typing import Any, Callable, Iterable, Optional, Type
+
+from fastapi.dependencies.utils import get_typed_return_annotation
 from fastapi_cache import FastAPICache
+from fastapi_cache.coder import Coder
 from fastapi_cache.decorator import cache
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
 
 from core.config import settings
+from .coder import current_serializer, response_serializer
+from .key_builder import lookup_key_builder, tagged_key_builder
+from .single_flight import MISSING, CacheLookup, current_lookup, single_flight
+from .tags import cache_tags, validate_tags
+
+log = logging.getLogger(__name__)
+
+
+def _cache_active() -> bool:
+    """Включено ли кэширование (в настройках и не в тестовом окружении)."""
+    return settings.cache.enabled and settings.site.environment != "testing"
+
+
+def _single_flight(
+    func: Callable[..., Any],
+    expire: Optional[int],
+    coder: Optional[Type[Coder]],
+) -> Callable[..., Any]:
+    """
+    Обёртка эндпоинта, вызываемая `@cache` только при промахе: одновременные промахи
+    по одному ключу ждут одно вычисление (см. `SingleFlight`).
+
+    Владелец вычисления сам сохраняет результат в кэш до снятия блокировки,
+    чтобы ожидающие воркеры сразу нашли его. Результат возвращается в том же виде,
+    что и при попадании (с `ResponseCoder` — готовое тело), а запрос помечается
+    как сохранённый: `@cache` не кодирует и не сохраняет запись повторно.
+    """
+    return_type = get_typed_return_annotation(func)
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        lookup = current_lookup.get()
+        if lookup is None or lookup.func is not wrapper:
+            return await func(*args, **kwargs)
+
+        key = lookup.key
+        backend = FastAPICache.get_backend()
+        used_coder = coder or FastAPICache.get_coder()
+
+        async def compute() -> Any:
+            result = await func(*args, **kwargs)
+            data = used_coder.encode(result)
+            try:
+                await backend.set(key, data, expire or FastAPICache.get_expire())
+            except Exception:
+                log.warning("Error setting cache key %r in backend", key, exc_info=True)
+            return used_coder.decode_as_type(data, type_=return_type)
+
+        async def load_cached() -> Any:
+            cached = await backend.get(key)
+            if cached is None:
+                return MISSING
+            return used_coder.decode_as_type(cached, type_=return_type)
+
+        result = await single_flight.run(key, compute, load_cached)
+        lookup.stored = True
+        return result
+
+    return wrapper
+
+
+async def _refresh(
+    lookup: CacheLookup,
+    token: str,
+    endpoint: Callable[..., Any],
+    args: tuple,
+    kwargs: dict,
+    expire: Optional[int],
+    coder: Optional[Type[Coder]],
+    serializer: Optional[Callable[[Any], bytes]],
+) -> None:
+    """Пересчитывает устаревшую запись и снимает блокировку обновления."""
+    serializer_token = current_serializer.set(serializer)
+    try:
+        if iscoroutinefunction(endpoint):
+            result = await endpoint(*args, **kwargs)
+        else:
+            result = await run_in_threadpool(endpoint, *args, **kwargs)
+        await FastAPICache.get_backend().set(
+            lookup.key,
+            (coder or FastAPICache.get_coder()).encode(result),
+            expire or FastAPICache.get_expire(),
+        )
+    except Exception:
+        log.warning("Error refreshing cache key %r", lookup.key, exc_info=True)
+    finally:
+        current_serializer.reset(serializer_token)
+        await single_flight.release_refresh(lookup.key, token)
+
+
+def _stale_while_revalidate(
+    func: Callable[..., Any],
+    endpoint: Callable[..., Any],
+    expire: Optional[int],
+    coder: Optional[Type[Coder]],
+) -> Callable[..., Any]:
+    """
+    Обёртка результата `@cache` для stale-while-revalidate.
+
+    Если запрос отдал устаревшую запись и получил блокировку обновления, эндпоинт
+    вычисляется заново фоновой задачей ответа — уже после отправки ответа клиенту,
+    но до закрытия зависимостей запроса (например, сессии БД). Если результат —
+    не `Response` (кодировщик не `ResponseCoder`), запись обновляется до ответа.
+    """
+    endpoint_params = set(signature(endpoint).parameters)
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        result = await func(*args, **kwargs)
+        lookup = current_lookup.get()
+        if lookup is None or lookup.refresh_token is None:
+            return result
+
+        token, lookup.refresh_token = lookup.refresh_token, None
+        refresh = partial(
+            _refresh,
+            lookup,
+            token,
+            endpoint,
+            args,
+            {name: value for name, value in kwargs.items() if name in endpoint_params},
+            expire,
+            coder,
+            current_serializer.get(),
+        )
+        if isinstance(result, Response) and result.background is None:
+            result.background = BackgroundTask(refresh)
+        else:
+            await refresh()
+        return result
+
+    return wrapper
+
+
+def _with_serializer(
+    func: Callable[..., Any],
+    endpoint: Callable[..., Any],
+) -> Callable[..., Any]:
+    """
+    Обёртка результата `@cache`: на время вызова сохраняет в `current_serializer`
+    сериализатор по модели ответа маршрута (или эндпоинта) для `ResponseCoder`
+    и возвращает в сигнатуру аннотацию результата эндпоинта.
+    """
+    return_type = get_typed_return_annotation(endpoint)
+    func_signature = signature(func)
+    request_param = next(
+        param.name for param in func_signature.parameters.values() if param.annotation is Request
+    )
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        request = kwargs.get(request_param)
+        route = request.scope.get("route") if request is not None else None
+        token = current_serializer.set(response_serializer(route, return_type))
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            current_serializer.reset(token)
+
+    # `@cache` теряет аннотацию результата: без неё FastAPI не выведет `response_model`
+    if return_type is not None:
+        wrapper.__signature__ = func_signature.replace(return_annotation=return_type)
+    return wrapper
+
 
+def _with_cache_headers(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Обёртка результата `@cache`: переносит заголовки кэша на готовый `Response`.
 
-def conditional_cache(*cache_args, **cache_kwargs):
+    `@cache` выставляет `Cache-Control`, `ETag` и статус кэша на внедрённом ответе,
+    но FastAPI объединяет его заголовки с ответом, только если эндпоинт вернул данные.
+    Готовый `Response` (попадание с `ResponseCoder` или промах эндпоинта, вернувшего
+    `trusted_response`) отдаётся как есть, поэтому заголовки копируются в него здесь.
+    """
+    response_param = next(
+        (
+            param.name
+            for param in signature(func).parameters.values()
+            if param.annotation is Response
+        ),
+        None,
+    )
+    if response_param is None:
+        return func
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        result = await func(*args, **kwargs)
+        response = kwargs.get(response_param)
+        if isinstance(result, Response) and response is not None:
+            result.headers.update(response.headers)
+        return result
+
+    return wrapper
+
+
+def conditional_cache(
+    expire: Optional[int] = None,
+    *cache_args,
+    tags: Optional[Iterable[str]] = None,
+    stale_ttl: int = 0,
+    coalesce: bool = True,
+    **cache_kwargs,
+):
     """
     Условный декоратор кэширования: применяет кэширование только если оно включено в настройках
     и окружение не является тестовым.
 
+    Если заданы `tags`, в ключ записи добавляются текущие версии тегов, и запись
+    инвалидируется через `invalidate_tags(...)` без очистки всего пространства кэша.
+
+    Кодировщик по умолчанию (`ResponseCoder`, задаётся в `FastAPICache.init`) хранит
+    готовое тело ответа, сериализованное по модели ответа маршрута: попадание
+    отдаётся без декодирования и повторной сериализации.
+
+    Одновременные промахи по одному ключу объединяются (single-flight): эндпоинт
+    вычисляется один раз, остальные запросы ждут результат. С `stale_ttl` истёкшая запись
+    ещё `stale_ttl` секунд отдаётся устаревшей, а один из запросов обновляет её после ответа.
+
     Args:
-        *cache_args: Позиционные аргументы для @cache (например, время жизни).
+        expire (int | None): Время свежести записи (в секундах).
+        *cache_args: Позиционные аргументы для @cache.
+        tags (Iterable[str] | None): Теги записи; допускаются шаблоны по аргументам эндпоинта (`"user:{id}"`).
+        stale_ttl (int): Сколько секунд после истечения отдавать устаревшую запись (0 — не отдавать).
+        coalesce (bool): Объединять ли одновременные промахи по одному ключу.
         **cache_kwargs: Именованные аргументы для @cache.
 
     Returns:
         Callable: Декоратор @cache или обёртка без кэширования.
+
+    Raises:
+        ValueError: Если шаблон тега ссылается на отсутствующий параметр эндпоинта.
     """
-    if not settings.cache.enabled or settings.site.environment == "testing":
-        return lambda func: func
+    tags = tuple(tags or ())
+    cache_active = _cache_active()
+
+    if not expire:
+        stale_ttl = 0  # без явного срока свежести устаревание не определено
 
-    # Иначе — применяем настоящий @cache
-    return cache(*cache_args, **cache_kwargs)
+    # Запись физически хранится дольше на время, в течение которого её можно отдавать устаревшей
+    if stale_ttl:
+        expire += stale_ttl
+
+    def decorator(func):
+        # Шаблоны тегов проверяются в любом окружении: ошибка видна уже при импорте
+        validate_tags(tags, func)
+        if not cache_active:
+            return func
+
+        # Построитель с `bind` (например, `make_key_builder`) заранее вычисляет префикс эндпоинта
+        key_builder = cache_kwargs.get("key_builder")
+        if hasattr(key_builder, "bind"):
+            key_builder = key_builder.bind(func)
+        if tags:
+            key_builder = tagged_key_builder(key_builder, tags)
+        if coalesce or stale_ttl:
+            key_builder = lookup_key_builder(key_builder, stale_ttl)
+
+        coder = cache_kwargs.get("coder")
+        endpoint = func
+        if coalesce and iscoroutinefunction(func):
+            func = _single_flight(func, expire, coder)
+        # Иначе — применяем настоящий @cache
+        cached = cache(expire, *cache_args, **{**cache_kwargs, "key_builder": key_builder})(func)
+        if stale_ttl:
+            cached = _stale_while_revalidate(cached, endpoint, expire, coder)
+        return _with_cache_headers(_with_serializer(cached, endpoint))
+
+    return decorator
 
 
 async def noop(*args, **kwargs) -> None:
@@ -42,6 +304,24 @@ def conditional_clear(*args, **kwargs):
     Returns:
         Awaitable[None] | None: Результат `FastAPICache.clear()` (если кэш включён), иначе `None`.
     """
-    if settings.cache.enabled and settings.site.environment != "testing":
+    if _cache_active():
         return FastAPICache.clear(*args, **kwargs)
     return noop()
+
+
+def invalidate_tags(*tags: str):
+    """
+    Инвалидирует записи кэша, зависящие от тегов (увеличивает версии тегов).
+
+    Дешёвая альтернатива `conditional_clear`: одна команда `INCR` на тег вместо
+    сканирования пространства кэша. Безопасно использовать в любом окружении.
+
+    Args:
+        *tags (str): Теги, например `"users:list"`, `"user:42"`
+
+    Returns:
+        Awaitable[None]: Корутина инвалидации (или пустая, если кэш выключен).
+    """
+    if _cache_active():
+        return cache_tags.invalidate(*tags)
+    return noop()
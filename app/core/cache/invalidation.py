@@ -0,0 +1,189 @@
+import asyncio
+import logging
+
+from contextlib import suppress
+from typing import Any, Iterable
+
+import orjson
+
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.redis_helper import redis_helper
+from .lru import LRUCache
+
+log = logging.getLogger(__name__)
+
+
+class CacheInvalidator:
+    """
+    Локальный (L1) кэш воркера и рассылка инвалидаций между воркерами через Redis pub/sub.
+
+    Каждый воркер подписан на общий канал. Очистка кэша (`publish`) удаляет записи
+    в своём L1 и рассылает сообщение остальным воркерам, которые удаляют у себя
+    те же ключи или ключи с тем же префиксом.
+
+    L1 используется только пока активна подписка (`active`): без неё воркер
+    не узнал бы об инвалидации, поэтому чтение идёт напрямую в Redis.
+    При (пере)подключении L1 очищается целиком — сообщения, отправленные
+    во время разрыва, могли быть потеряны.
+
+    Каждая инвалидация увеличивает `epoch`. Значение, прочитанное из Redis, кладётся
+    в L1 (`store`) только если с начала чтения не было инвалидаций: иначе ответ Redis,
+    пришедший после сообщения об инвалидации, вернул бы в L1 устаревшее значение.
+
+    Attributes:
+        local (LRUCache): Локальный уровень кэша
+        channel (str): Канал Redis pub/sub для сообщений об инвалидации
+        enabled (bool): Используется ли локальный уровень
+        epoch (int): Счётчик инвалидаций L1
+
+    Args:
+        local (LRUCache): Локальный уровень кэша
+        channel (str): Канал Redis pub/sub для сообщений об инвалидации
+        enabled (bool): Использовать ли локальный уровень
+    """
+
+    def __init__(
+        self,
+        local: LRUCache,
+        channel: str,
+        enabled: bool = True,
+    ) -> None:
+        self.local = local
+        self.channel = channel
+        self.enabled = enabled
+        self.epoch = 0
+        self._subscribed = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def active(self) -> bool:
+        """Можно ли сейчас читать и писать в L1."""
+        return self.enabled and self._subscribed
+
+    def evict(self, keys: Iterable[str] = (), prefix: str | None = None) -> int:
+        """
+        Удаляет записи из L1 по ключам и/или префиксу.
+
+        Returns:
+            int: Количество удалённых записей
+        """
+        self.epoch += 1
+        removed = sum(self.local.delete(key) for key in keys)
+        if prefix is not None:
+            removed += self.local.delete_where(
+                lambda key, value: isinstance(key, str) and key.startswith(prefix)
+            )
+        return removed
+
+    def store(self, key: str, value: Any, epoch: int, ttl: float | None = None) -> bool:
+        """
+        Кладёт в L1 значение, прочитанное из Redis.
+
+        Args:
+            key (str): Ключ записи
+            value (Any): Значение
+            epoch (int): `epoch`, взятый до чтения из Redis
+            ttl (float | None): Время жизни записи (по умолчанию — `local.ttl`)
+
+        Returns:
+            bool: False, если L1 неактивен или с начала чтения была инвалидация
+        """
+        if not self.active or epoch != self.epoch:
+            return False
+        self.local.set(key, value, ttl=ttl)
+        return True
+
+    def _reset(self) -> None:
+        """Очищает L1 целиком (инвалидации за время разрыва подписки неизвестны)."""
+        self.epoch += 1
+        self.local.clear()
+
+    async def publish(
+        self,
+        keys: Iterable[str] = (),
+        prefix: str | None = None,
+    ) -> None:
+        """
+        Инвалидирует записи в L1 этого воркера и рассылает инвалидацию остальным.
+
+        Args:
+            keys (Iterable[str]): Ключи для удаления
+            prefix (str | None): Префикс ключей для удаления
+        """
+        keys = list(keys)
+        self.evict(keys, prefix)
+        if not self.enabled:
+            return
+
+        try:
+            await redis_helper.client.publish(
+                self.channel,
+                orjson.dumps({"keys": keys, "prefix": prefix}),
+            )
+        except RedisError as exc:
+            log.warning("Cache invalidation: Redis is unavailable: %r", exc)
+
+    def _handle(self, data: Any) -> None:
+        try:
+            message = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            message = None
+        if not isinstance(message, dict):
+            log.warning("Cache invalidation: malformed message %r", data)
+            return
+        self.evict(message.get("keys") or (), message.get("prefix"))
+
+    async def listen(self) -> None:
+        """
+        Слушает канал инвалидаций до отмены задачи, переподключаясь при любых ошибках:
+        непредвиденное исключение не должно навсегда останавливать инвалидацию.
+        """
+        backoff = 1
+        while True:
+            pubsub = redis_helper.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self._reset()
+                self._subscribed = True
+                backoff = 1
+                async for message in pubsub.listen():
+                    self._handle(message["data"])
+            except RedisError as exc:
+                log.warning("Cache invalidation: subscription lost: %r", exc)
+            except Exception:
+                log.exception("Cache invalidation: listener failed, resubscribing")
+            finally:
+                self._subscribed = False
+                self._reset()
+                with suppress(Exception):
+                    await pubsub.aclose()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def start(self) -> None:
+        """Запускает фоновую подписку на инвалидации (при старте приложения)."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        """Останавливает подписку (при завершении приложения)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+# Глобальный экземпляр для использования в приложении
+cache_invalidator = CacheInvalidator(
+    local=LRUCache(
+        max_size=settings.cache.local.max_size,
+        ttl=settings.cache.local.ttl,
+    ),
+    channel=f"{settings.cache.prefix}:invalidate",
+    enabled=settings.cache.local.enabled,
+)
@@ -1,15 +1,125 @@
 import hashlib
+from inspect import isawaitable
 from typing import (
     Any,
+    Awaitable,
     Callable,
     Dict,
+    Iterable,
     Optional,
     Tuple,
 )
+
+import orjson
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from pydantic import BaseModel
 
 from models.user import SQLAlchemyUserDatabase
+from .single_flight import CacheLookup, current_lookup
+from .tags import cache_tags, format_tags
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Приводит значения, которые orjson не сериализует сам, к стабильному виду.
+
+    Raises:
+        TypeError: Если значение нельзя однозначно закодировать (например, ORM-объект)
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Параметр типа {type(value).__name__} нельзя включить в ключ кэша")
+
+
+class ParamsKeyBuilder:
+    """
+    Построитель ключа кэша по явному списку параметров эндпоинта.
+
+    В отличие от построителей ниже, не перебирает все аргументы с `isinstance`
+    и не вызывает `repr()` для произвольных объектов (зависимостей, ORM-объектов):
+    в ключ попадают только перечисленные параметры, закодированные orjson
+    в каноническом виде, и хэшируются blake2b (16 байт).
+
+    Префикс функции (модуль и имя) вычисляется при декорировании: `conditional_cache`
+    привязывает построитель к эндпоинту через `bind`.
+
+    Attributes:
+        params (tuple[str, ...]): Имена параметров эндпоинта, от которых зависит ответ
+        func_prefix (str | None): Префикс функции привязанного эндпоинта
+
+    Args:
+        params (tuple[str, ...]): Имена параметров эндпоинта, от которых зависит ответ
+        func (Callable | None): Эндпоинт, к которому привязан построитель
+    """
+
+    __slots__ = ("params", "func_prefix")
+
+    def __init__(
+        self,
+        params: Tuple[str, ...],
+        func: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        self.params = params
+        self.func_prefix = self._func_prefix(func) if func is not None else None
+
+    @staticmethod
+    def _func_prefix(func: Callable[..., Any]) -> str:
+        return f"{func.__module__}:{func.__qualname__}"
+
+    def bind(self, func: Callable[..., Any]) -> "ParamsKeyBuilder":
+        """
+        Построитель для конкретного эндпоинта с заранее вычисленным префиксом.
+
+        Args:
+            func (Callable): Эндпоинт
+
+        Returns:
+            ParamsKeyBuilder: Привязанный построитель
+        """
+        return ParamsKeyBuilder(self.params, func)
+
+    def __call__(
+        self,
+        func: Callable[..., Any],
+        namespace: str,
+        *,
+        request: Optional[Request] = None,
+        response: Optional[Response] = None,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        prefix = f"{namespace}:{self.func_prefix or self._func_prefix(func)}"
+        if not self.params:
+            return prefix
+
+        encoded = orjson.dumps(
+            [kwargs.get(name) for name in self.params],
+            default=_canonical,
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return f"{prefix}:{hashlib.blake2b(encoded, digest_size=16).hexdigest()}"
+
+
+def make_key_builder(*params: str) -> ParamsKeyBuilder:
+    """
+    Фабрика построителей ключа кэша по явному списку параметров эндпоинта
+    (см. `ParamsKeyBuilder`).
+
+    Args:
+        *params (str): Имена параметров эндпоинта, от которых зависит ответ
+
+    Returns:
+        ParamsKeyBuilder: Построитель ключа для `conditional_cache(key_builder=...)`
+
+    Пример:
+        users_list_key_builder = make_key_builder("limit", "cursor")
+    """
+    return ParamsKeyBuilder(params)
 
 
 def universal_list_key_builder(
@@ -37,31 +147,8 @@ def universal_list_key_builder(
     return f"{namespace}:{cache_key}"
 
 
-def users_list_key_builder(
-    func: Callable[..., Any],
-    namespace: str,
-    *,
-    request: Optional[Request] = None,
-    response: Optional[Response] = None,
-    args: Tuple[Any, ...],
-    kwargs: Dict[str, Any],
-) -> str:
-    """
-    Функция для построения ключа кэша для списка пользователей.
-    """
-    exclude_types = (SQLAlchemyUserDatabase,)
-    cache_kw = {}
-    for name, value in kwargs.items():
-        if isinstance(value, exclude_types):
-            continue
-        cache_kw[name] = value
-
-    path = request.scope.get("path", "") if request else ""
-    method = request.scope.get("method", "GET") if request else ""
-
-    key_str = f"{func.__module__}:{func.__name__}:{method}:{path}:{cache_kw}"
-    cache_key = hashlib.md5(key_str.encode()).hexdigest()
-    return f"{namespace}:{cache_key}"
+# Ключ списка пользователей зависит только от параметров страницы
+users_list_key_builder = make_key_builder("limit", "cursor")
 
 
 def user_key_builder(
@@ -164,3 +251,94 @@ def get_by_id_key_builder(
     cache_key = hashlib.md5(key_str.encode()).hexdigest()
 
     return f"{namespace}:{cache_key}"
+
+
+def tagged_key_builder(
+    key_builder: Optional[Callable[..., Any]],
+    tags: Iterable[str],
+) -> Callable[..., Awaitable[str]]:
+    """
+    Оборачивает построитель ключа: к ключу добавляются текущие версии тегов записи.
+
+    После `invalidate_tags(...)` версия тега увеличивается, ключ меняется,
+    и устаревшая запись просто не находится (без очистки пространства кэша).
+
+    Args:
+        key_builder (Callable | None): Исходный построитель ключа (None — по умолчанию из FastAPICache)
+        tags (Iterable[str]): Шаблоны тегов, например `("users:list", "user:{id}")`
+
+    Returns:
+        Callable[..., Awaitable[str]]: Асинхронный построитель ключа с версиями тегов
+    """
+    tags = tuple(tags)
+
+    async def builder(
+        func: Callable[..., Any],
+        namespace: str,
+        *,
+        request: Optional[Request] = None,
+        response: Optional[Response] = None,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        base_builder = key_builder or FastAPICache.get_key_builder()
+        cache_key = base_builder(
+            func,
+            namespace,
+            request=request,
+            response=response,
+            args=args,
+            kwargs=kwargs,
+        )
+        if isawaitable(cache_key):
+            cache_key = await cache_key
+
+        suffix = await cache_tags.version_suffix(format_tags(tags, kwargs))
+        return f"{cache_key}:{suffix}"
+
+    return builder
+
+
+def lookup_key_builder(
+    key_builder: Optional[Callable[..., Any]],
+    stale_ttl: int = 0,
+) -> Callable[..., Awaitable[str]]:
+    """
+    Оборачивает построитель ключа: построенный ключ запоминается в `current_lookup`.
+
+    Нужен для single-flight и stale-while-revalidate: обёртка эндпоинта
+    и бэкенд кэша узнают ключ текущего запроса, не вычисляя его повторно.
+
+    Args:
+        key_builder (Callable | None): Исходный построитель ключа (None — по умолчанию из FastAPICache)
+        stale_ttl (int): Сколько секунд после истечения запись может отдаваться устаревшей
+
+    Returns:
+        Callable[..., Awaitable[str]]: Асинхронный построитель ключа
+    """
+
+    async def builder(
+        func: Callable[..., Any],
+        namespace: str,
+        *,
+        request: Optional[Request] = None,
+        response: Optional[Response] = None,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        base_builder = key_builder or FastAPICache.get_key_builder()
+        cache_key = base_builder(
+            func,
+            namespace,
+            request=request,
+            response=response,
+            args=args,
+            kwargs=kwargs,
+        )
+        if isawaitable(cache_key):
+            cache_key = await cache_key
+
+        current_lookup.set(CacheLookup(func, cache_key, stale_ttl))
+        return cache_key
+
+    return builder
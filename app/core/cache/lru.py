@@ -0,0 +1,105 @@
+import time
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """
+    Ограниченный по размеру LRU-кэш в памяти процесса с временем жизни записей.
+
+    Используется как первый (локальный) уровень кэша внутри воркера: обращение к нему
+    не требует сетевых запросов и сериализации. Кэш не потокобезопасен и рассчитан
+    на работу внутри одного event loop.
+
+    Attributes:
+        max_size (int): Максимальное количество записей, самые старые вытесняются
+        ttl (float): Время жизни записи по умолчанию (в секундах)
+
+    Args:
+        max_size (int): Максимальное количество записей
+        ttl (float): Время жизни записи по умолчанию (в секундах)
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Возвращает значение по ключу и помечает его как недавно использованное.
+
+        Args:
+            key: Ключ записи
+            default: Значение, возвращаемое при промахе или истёкшей записи
+
+        Returns:
+            Any: Сохранённое значение или `default`
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        Сохраняет значение, при переполнении вытесняет самые давние записи.
+
+        Args:
+            key: Ключ записи
+            value: Значение
+            ttl: Время жизни записи (в секундах), по умолчанию `self.ttl`
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> bool:
+        """Удаляет запись. Возвращает True, если запись существовала."""
+        return self._data.pop(key, None) is not None
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        Удаляет все записи, для которых `predicate(key, value)` истинно.
+
+        Returns:
+            int: Количество удалённых записей
+        """
+        keys = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        """
+        Удаляет все записи с истёкшим временем жизни.
+
+        Returns:
+            int: Количество удалённых записей
+        """
+        now = time.monotonic()
+        keys = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Полностью очищает кэш."""
+        self._data.clear()
@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import time
+import uuid
+
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.redis_helper import redis_helper
+
+log = logging.getLogger(__name__)
+
+
+# Маркер отсутствия значения в кэше (None — допустимый результат эндпоинта)
+MISSING = object()
+
+# Lua: удалить блокировку, только если она принадлежит нам
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class CacheLookup:
+    """
+    Ключ кэша текущего запроса к закэшированному эндпоинту.
+
+    Сохраняется построителем ключа в `current_lookup`, чтобы обёртка эндпоинта
+    (вызываемая только при промахе) и бэкенд знали, с каким ключом работают.
+
+    Attributes:
+        func (Callable): Кэшируемая функция
+        key (str): Ключ записи
+        stale_ttl (int): Сколько секунд после истечения запись отдаётся устаревшей
+        stored (bool): Запись уже сохранена в кэш при single-flight (повторный `set` не нужен)
+        refresh_token (str | None): Токен блокировки обновления, если запрос отдал
+            устаревшую запись и должен обновить её после ответа
+    """
+
+    __slots__ = ("func", "key", "stale_ttl", "stored", "refresh_token")
+
+    def __init__(self, func: Callable[..., Any], key: str, stale_ttl: int = 0) -> None:
+        self.func = func
+        self.key = key
+        self.stale_ttl = stale_ttl
+        self.stored = False
+        self.refresh_token: Optional[str] = None
+
+
+current_lookup: ContextVar[CacheLookup | None] = ContextVar(
+    "current_lookup",
+    default=None,
+)
+
+
+class SingleFlight:
+    """
+    Объединение одновременных промахов кэша по одному ключу (single-flight).
+
+    Внутри воркера конкурирующие запросы ждут одну и ту же задачу (`asyncio.Future`).
+    Между воркерами вычисление выполняет владелец короткой блокировки в Redis
+    (`SET NX PX`), остальные опрашивают кэш, пока не появится значение
+    или не пропадёт блокировка. Если Redis недоступен, каждый воркер вычисляет сам.
+
+    Также выдаёт блокировки обновления для stale-while-revalidate (`try_refresh`),
+    которые снимаются после обновления записи (`release_refresh`).
+
+    Attributes:
+        lock_ttl (float): Время жизни блокировки (в секундах)
+        poll_interval (float): Интервал опроса кэша ожидающими воркерами (в секундах)
+        distributed (bool): Использовать ли блокировки в Redis
+
+    Args:
+        lock_ttl (float): Время жизни блокировки (в секундах)
+        poll_interval (float): Интервал опроса кэша ожидающими воркерами (в секундах)
+        distributed (bool): Использовать ли блокировки в Redis
+    """
+
+    def __init__(
+        self,
+        lock_ttl: float = 10,
+        poll_interval: float = 0.05,
+        distributed: bool = True,
+    ) -> None:
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.distributed = distributed
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._refreshing: set[str] = set()
+        self._release_lock = redis_helper.client.register_script(_RELEASE_LOCK_SCRIPT)
+
+    def in_flight(self, key: str) -> bool:
+        """Вычисляется ли значение для ключа в этом воркере прямо сейчас."""
+        return key in self._inflight
+
+    async def run(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        load_cached: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Возвращает результат `compute()`, вычисляя его не более одного раза на ключ.
+
+        Args:
+            key (str): Ключ кэша
+            compute (Callable): Вычисляет значение и сохраняет его в кэш
+            load_cached (Callable): Читает значение из кэша (`MISSING` — нет значения)
+
+        Returns:
+            Any: Результат вычисления (своего или чужого)
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            await asyncio.wait({future})
+            if not future.cancelled():
+                return future.result()
+            # Запрос-владелец был отменён (например, клиент отключился) — вычисляем сами
+            return await compute()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._run_locked(key, compute, load_cached)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # помечаем исключение как полученное
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _run_locked(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        load_cached: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        if not self.distributed:
+            return await compute()
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_helper.client.set(
+                lock_key,
+                token,
+                nx=True,
+                px=int(self.lock_ttl * 1000),
+            )
+        except RedisError as exc:
+            log.warning("Single-flight: Redis is unavailable: %r", exc)
+            return await compute()
+
+        if acquired:
+            try:
+                return await compute()
+            finally:
+                try:
+                    await self._release_lock(keys=[lock_key], args=[token])
+                except RedisError as exc:
+                    log.warning("Single-flight: failed to release lock: %r", exc)
+
+        # Значение вычисляет другой воркер — ждём его в кэше
+        deadline = time.monotonic() + self.lock_ttl
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                cached = await load_cached()
+                if cached is not MISSING:
+                    return cached
+                if not await redis_helper.client.exists(lock_key):
+                    break
+        except RedisError as exc:
+            log.warning("Single-flight: Redis is unavailable: %r", exc)
+        return await compute()
+
+    async def try_refresh(self, key: str) -> Optional[str]:
+        """
+        Пытается стать единственным обновляющим устаревшую запись (stale-while-revalidate).
+
+        Returns:
+            str | None: Токен блокировки (вызывающий обновляет запись и передаёт токен
+                в `release_refresh`) или None — запись уже обновляет другой запрос
+        """
+        if self.in_flight(key) or key in self._refreshing:
+            return None
+
+        token = uuid.uuid4().hex
+        if self.distributed:
+            try:
+                acquired = await redis_helper.client.set(
+                    f"{key}:refresh",
+                    token,
+                    nx=True,
+                    px=int(self.lock_ttl * 1000),
+                )
+            except RedisError as exc:
+                log.warning("Single-flight: Redis is unavailable: %r", exc)
+                return None
+            if not acquired:
+                return None
+
+        self._refreshing.add(key)
+        return token
+
+    async def release_refresh(self, key: str, token: str) -> None:
+        """
+        Снимает блокировку обновления после обновления записи.
+
+        Args:
+            key (str): Ключ кэша
+            token (str): Токен из `try_refresh`
+        """
+        self._refreshing.discard(key)
+        if not self.distributed:
+            return
+        try:
+            await self._release_lock(keys=[f"{key}:refresh"], args=[token])
+        except RedisError as exc:
+            log.warning("Single-flight: failed to release refresh lock: %r", exc)
+
+
+# Глобальный экземпляр для использования в приложении
+single_flight = SingleFlight(
+    lock_ttl=settings.cache.single_flight.lock_ttl,
+    poll_interval=settings.cache.single_flight.poll_interval,
+    distributed=settings.cache.single_flight.distributed,
+)
@@ -0,0 +1,169 @@
+import logging
+import uuid
+
+from inspect import Parameter, signature
+from string import Formatter
+from typing import Any, Callable, Iterable, Sequence
+
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.redis_helper import redis_helper
+from .invalidation import CacheInvalidator, cache_invalidator
+
+log = logging.getLogger(__name__)
+
+
+class CacheTags:
+    """
+    Версии тегов кэша в Redis.
+
+    Каждая запись кэша зависит от набора тегов (например, `users:list`, `user:42`),
+    а текущие версии этих тегов входят в её ключ. Инвалидация тега — это `INCR` его версии:
+    старые записи просто перестают совпадать по ключу и удаляются Redis по TTL.
+    Ни `SCAN`, ни `KEYS` по пространству кэша не требуется.
+
+    Версии также хранятся в L1 воркера (`CacheInvalidator.local`), чтобы попадание в кэш
+    не требовало обращения к Redis; инвалидация тега рассылается всем воркерам.
+
+    Attributes:
+        prefix (str): Префикс ключей версий в Redis
+        invalidator (CacheInvalidator): Локальный уровень и рассылка инвалидаций
+
+    Args:
+        prefix (str): Префикс ключей версий в Redis
+        invalidator (CacheInvalidator): Локальный уровень и рассылка инвалидаций
+    """
+
+    def __init__(self, invalidator: CacheInvalidator, prefix: str = "tags") -> None:
+        self.prefix = prefix
+        self.invalidator = invalidator
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:{tag}"
+
+    async def versions(self, tags: Sequence[str]) -> list[int]:
+        """
+        Возвращает текущие версии тегов (0 — тег ещё не инвалидировался).
+
+        Args:
+            tags (Sequence[str]): Теги записи
+
+        Returns:
+            list[int]: Версии в том же порядке, что и теги
+
+        Raises:
+            RedisError: Если Redis недоступен
+        """
+        if not tags:
+            return []
+
+        keys = [self._tag_key(tag) for tag in tags]
+        local = self.invalidator.local if self.invalidator.active else None
+        versions = [local.get(key) if local is not None else None for key in keys]
+        missing = [key for key, version in zip(keys, versions) if version is None]
+        if not missing:
+            return versions
+
+        epoch = self.invalidator.epoch
+        raw = await redis_helper.client.mget(missing)
+        fetched = dict(zip(missing, (int(value or 0) for value in raw)))
+        # Версии, прочитанные до инвалидации тега, в L1 не попадают
+        for key, version in fetched.items():
+            self.invalidator.store(key, version, epoch)
+        return [
+            fetched[key] if version is None else version
+            for key, version in zip(keys, versions)
+        ]
+
+    async def version_suffix(self, tags: Sequence[str]) -> str:
+        """
+        Суффикс ключа кэша из версий тегов.
+
+        Если Redis недоступен, возвращается случайный суффикс: запрос гарантированно
+        промахивается мимо кэша, а не получает запись с неизвестной версией.
+
+        Args:
+            tags (Sequence[str]): Теги записи
+
+        Returns:
+            str: Суффикс вида `v1.0.3`
+        """
+        try:
+            versions = await self.versions(tags)
+        except RedisError as exc:
+            log.warning("Cache tags: Redis is unavailable: %r", exc)
+            return f"miss-{uuid.uuid4().hex}"
+        return "v" + ".".join(map(str, versions))
+
+    async def invalidate(self, *tags: str) -> None:
+        """
+        Инвалидирует все записи кэша, зависящие от тегов.
+
+        Args:
+            *tags (str): Теги для инвалидации
+        """
+        if not tags:
+            return
+        keys = [self._tag_key(tag) for tag in tags]
+        try:
+            async with redis_helper.client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.incr(key)
+                await pipe.execute()
+        except RedisError as exc:
+            log.warning("Cache tags: Redis is unavailable: %r", exc)
+        await self.invalidator.publish(keys=keys)
+
+
+def format_tags(tags: Iterable[str], kwargs: dict) -> list[str]:
+    """
+    Подставляет аргументы эндпоинта в шаблоны тегов (`"user:{id}"` → `"user:42"`).
+
+    Args:
+        tags (Iterable[str]): Шаблоны тегов
+        kwargs (dict): Аргументы эндпоинта
+
+    Returns:
+        list[str]: Теги записи
+    """
+    return [tag.format_map(kwargs) if "{" in tag else tag for tag in tags]
+
+
+def validate_tags(tags: Iterable[str], func: Callable[..., Any]) -> None:
+    """
+    Проверяет при декорировании, что шаблоны тегов ссылаются только на параметры эндпоинта.
+
+    Иначе ошибка в шаблоне (`"user:{user_id}"` при параметре `id`) проявилась бы
+    только при запросе — как `KeyError` из `format_tags`.
+
+    Args:
+        tags (Iterable[str]): Шаблоны тегов
+        func (Callable): Эндпоинт
+
+    Raises:
+        ValueError: Если шаблон некорректен или ссылается на отсутствующий параметр
+    """
+    parameters = signature(func).parameters
+    if any(param.kind is Parameter.VAR_KEYWORD for param in parameters.values()):
+        return
+
+    for tag in tags:
+        try:
+            fields = [field for _, field, _, _ in Formatter().parse(tag) if field is not None]
+        except ValueError as exc:
+            raise ValueError(f"Некорректный шаблон тега кэша {tag!r}: {exc}") from exc
+        for field in fields:
+            name = field.split(".", 1)[0].split("[", 1)[0]
+            if name not in parameters:
+                raise ValueError(
+                    f"Шаблон тега кэша {tag!r} ссылается на параметр {name!r}, "
+                    f"которого нет у {func.__qualname__}"
+                )
+
+
+# Глобальный экземпляр для использования в приложении
+cache_tags = CacheTags(
+    invalidator=cache_invalidator,
+    prefix=f"{settings.cache.prefix}:tags",
+)
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+
+from typing import Any, Awaitable, Callable, Sequence
+
+from sqlalchemy import ColumnElement, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase
+
+log = logging.getLogger(__name__)
+
+
+class DeleteReport:
+    """
+    Результат удаления пачками.
+
+    Attributes:
+        table (str): Таблица
+        deleted (int): Удалено строк
+        batches (int): Выполнено пачек (транзакций)
+        elapsed (float): Затраченное время (в секундах)
+        completed (bool): Удалены все подходящие строки (False — исчерпан бюджет времени)
+    """
+
+    __slots__ = ("table", "deleted", "batches", "elapsed", "completed")
+
+    def __init__(self, table: str) -> None:
+        self.table = table
+        self.deleted = 0
+        self.batches = 0
+        self.elapsed = 0.0
+        self.completed = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.deleted / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "table": self.table,
+            "deleted": self.deleted,
+            "batches": self.batches,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "completed": self.completed,
+        }
+
+
+class ChunkedDeleter:
+    """
+    Удаление строк пачками по первичному ключу.
+
+    Вместо одного `DELETE ... WHERE <условие>` на всю таблицу удаляет строки
+    пачками по `batch_size` (`DELETE ... WHERE pk IN (SELECT pk ... LIMIT n)`),
+    каждую в отдельной короткой транзакции: блокировки держатся недолго, WAL растёт
+    равномерно, а репликам проще успевать. Между пачками делается пауза `pause`.
+    Если удаление не укладывается в `time_budget`, оно прерывается и продолжится
+    при следующем запуске.
+
+    Attributes:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной БД
+        batch_size (int): Размер пачки
+        pause (float): Пауза между пачками (в секундах)
+        time_budget (float): Максимальное время одного запуска (в секундах)
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной БД
+        batch_size (int): Размер пачки
+        pause (float): Пауза между пачками (в секундах)
+        time_budget (float): Максимальное время одного запуска (в секундах)
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 1000,
+        pause: float = 0.1,
+        time_budget: float = 300,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.pause = pause
+        self.time_budget = time_budget
+
+    async def delete(
+        self,
+        model: type[DeclarativeBase],
+        *where: ColumnElement[bool],
+        on_deleted: Callable[[Sequence[Any]], Awaitable[None]] | None = None,
+    ) -> DeleteReport:
+        """
+        Удаляет строки модели, подходящие под условия.
+
+        Args:
+            model (type[DeclarativeBase]): Модель
+            *where (ColumnElement[bool]): Условия отбора строк
+            on_deleted (Callable | None): Вызывается после каждой пачки
+                с первичными ключами удалённых строк (`DELETE ... RETURNING`)
+
+        Returns:
+            DeleteReport: Количество удалённых строк, пачек и скорость
+        """
+        table = model.__table__
+        (pk,) = table.primary_key.columns
+        batch = select(pk).where(*where).limit(self.batch_size).scalar_subquery()
+        statement = delete(table).where(pk.in_(batch))
+        if on_deleted is not None:
+            statement = statement.returning(pk)
+
+        report = DeleteReport(table.name)
+        start = time.perf_counter()
+        while True:
+            async with self.session_factory() as session:
+                result = await session.execute(statement)
+                if on_deleted is not None:
+                    deleted_ids = result.scalars().all()
+                    rowcount = len(deleted_ids)
+                else:
+                    rowcount = result.rowcount
+                await session.commit()
+            if on_deleted is not None and deleted_ids:
+                await on_deleted(deleted_ids)
+            report.batches += 1
+            report.deleted += rowcount
+            report.elapsed = time.perf_counter() - start
+
+            if rowcount < self.batch_size:
+                report.completed = True
+                break
+            if report.elapsed >= self.time_budget:
+                log.warning(
+                    "Cleanup %r: time budget exhausted, %r rows deleted, will continue next run",
+                    report.table,
+                    report.deleted,
+                )
+                break
+            log.debug(
+                "Cleanup %r: %r rows deleted (%.0f rows/s)",
+                report.table,
+                report.deleted,
+                report.rows_per_second,
+            )
+            await asyncio.sleep(self.pause)
+
+        report.elapsed = time.perf_counter() - start
+        return report
@@ -49,3 +49,23 @@ class GunicornConfig(BaseModel):
     port: int = 8000
     workers: int = 1
     timeout: int = 900
+
+
+class SchedulerConfig(BaseModel):
+    """Конфигурация фоновых задач (APScheduler)"""
+
+    # True - каждую задачу выполняет один экземпляр на кластер (блокировка в Redis),
+    # False - задачи выполняются в каждом воркере
+    distributed: bool = True
+    lock_ttl: int = 60  # Время жизни блокировки без продления (в секундах)
+    key_prefix: str = "scheduler"  # Префикс ключей блокировок и статистики в Redis
+
+
+class CleanupConfig(BaseModel):
+    """Конфигурация очистки просроченных токенов, неподтверждённых пользователей и очереди писем"""
+
+    batch_size: int = 1000  # Сколько строк удалять в одной транзакции
+    pause: float = 0.1  # Пауза между пачками (в секундах)
+    time_budget: int = 300  # Максимальное время одного запуска (в секундах)
+    unverified_users_hours: int = 24  # Через сколько часов удалять неподтверждённых пользователей
+    outbox_retention_hours: int = 72  # Срок хранения отправленных и dead писем (в часах)
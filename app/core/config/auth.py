@@ -1,3 +1,4 @@
+from typing import Literal, Optional
 from pydantic import BaseModel, SecretStr
 
 
@@ -6,11 +7,53 @@ class AccessToken(BaseModel):
 
     # Срок жизни токена
     lifetime_seconds: int = 3600
+    # Стратегия токенов доступа:
+    # database - случайный токен, хранящийся в таблице access_tokens (чтение из БД/кэша на запрос)
+    # signed - подписанный токен (id пользователя, поколение, срок), проверяется без I/O
+    strategy: Literal["database", "signed"] = "database"
+    # Ключ подписи токенов стратегии signed (обязателен для неё)
+    signing_secret: Optional[SecretStr] = None
 
     reset_password_token_secret: SecretStr
     verification_token_secret: SecretStr
 
 
+class TokenCacheConfig(BaseModel):
+    """Настройки кэша токенов доступа (в памяти воркера + Redis)"""
+
+    enabled: bool = True
+    # Максимальное количество токенов в памяти одного воркера
+    max_size: int = 10_000
+    # Время жизни записи в памяти воркера (в секундах).
+    # Ограничивает, как долго другие воркеры могут видеть устаревшие данные пользователя.
+    local_ttl: int = 30
+    # Использовать ли общий уровень кэша в Redis
+    use_redis: bool = True
+    # Время жизни записи в Redis (в секундах)
+    redis_ttl: int = 300
+
+
+class TokenRevocationConfig(BaseModel):
+    """Настройки списка отозванных подписанных токенов (фильтр Блума в памяти воркера + Redis)"""
+
+    # Ожидаемое количество отозванных токенов за срок жизни токена
+    capacity: int = 100_000
+    # Доля ложноположительных срабатываний фильтра Блума
+    # (для них выполняется точная проверка в Redis)
+    error_rate: float = 0.001
+
+
+class PasswordHashingConfig(BaseModel):
+    """Настройки пула хеширования паролей (argon2/bcrypt выполняются вне цикла событий)"""
+
+    # thread - пул потоков (argon2-cffi и bcrypt освобождают GIL), process - пул процессов
+    executor: Literal["thread", "process"] = "thread"
+    max_workers: int = 2  # Размер пула
+    # Максимальное количество одновременных операций (None - равно max_workers),
+    # остальные ждут в очереди
+    max_concurrency: Optional[int] = None
+
+
 class AdminConfig(BaseModel):
     """Конфигурация администратора"""
 
@@ -29,3 +72,15 @@ class RateLimitConfig(BaseModel):
 
     enabled: bool = True
     default_limits: list[str] = ["40/minute"]
+    # Где хранить счётчики: redis — общие для всех воркеров и узлов, memory — в памяти процесса
+    storage: Literal["redis", "memory"] = "redis"
+    # Алгоритм подсчёта (sliding-window-counter — одна атомарная Lua-операция в Redis на лимит)
+    strategy: Literal[
+        "fixed-window",
+        "moving-window",
+        "sliding-window-counter",
+    ] = "sliding-window-counter"
+    # При недоступности Redis временно считать лимиты в памяти процесса
+    in_memory_fallback: bool = True
+    # Таймаут подключения и операций с Redis (в секундах)
+    redis_timeout: float = 0.25
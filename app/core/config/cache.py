@@ -5,6 +5,7 @@ class RedisDB(BaseModel):
     """Настройки Redis"""
 
     cache: int = 0
+    rate_limit: int = 1
 
 
 class RedisConfig(BaseModel):
@@ -14,6 +15,10 @@ class RedisConfig(BaseModel):
     port: int = 6379
     db: RedisDB = RedisDB()
 
+    def url(self, db: int) -> str:
+        """DSN подключения к базе Redis с номером `db`."""
+        return f"redis://{self.host}:{self.port}/{db}"
+
 
 class CacheNamespace(BaseModel):
     """Именование пространства кэша"""
@@ -21,9 +26,40 @@ class CacheNamespace(BaseModel):
     users_list: str = "users-list"
 
 
+class CacheTag(BaseModel):
+    """Теги записей кэша (шаблоны подставляются аргументами эндпоинта)"""
+
+    users_list: str = "users:list"
+    user: str = "user:{id}"
+
+
+class LocalCacheConfig(BaseModel):
+    """Настройки локального (L1) кэша в памяти воркера"""
+
+    enabled: bool = True
+    # Максимальное количество записей в памяти воркера
+    max_size: int = 10_000
+    # Время жизни записи в памяти воркера (в секундах)
+    ttl: int = 10
+
+
+class SingleFlightConfig(BaseModel):
+    """Настройки объединения одновременных промахов кэша"""
+
+    # Блокировки в Redis — объединять промахи и между воркерами, а не только внутри воркера
+    distributed: bool = True
+    # Время жизни блокировки (в секундах): дольше — ожидающие вычисляют сами
+    lock_ttl: float = 10.0
+    # Интервал опроса кэша ожидающими воркерами (в секундах)
+    poll_interval: float = 0.05
+
+
 class CacheConfig(BaseModel):
     """Настройки кэша"""
 
     enabled: bool = True
     prefix: str = "fastapi-cache"
     namespace: CacheNamespace = CacheNamespace()
+    tag: CacheTag = CacheTag()
+    local: LocalCacheConfig = LocalCacheConfig()
+    single_flight: SingleFlightConfig = SingleFlightConfig()
@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Literal, Optional
+
 from pydantic import BaseModel, SecretStr
 
 
@@ -20,3 +23,30 @@ class SMTPConfig(BaseModel):
     password: SecretStr  # (app password - пароль для приложения)
     use_tls: bool = True  # Использовать ли шифрование TLS
     timeout: int = 10  # Максимальное время ожидания ответа от сервера (в секундах)
+    pool_size: int = 4  # Количество постоянных соединений в пуле
+    health_check_interval: int = 30  # Проверять NOOP соединение, простоявшее дольше (в секундах)
+
+
+class MailOutboxConfig(BaseModel):
+    """Конфигурация очереди исходящих писем (outbox)"""
+
+    # background - письма отправляются BackgroundTasks в процессе веб-сервера,
+    # outbox - письма сохраняются в БД и отправляются воркером run_mail_worker.py
+    # (без запущенного воркера письма не уходят)
+    delivery: Literal["background", "outbox"] = "background"
+    batch_size: int = 50  # Сколько писем воркер забирает за раз
+    concurrency: int = 4  # Количество параллельных SMTP-сессий на пачку
+    poll_interval: float = 1.0  # Пауза при пустой очереди (в секундах)
+    lease_seconds: int = 300  # Через сколько взятое, но не отправленное письмо снова доступно (в секундах)
+    max_attempts: int = 8  # После стольких неудачных попыток письмо помечается dead
+    backoff_base: int = 30  # Задержка перед первой повторной попыткой (в секундах)
+    backoff_max: int = 3600  # Максимальная задержка между попытками (в секундах)
+
+
+class MailRenderConfig(BaseModel):
+    """Конфигурация рендеринга писем"""
+
+    # Каталог для байткода шаблонов писем (None - шаблоны компилируются в памяти при старте)
+    bytecode_cache_dir: Optional[Path] = None
+    parallel_threshold: int = 16  # Пачки писем от этого размера рендерятся в пуле потоков
+    max_workers: int = 2  # Количество потоков для рендеринга
@@ -8,6 +8,7 @@ class ApiV1Prefix(BaseModel):
     webhooks: str = "/webhooks"
     auth: str = "/auth"
     users: str = "/users"
+    metrics: str = "/metrics"
 
 
 class ApiPrefix(BaseModel):
@@ -4,10 +4,17 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from .prefix.api import ApiPrefix
 from .prefix.view import ViewPrefix
 
-from .app import SiteConfig, RunConfig, GunicornConfig
-from .auth import AccessToken, AdminConfig, RateLimitConfig
+from .app import SiteConfig, RunConfig, GunicornConfig, SchedulerConfig, CleanupConfig
+from .auth import (
+    AccessToken,
+    AdminConfig,
+    PasswordHashingConfig,
+    RateLimitConfig,
+    TokenCacheConfig,
+    TokenRevocationConfig,
+)
 from .cache import CacheConfig, RedisConfig
-from .external import WebhookConfig, SMTPConfig
+from .external import WebhookConfig, SMTPConfig, MailOutboxConfig, MailRenderConfig
 from .db import DataBaseConfig
 from .logging import LoggingConfig
 
@@ -28,17 +35,24 @@ class Settings(BaseSettings):
     site: SiteConfig
     run: RunConfig = RunConfig()
     gunicorn: GunicornConfig = GunicornConfig()
+    scheduler: SchedulerConfig = SchedulerConfig()
+    cleanup: CleanupConfig = CleanupConfig()
     logging: LoggingConfig = LoggingConfig()
     api: ApiPrefix = ApiPrefix()
     view: ViewPrefix = ViewPrefix()
     db: DataBaseConfig
     access_token: AccessToken
+    token_cache: TokenCacheConfig = TokenCacheConfig()
+    token_revocation: TokenRevocationConfig = TokenRevocationConfig()
+    password_hashing: PasswordHashingConfig = PasswordHashingConfig()
     webhook: WebhookConfig
     admin: AdminConfig
     rate_limit: RateLimitConfig
     redis: RedisConfig = RedisConfig()
     cache: CacheConfig
     smtp: SMTPConfig
+    mail_outbox: MailOutboxConfig = MailOutboxConfig()
+    mail_render: MailRenderConfig = MailRenderConfig()
 
 
 settings = Settings()  # type: ignore
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import uuid
+
+from contextlib import suppress
+from typing import Optional
+
+from redis.asyncio import Redis
+
+log = logging.getLogger(__name__)
+
+
+# Lua: удалить блокировку, только если она принадлежит нам
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Lua: продлить блокировку, только если она принадлежит нам
+_EXTEND_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisLock:
+    """
+    Распределённая блокировка на Redis (`SET NX PX`) с автоматическим продлением.
+
+    Пока блокировка удерживается, фоновая задача продлевает её каждые `ttl / 3` секунд,
+    поэтому долгая операция не теряет блокировку, а упавший процесс освобождает её
+    не позже чем через `ttl`. Снять или продлить блокировку может только владелец
+    (сравнение случайного токена в Lua-скрипте).
+
+    Attributes:
+        key (str): Ключ блокировки
+        ttl (float): Время жизни блокировки без продления (в секундах)
+        lost (bool): Блокировка потеряна во время работы (продление не удалось)
+
+    Args:
+        redis (Redis): Асинхронный клиент Redis
+        key (str): Ключ блокировки
+        ttl (float): Время жизни блокировки без продления (в секундах)
+    """
+
+    def __init__(self, redis: Redis, key: str, ttl: float = 60) -> None:
+        self.redis = redis
+        self.key = key
+        self.ttl = ttl
+        self.lost = False
+        self._token = uuid.uuid4().hex
+        self._renewal: Optional[asyncio.Task] = None
+        self._release = redis.register_script(_RELEASE_SCRIPT)
+        self._extend = redis.register_script(_EXTEND_SCRIPT)
+
+    async def acquire(self) -> bool:
+        """
+        Пытается захватить блокировку (без ожидания).
+
+        Returns:
+            bool: True, если блокировка захвачена
+
+        Raises:
+            RedisError: Если Redis недоступен
+        """
+        acquired = await self.redis.set(
+            self.key, self._token, nx=True, px=int(self.ttl * 1000)
+        )
+        if acquired:
+            self.lost = False
+            self._renewal = asyncio.create_task(self._renew())
+        return bool(acquired)
+
+    async def _renew(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                extended = await self._extend(
+                    keys=[self.key], args=[self._token, int(self.ttl * 1000)]
+                )
+            except Exception as exc:
+                log.warning("Lock %r: renewal failed: %r", self.key, exc)
+                continue
+            if not extended:
+                log.warning("Lock %r: lost", self.key)
+                self.lost = True
+                return
+
+    async def release(self, hold_for: Optional[float] = None) -> None:
+        """
+        Освобождает блокировку.
+
+        Args:
+            hold_for (float | None): Не удалять блокировку, а оставить её ещё на столько
+                секунд (например, чтобы задача не запускалась повторно в этом интервале)
+        """
+        if self._renewal is not None:
+            self._renewal.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._renewal
+            self._renewal = None
+        try:
+            if hold_for:
+                await self._extend(
+                    keys=[self.key], args=[self._token, int(hold_for * 1000)]
+                )
+            else:
+                await self._release(keys=[self.key], args=[self._token])
+        except Exception as exc:
+            # Блокировка истечёт сама по TTL
+            log.warning("Lock %r: release failed: %r", self.key, exc)
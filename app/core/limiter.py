@@ -1,14 +1,219 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import asyncio
+import logging
+import time
+
+from typing import Callable, Optional
+
+from limits import RateLimitItem, parse_many
+from limits.aio.storage import MemoryStorage, Storage
+from limits.aio.strategies import (
+    FixedWindowRateLimiter,
+    MovingWindowRateLimiter,
+    RateLimiter,
+    SlidingWindowCounterRateLimiter,
+)
+from limits.errors import StorageError
+from limits.storage import storage_from_string
+from fastapi import HTTPException, Request, status
+from starlette.types import Scope
 
 from core.config import settings
 
+log = logging.getLogger(__name__)
+
+
+# Алгоритмы подсчёта (limits.aio)
+STRATEGIES: dict[str, type[RateLimiter]] = {
+    "fixed-window": FixedWindowRateLimiter,
+    "moving-window": MovingWindowRateLimiter,
+    "sliding-window-counter": SlidingWindowCounterRateLimiter,
+}
+
+
+def get_remote_address(scope: Scope) -> str:
+    """Ключ лимита по умолчанию — IP-адрес клиента."""
+    client = scope.get("client")
+    return client[0] if client else "127.0.0.1"
+
+
+class Limiter:
+    """
+    Асинхронный ограничитель частоты запросов на `limits.aio`.
+
+    Лимиты по умолчанию применяются к каждому маршруту, лимиты из `@limiter.limit(...)`
+    заменяют их для конкретного эндпоинта, `@limiter.exempt` отключает проверку.
+    Проверку выполняет зависимость приложения `limiter.check`
+    (`FastAPI(dependencies=[Depends(limiter.check)])`).
+
+    Счётчики хранятся в асинхронном хранилище (`async+redis://` — общие для всех
+    воркеров и узлов, `async+memory://` — в памяти процесса). Запросы к Redis не блокируют
+    цикл событий; при его недоступности (с `in_memory_fallback`) те же лимиты
+    `retry_interval` секунд считаются в памяти процесса, затем Redis пробуется снова.
+
+    Attributes:
+        enabled (bool): Включена ли проверка лимитов
+        default_limits (list[RateLimitItem]): Лимиты по умолчанию
+
+    Args:
+        key_func (Callable[[Scope], str]): Ключ клиента (по умолчанию — IP-адрес)
+        default_limits (list[str]): Лимиты по умолчанию (например, `["40/minute"]`)
+        strategy (str): Алгоритм подсчёта
+        storage_uri (str): URI хранилища `limits` (`async+redis://...`, `async+memory://`)
+        storage_options (dict | None): Параметры хранилища (например, таймауты Redis)
+        in_memory_fallback (bool): Считать лимиты в памяти процесса при недоступности хранилища
+        retry_interval (float): Через сколько секунд снова пробовать недоступное хранилище
+        enabled (bool): Включена ли проверка лимитов
+    """
+
+    def __init__(
+        self,
+        key_func: Callable[[Scope], str] = get_remote_address,
+        default_limits: Optional[list[str]] = None,
+        strategy: str = "fixed-window",
+        storage_uri: str = "async+memory://",
+        storage_options: Optional[dict] = None,
+        in_memory_fallback: bool = False,
+        retry_interval: float = 5,
+        enabled: bool = True,
+    ) -> None:
+        self.key_func = key_func
+        self.enabled = enabled
+        self.default_limits = [item for value in default_limits or () for item in parse_many(value)]
+        self.retry_interval = retry_interval
+
+        storage: Storage = storage_from_string(storage_uri, **(storage_options or {}))
+        self._limiter = STRATEGIES[strategy](storage)
+        self._fallback = STRATEGIES[strategy](MemoryStorage()) if in_memory_fallback else None
+        self._storage_down_until = 0.0
+        self._route_limits: dict[Callable, list[RateLimitItem]] = {}
+        self._exempt: set[Callable] = set()
+
+    def limit(self, limit_value: str) -> Callable[[Callable], Callable]:
+        """
+        Декоратор лимита эндпоинта (например, `@limiter.limit("5/hour")`).
+
+        Эндпоинт возвращается без обёртки: лимит проверяет `limiter.check`.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            self._route_limits.setdefault(func, []).extend(parse_many(limit_value))
+            return func
+
+        return decorator
+
+    def exempt(self, func: Callable) -> Callable:
+        """Декоратор эндпоинта без лимитов."""
+        self._exempt.add(func)
+        return func
+
+    def limits_for(self, endpoint: Callable) -> list[RateLimitItem]:
+        """Лимиты эндпоинта (пусто — не проверять)."""
+        if not self.enabled or endpoint in self._exempt:
+            return []
+        return self._route_limits.get(endpoint, self.default_limits)
+
+    def _strategy(self) -> Optional[RateLimiter]:
+        """Стратегия для следующей проверки: после ошибки хранилища — запасная (в памяти)."""
+        if time.monotonic() < self._storage_down_until:
+            return self._fallback
+        return self._limiter
+
+    async def hit(self, scope: Scope, endpoint: Callable) -> Optional[RateLimitItem]:
+        """
+        Учитывает запрос во всех лимитах эндпоинта.
+
+        Лимиты учитываются одновременно: у `limits.aio` нет пакетного API для нескольких
+        лимитов, поэтому запросы к хранилищу отправляются параллельно (по соединениям
+        пула), и проверка занимает одно время ответа Redis, а не по одному на лимит.
+
+        Args:
+            scope (Scope): ASGI scope запроса
+            endpoint (Callable): Эндпоинт маршрута
+
+        Returns:
+            RateLimitItem | None: Превышенный лимит или None, если запрос разрешён
+        """
+        items = self.limits_for(endpoint)
+        if not items:
+            return None
+
+        # Счётчики отдельные для каждого клиента и эндпоинта
+        identifiers = (self.key_func(scope), f"{endpoint.__module__}.{endpoint.__qualname__}")
+
+        strategy = self._strategy()
+        if strategy is None:
+            return None
+        try:
+            allowed = await self._hit_all(strategy, items, identifiers)
+        except StorageError as exc:
+            log.warning("Rate limit: storage is unavailable: %r", exc)
+            self._storage_down_until = time.monotonic() + self.retry_interval
+            if self._fallback is None:
+                return None
+            allowed = await self._hit_all(self._fallback, items, identifiers)
+        return next((item for item, ok in zip(items, allowed) if not ok), None)
+
+    @staticmethod
+    async def _hit_all(
+        strategy: RateLimiter,
+        items: list[RateLimitItem],
+        identifiers: tuple[str, str],
+    ) -> list[bool]:
+        """Учитывает запрос во всех лимитах одновременно (True — лимит не превышен)."""
+        if len(items) == 1:
+            return [await strategy.hit(items[0], *identifiers)]
+        return await asyncio.gather(*(strategy.hit(item, *identifiers) for item in items))
+
+    async def check(self, request: Request) -> None:
+        """
+        Зависимость приложения: учитывает запрос в лимитах его эндпоинта.
+
+        Запросы без маршрута FastAPI (статика, смонтированные приложения) не проверяются.
+
+        Raises:
+            HTTPException: 429, если лимит превышен
+        """
+        endpoint = getattr(request.scope.get("route"), "endpoint", None)
+        if endpoint is not None and await self.hit(request.scope, endpoint) is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Слишком много запросов, попробуйте позже.",
+            )
+
+
+def _storage_uri() -> str:
+    """
+    Хранилище счётчиков лимитов.
+
+    Redis делает лимиты общими для всех воркеров и узлов (иначе `5/hour` на N воркерах
+    превращается в `5×N/hour`) и сохраняет счётчики между перезапусками.
+    Используется асинхронный клиент: проверка лимита не блокирует цикл событий.
+    """
+    if settings.rate_limit.storage == "redis":
+        return "async+" + settings.redis.url(settings.redis.db.rate_limit)
+    return "async+memory://"
+
 
 # Защита от спама (bruteforce).
 if settings.rate_limit.enabled and settings.site.environment != "testing":
     limiter = Limiter(
         key_func=get_remote_address,
         default_limits=settings.rate_limit.default_limits,
+        strategy=settings.rate_limit.strategy,
+        storage_uri=_storage_uri(),
+        storage_options=(
+            {
+                "implementation": "redispy",
+                "wrap_exceptions": True,
+                "socket_timeout": settings.rate_limit.redis_timeout,
+                "socket_connect_timeout": settings.rate_limit.redis_timeout,
+            }
+            if settings.rate_limit.storage == "redis"
+            else {}
+        ),
+        # Если Redis недоступен — те же лимиты считаются в памяти процесса,
+        # пока хранилище не восстановится
+        in_memory_fallback=settings.rate_limit.in_memory_fallback,
         enabled=True,
     )
 else:
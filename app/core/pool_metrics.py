@@ -0,0 +1,138 @@
+import time
+
+from bisect import bisect_left
+from typing import Any
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool
+
+
+# Границы корзин гистограмм (в секундах)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Простая гистограмма длительностей с фиксированными корзинами (в стиле Prometheus).
+
+    Attributes:
+        buckets (tuple[float, ...]): Верхние границы корзин (в секундах)
+        count (int): Количество наблюдений
+        sum (float): Сумма наблюдений (в секундах)
+
+    Args:
+        buckets (tuple[float, ...]): Верхние границы корзин (в секундах)
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Добавляет наблюдение (в секундах)."""
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Возвращает состояние гистограммы с накопительными счётчиками по корзинам.
+
+        Returns:
+            dict[str, Any]: {"count": ..., "sum": ..., "buckets": {"0.001": ..., ..., "+Inf": ...}}
+        """
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*self.buckets, "+Inf"), self._counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": buckets,
+        }
+
+
+class PoolMetrics:
+    """
+    Метрики пула соединений.
+
+    Attributes:
+        checkout_wait (Histogram): Время получения соединения из пула
+        connect_time (Histogram): Время установки нового соединения с БД
+        connect_errors (int): Количество неудачных попыток подключения
+    """
+
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram()
+        self.connect_time = Histogram()
+        self.connect_errors = 0
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool`, собирающий метрики ожидания соединения и времени подключения.
+
+    Метрики переживают `engine.dispose()`: новый пул, создаваемый в `recreate()`,
+    продолжает писать в тот же объект `PoolMetrics`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "InstrumentedAsyncAdaptedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.checkout_wait.observe(time.perf_counter() - start)
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            connection = super()._create_connection()
+        except Exception:
+            self.metrics.connect_errors += 1
+            raise
+        self.metrics.connect_time.observe(time.perf_counter() - start)
+        return connection
+
+
+def get_pool_stats(pool: Pool) -> dict[str, Any]:
+    """
+    Возвращает текущее состояние пула соединений и накопленные метрики.
+
+    Для пулов без очереди (например, `StaticPool` в тестах) возвращаются только доступные поля.
+
+    Args:
+        pool (Pool): Пул соединений движка
+
+    Returns:
+        dict[str, Any]: Статистика пула
+    """
+    stats: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+
+    metrics = getattr(pool, "metrics", None)
+    if isinstance(metrics, PoolMetrics):
+        stats.update(
+            checkout_wait_seconds=metrics.checkout_wait.snapshot(),
+            connect_time_seconds=metrics.connect_time.snapshot(),
+            connect_errors=metrics.connect_errors,
+        )
+    return stats
@@ -0,0 +1,51 @@
+from redis.asyncio import Redis
+
+from core.config import settings
+
+
+class RedisHelper:
+    """
+    Утилита для управления асинхронным подключением к Redis.
+
+    Предоставляет один общий клиент (с собственным пулом соединений) для кэша,
+    кэша токенов и других подсистем, которым нужен Redis.
+    Подключение устанавливается лениво — при первой команде.
+
+    Используется как Singleton (`redis_helper`) для централизованного доступа к Redis.
+
+    Attributes:
+        client (Redis): Асинхронный клиент Redis
+
+    Args:
+        host (str): Хост Redis
+        port (int): Порт Redis
+        db (int): Номер базы данных Redis
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int = 0,
+    ) -> None:
+        self.client: Redis = Redis(
+            host=host,
+            port=port,
+            db=db,
+        )
+
+    # Закрытие клиента
+    async def dispose(self) -> None:
+        """
+        Закрывает все соединения пула клиента Redis.
+        Вызывается при завершении работы приложения.
+        """
+        await self.client.aclose()
+
+
+# Глобальный экземпляр для использования в приложении
+redis_helper = RedisHelper(
+    host=settings.redis.host,
+    port=settings.redis.port,
+    db=settings.redis.db.cache,
+)
@@ -0,0 +1,173 @@
+import logging
+import orjson
+import os
+import socket
+import time
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from apscheduler.triggers.interval import IntervalTrigger
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.distributed_lock import RedisLock
+from core.redis_helper import redis_helper
+
+log = logging.getLogger(__name__)
+
+
+# Точка отсчёта интервалов: все воркеры запускают задачу в одни и те же моменты
+_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def aligned_interval_trigger(interval: timedelta, jitter: int = 0) -> IntervalTrigger:
+    """
+    Интервальный триггер, выровненный по общей точке отсчёта.
+
+    Без выравнивания каждый воркер отсчитывает интервал от своего старта,
+    и запуски разных воркеров разнесены произвольно внутри интервала.
+
+    Args:
+        interval (timedelta): Интервал запуска
+        jitter (int): Случайное смещение запуска (в секундах)
+
+    Returns:
+        IntervalTrigger: Триггер
+    """
+    return IntervalTrigger(
+        seconds=int(interval.total_seconds()),
+        start_date=_EPOCH,
+        jitter=jitter,
+    )
+
+
+class ExclusiveJob:
+    """
+    Задача планировщика, которая выполняется одним экземпляром приложения на весь кластер.
+
+    Планировщик запущен в каждом воркере, но перед выполнением задача захватывает
+    блокировку в Redis (`RedisLock`); остальные воркеры пропускают запуск.
+    После выполнения блокировка остаётся ещё на половину интервала, поэтому воркеры,
+    сработавшие чуть позже (jitter), не повторяют задачу.
+
+    Время последнего запуска, длительность и результат сохраняются в Redis
+    (общие для кластера) и доступны через `stats()`.
+
+    Attributes:
+        job_id (str): Идентификатор задачи
+        func (Callable[[], Awaitable[Any]]): Задача
+        interval (timedelta): Интервал запуска
+        runs (int): Запусков в этом воркере
+        skipped (int): Пропусков в этом воркере (задачу выполняет другой экземпляр)
+
+    Args:
+        job_id (str): Идентификатор задачи
+        func (Callable[[], Awaitable[Any]]): Задача
+        interval (timedelta): Интервал запуска
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: timedelta,
+    ) -> None:
+        self.job_id = job_id
+        self.func = func
+        self.interval = interval
+        self.runs = 0
+        self.skipped = 0
+        self._last_run: dict[str, Any] = {}
+
+    @property
+    def _lock_key(self) -> str:
+        return f"{settings.scheduler.key_prefix}:lock:{self.job_id}"
+
+    @property
+    def _stats_key(self) -> str:
+        return f"{settings.scheduler.key_prefix}:stats:{self.job_id}"
+
+    async def __call__(self) -> None:
+        if not settings.scheduler.distributed:
+            await self._run()
+            return
+
+        lock = RedisLock(
+            redis_helper.client,
+            self._lock_key,
+            ttl=settings.scheduler.lock_ttl,
+        )
+        try:
+            acquired = await lock.acquire()
+        except RedisError as exc:
+            # Без блокировки задача могла бы выполниться во всех воркерах сразу
+            log.warning("Job %r skipped: Redis is unavailable: %r", self.job_id, exc)
+            self.skipped += 1
+            return
+        if not acquired:
+            log.debug("Job %r is run by another instance", self.job_id)
+            self.skipped += 1
+            return
+
+        try:
+            await self._run()
+        finally:
+            await lock.release(hold_for=self.interval.total_seconds() / 2)
+
+    async def _run(self) -> None:
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        status = "ok"
+        result = None
+        try:
+            result = await self.func()
+        except Exception:
+            status = "error"
+            log.exception("Job %r failed", self.job_id)
+        self.runs += 1
+        self._last_run = {
+            "last_run_at": started_at.isoformat(),
+            "duration": round(time.perf_counter() - start, 6),
+            "status": status,
+            "instance": f"{socket.gethostname()}:{os.getpid()}",
+            # Отчёт задачи (например, сколько строк удалено и с какой скоростью)
+            "result": result,
+        }
+        if settings.scheduler.distributed:
+            try:
+                await redis_helper.client.hset(
+                    self._stats_key,
+                    mapping={**self._last_run, "result": orjson.dumps(result)},
+                )
+            except RedisError as exc:
+                log.warning("Job %r: stats not saved: %r", self.job_id, exc)
+
+    async def stats(self) -> dict[str, Any]:
+        """
+        Последний запуск задачи в кластере и счётчики этого воркера.
+
+        Returns:
+            dict[str, Any]: {"last_run_at", "duration", "status", "instance", "result", "runs", "skipped"}
+        """
+        last_run: dict[str, Any] = dict(self._last_run)
+        if settings.scheduler.distributed:
+            try:
+                raw = await redis_helper.client.hgetall(self._stats_key)
+            except RedisError as exc:
+                log.warning("Job %r: stats unavailable: %r", self.job_id, exc)
+            else:
+                if raw:
+                    last_run = {key.decode(): value.decode() for key, value in raw.items()}
+                    last_run["duration"] = float(last_run["duration"])
+                    last_run["result"] = orjson.loads(last_run.get("result") or "null")
+        return {
+            "interval": self.interval.total_seconds(),
+            "last_run_at": last_run.get("last_run_at"),
+            "duration": last_run.get("duration"),
+            "status": last_run.get("status"),
+            "instance": last_run.get("instance"),
+            "result": last_run.get("result"),
+            "runs": self.runs,
+            "skipped": self.skipped,
+        }
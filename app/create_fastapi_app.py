@@ -1,10 +1,8 @@
 import logging
 
 from contextlib import asynccontextmanager
-from redis.asyncio import Redis
-from starlette.responses import JSONResponse
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import (
@@ -13,22 +11,26 @@ from fastapi.openapi.docs import (
     get_swagger_ui_oauth2_redirect_html,
 )
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
 
 from sqladmin import Admin
-from slowapi.middleware import SlowAPIMiddleware
 
 from admin import register_admin_views
 from admin.admin_auth import AdminAuth
 
 from middleware.custom_rate_limit_middleware import CustomRateLimitMiddleware
+from middleware.read_your_writes_middleware import ReadYourWritesMiddleware
 from middleware.security_headers_middleware import SecurityHeadersMiddleware
 
 from api.webhooks import webhooks_router
-from core import db_helper, limiter
+from core import db_helper, redis_helper, limiter
 from core.config import settings, BASE_DIR
+from core.cache import ResponseCoder, TieredBackend, cache_invalidator
+from core.auth.password_helper import password_helper
+from core.auth.revocation import token_revocation
+from core.auth.token_cache import token_cache
 from core.auth.tasks import setup_auth_scheduler
 from exceptions.handlers import register_errors_handlers
+from services.mailing import mail_renderer, smtp_pool
 
 log = logging.getLogger(__name__)
 
@@ -43,25 +45,33 @@ async def lifespan(app: FastAPI):
     :yields: Ничего не возвращает, передаёт управление приложению.
     :side effects:
         - Инициализирует базу данных.
-        - Инициализирует кэш через Redis.
+        - Инициализирует кэш (память воркера + Redis) и подписку на инвалидации.
+        - Подписывается на инвалидации кэша токенов.
+        - Подписывается на отзыв подписанных токенов (стратегия `signed`).
+        - Компилирует шаблоны писем и открывает пул SMTP-соединений.
         - Создаёт суперпользователя, если его нет.
-        - Закрывает соединение с БД при завершении.
+        - Закрывает соединения с БД и Redis при завершении.
     """
     # startup (старт приложения)
     if settings.site.environment != "testing":
         if settings.cache.enabled:
-            redis = Redis(
-                host=settings.redis.host,
-                port=settings.redis.port,
-                db=settings.redis.db.cache,
-            )
             FastAPICache.init(
-                RedisBackend(redis),
+                TieredBackend(redis_helper.client, cache_invalidator),
                 prefix=settings.cache.prefix,
+                coder=ResponseCoder,
             )
+            cache_invalidator.start()  # Подписка на инвалидации локального кэша
             log.info("Кэширование ВКЛЮЧЕНО")
         else:
             log.info("Кэширование ОТКЛЮЧЕНО")
+        token_cache.invalidator.start()  # Подписка на инвалидации кэша токенов
+        if settings.access_token.strategy == "signed":
+            token_revocation.start()  # Список отозванных токенов в памяти воркера
+
+    # Шаблоны писем компилируются один раз, пул постоянных SMTP-соединений для отправки писем
+    mail_renderer.precompile()
+    if settings.site.environment != "testing":
+        await smtp_pool.open()
 
     # Инициализация планировщика задач Auth
     auth_scheduler = setup_auth_scheduler()
@@ -70,7 +80,14 @@ async def lifespan(app: FastAPI):
     yield
     # shutdown (завершение приложения)
     auth_scheduler.shutdown()
+    await cache_invalidator.stop()
+    await token_cache.invalidator.stop()
+    await token_revocation.stop()
+    await smtp_pool.close()  # Закрытие SMTP-соединений
+    mail_renderer.close()  # Остановка потоков рендеринга писем
+    password_helper.shutdown()  # Остановка пула хеширования паролей
     await db_helper.dispose()  # Закрытия базы данных
+    await redis_helper.dispose()  # Закрытие соединений с Redis
 
 
 def register_static_docs_routes(app: FastAPI):
@@ -125,31 +142,40 @@ def create_app(
     :side effects:
         - Добавляет middleware:
           - CORS
-          - Rate Limiting (SlowAPI + Custom)
+          - Rate Limiting (limits + Custom)
           - Security Headers
+          - Read-your-writes (если заданы реплики)
         - Добавление SQLAdmin
         - Монтирует статику (/static)
         - Регистрирует обработчики ошибок
         - Подключает вебхуки
     """
 
+    # Защита от bruteforce и DDoS: лимиты проверяются зависимостью приложения.
+    rate_limit_enabled = settings.rate_limit.enabled and settings.site.environment != "testing"
+
+    # Класс ответа по умолчанию не задаётся явно: только так FastAPI сериализует
+    # ответы с response_model сразу в JSON-байты (pydantic-core, `dump_json`),
+    # минуя промежуточный dict и `json.dumps`.
     app = FastAPI(
-        default_response_class=JSONResponse,
+        dependencies=[Depends(limiter.check)] if rate_limit_enabled else None,
         lifespan=lifespan_override or lifespan,
         docs_url=None if create_custom_static_urls else "/docs",
         redoc_url=None if create_custom_static_urls else "/redoc",
         webhooks=webhooks_router,
     )
 
-    # Защита от bruteforce и DDoS.
-    if settings.rate_limit.enabled and settings.site.environment != "testing":
-        app.state.limiter = limiter  # type: ignore
-        app.add_middleware(SlowAPIMiddleware)
+    # Ответ 429: JSON для API, страница `/limit-exceeded` для веб-страниц.
+    if rate_limit_enabled:
         app.add_middleware(CustomRateLimitMiddleware)
 
     # Установка безопасности HTTP-заголовков.
     app.add_middleware(SecurityHeadersMiddleware)
 
+    # Чтение из основной БД сразу после записи клиента (иначе — из реплик).
+    if settings.db.replicas:
+        app.add_middleware(ReadYourWritesMiddleware)
+
     # Добавления и настройка CORS.
     app.add_middleware(
         CORSMiddleware,
@@ -102,6 +102,8 @@ def register_errors_handlers(app: FastAPI) -> None:
                 content={"detail": exc.detail},
             )
 
+        if exc.status_code == 429:
+            return RedirectResponse(url="/limit-exceeded")
         if exc.status_code == 404:
             return RedirectResponse(url="/page-missing")
         if exc.status_code in (401, 403):
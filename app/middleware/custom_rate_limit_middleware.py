@@ -25,7 +25,7 @@ class CustomRateLimitMiddleware:
 
     Особенности:
     ------------
-    - Работает поверх стандартного механизма rate limiting (например, `slowapi` или `fastapi-limiter`).
+    - Работает поверх стандартного механизма rate limiting (например, `limiter.check`).
     - Не блокирует запрос, а **перехватывает ответ** с кодом 429.
     - Позволяет избежать вывода "голого" текста в браузере при превышении лимита.
 
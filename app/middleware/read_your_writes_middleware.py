@@ -0,0 +1,86 @@
+import math
+import time
+
+from http.cookies import SimpleCookie
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from core.db_helper import WriteMarker, write_marker
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware, привязывающий окно read-your-writes к клиенту, а не к воркеру.
+
+    Момент последней записи клиента хранится в короткоживущей cookie. На время запроса
+    он доступен через `write_marker`: `db_helper.get_read_session_factory()` читает
+    из основной БД, только если этот клиент записывал в неё в течение окна
+    `read_your_writes_seconds`. Запись других клиентов и других воркеров не отключает
+    реплики, а клиент видит свои изменения независимо от того, какой воркер
+    обработает следующий запрос.
+
+    Если во время запроса был `commit` с записью (до отправки заголовков ответа),
+    в ответ добавляется cookie с новым моментом записи и сроком жизни, равным окну.
+
+    Чистый ASGI-middleware: добавляется через `app.add_middleware(ReadYourWritesMiddleware)`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        window: float | None = None,
+        cookie_name: str = "last_write",
+    ) -> None:
+        """
+        Args:
+            app (ASGIApp): Следующее ASGI-приложение в цепочке
+            window (float | None): Окно read-your-writes (в секундах);
+                по умолчанию — `settings.db.read_your_writes_seconds`
+            cookie_name (str): Имя cookie с моментом последней записи
+        """
+        self.app = app
+        self.window = settings.db.read_your_writes_seconds if window is None else window
+        self.cookie_name = cookie_name
+
+    def _written_at(self, scope: Scope) -> float:
+        """Момент последней записи из cookie запроса (-inf, если cookie нет или она повреждена)."""
+        for name, value in scope["headers"]:
+            if name != b"cookie":
+                continue
+            morsel = SimpleCookie(value.decode("latin-1")).get(self.cookie_name)
+            if morsel is None:
+                continue
+            try:
+                written_at = float(morsel.value)
+            except ValueError:
+                return float("-inf")
+            # Значение из будущего не продлевает окно дольше срока жизни cookie
+            return min(written_at, time.time())
+        return float("-inf")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        initial = self._written_at(scope)
+        marker = WriteMarker(initial)
+
+        async def send_with_write_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker.written_at > initial:
+                cookie = (
+                    f"{self.cookie_name}={marker.written_at:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]
+            await send(message)
+
+        token = write_marker.set(marker)
+        try:
+            await self.app(scope, receive, send_with_write_cookie)
+        finally:
+            write_marker.reset(token)
@@ -1,11 +1,19 @@
-from fastapi import Request
-from starlette.datastructures import MutableHeaders
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.config import settings
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Сообщения ASGI, в которых отправляются заголовки ответа
+_HEADERS_MESSAGE_TYPES = frozenset(
+    (
+        "http.response.start",
+        "websocket.accept",
+        "websocket.http.response.start",
+    )
+)
+
+
+class SecurityHeadersMiddleware:
     """
     Middleware для установки безопасности HTTP-заголовков.
 
@@ -45,13 +53,26 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     -------
     Если приложение запущено на `localhost`, HSTS не будет добавлен. На сервере — будет HSTS.
 
+    Реализация:
+    -----------
+    Чистый ASGI-middleware (без `BaseHTTPMiddleware`): не оборачивает тело ответа и не создаёт
+    дополнительных задач. Набор заголовков кодируется один раз при старте и дописывается
+    в сообщение `http.response.start` (а для WebSocket — в `websocket.accept`).
+    Заголовки, уже установленные обработчиком, не перезаписываются.
+    Потоковые ответы (`StreamingResponse`) проходят без буферизации.
+
     Использование:
     --------------
     Добавляется в приложение через `app.add_middleware(SecurityHeadersMiddleware)`
     """
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp, hsts: bool | None = None) -> None:
+        """
+        Args:
+            app (ASGIApp): Следующее ASGI-приложение в цепочке
+            hsts (bool | None): Добавлять ли HSTS; по умолчанию — если `settings.run.host` не локальный
+        """
+        self.app = app
 
         headers = {
             "X-Content-Type-Options": "nosniff",
@@ -62,14 +83,33 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         }
 
         # Добавляем HSTS только в продакшене (HTTPS)
-        if (
-            not settings.run.host == "127.0.0.1"
-            and not settings.run.host == "localhost"
-        ):
+        if hsts is None:
+            hsts = settings.run.host not in ("127.0.0.1", "localhost")
+        if hsts:
             headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
 
-        response_headers = MutableHeaders(headers=response.headers)
-        for key, value in headers.items():
-            if key not in response_headers:
-                response_headers[key] = value
-        return response
+        self.raw_headers: list[tuple[bytes, bytes]] = [
+            (key.lower().encode("latin-1"), value.encode("latin-1"))
+            for key, value in headers.items()
+        ]
+        self.header_names = frozenset(name for name, _ in self.raw_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] in _HEADERS_MESSAGE_TYPES:
+                headers = list(message.get("headers", ()))
+                present = {name.lower() for name, _ in headers} & self.header_names
+                if present:
+                    headers.extend(
+                        header for header in self.raw_headers if header[0] not in present
+                    )
+                else:
+                    headers.extend(self.raw_headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
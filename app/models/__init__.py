@@ -1,9 +1,11 @@
 __all__ = (
     "Base",
     "AccessToken",
+    "OutboxEmail",
     "User",
 )
 
 from .base import Base
 from .access_token import AccessToken
+from .outbox_email import OutboxEmail
 from .user import User
@@ -21,6 +21,8 @@ class AccessToken(Base, SQLAlchemyBaseAccessTokenTable[UserIdType]):
         Integer,
         ForeignKey("users.id", ondelete="cascade"),
         nullable=False,
+        # Без индекса ON DELETE CASCADE при удалении пользователя сканирует всю таблицу
+        index=True,
     )
 
     user: Mapped["User"] = relationship(back_populates="access_tokens")
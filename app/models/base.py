@@ -13,6 +13,10 @@ class Base(DeclarativeBase):
     # Для имен миграций
     metadata = MetaData(naming_convention=settings.db.naming_convention)
 
+    # Серверные значения по умолчанию загружаются при flush (INSERT/UPDATE ... RETURNING),
+    # а не отдельным SELECT при обращении к атрибуту
+    __mapper_args__ = {"eager_defaults": True}
+
     @declared_attr.directive
     def __tablename__(cls) -> str:
         """Конвертация имени таблицы"""
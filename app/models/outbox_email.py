@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .mixins import IntIdPkMixin, CreatedAtMixin
+
+
+class OutboxEmail(IntIdPkMixin, CreatedAtMixin, Base):
+    """
+    Очередь исходящих писем (outbox).
+
+    Веб-воркеры только записывают задание (тип письма и параметры), а рендеринг шаблонов
+    и отправку по SMTP выполняет отдельный процесс `run_mail_worker.py`.
+    Задания переживают перезапуск приложения.
+
+    Статусы:
+        - `pending` — ожидает отправки (в том числе повторной) после `next_attempt_at`
+        - `processing` — взято воркером; если воркер упал, задание снова станет доступно
+          после `next_attempt_at` (окончания аренды)
+        - `sent` — отправлено
+        - `dead` — исчерпаны попытки или письмо невозможно сформировать
+
+    У `sent` и `dead` заданий в `payload` остаётся только id пользователя (ссылки с токенами
+    удаляются), а сами задания удаляются задачей `cleanup_outbox_emails`.
+    """
+
+    kind: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="Тип письма (verification, reset_password, email_confirmed)",
+    )
+    payload: Mapped[dict[str, Any]] = mapped_column(
+        JSON,
+        nullable=False,
+        comment="Параметры письма (id пользователя, ссылки)",
+    )
+    status: Mapped[str] = mapped_column(
+        String(16),
+        default="pending",
+        server_default="pending",
+        nullable=False,
+        comment="Статус задания",
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Количество попыток отправки",
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+        comment="Не раньше этого времени задание может быть взято в работу",
+    )
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Последняя ошибка отправки",
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Дата отправки",
+    )
+
+    __table_args__ = (
+        # Выборка заданий воркером: WHERE status IN (...) AND next_attempt_at <= now()
+        Index(
+            "ix_outbox_emails_status_next_attempt_at",
+            "status",
+            "next_attempt_at",
+        ),
+    )
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
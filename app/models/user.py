@@ -1,9 +1,9 @@
-from typing import TYPE_CHECKING
+from typing import AsyncIterator, TYPE_CHECKING
 from fastapi_users_db_sqlalchemy import (
     SQLAlchemyBaseUserTable,
     SQLAlchemyUserDatabase as SQLAlchemyUserDatabaseGeneric,
 )
-from sqlalchemy import String, select
+from sqlalchemy import Index, Integer, String, func, select
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.auth.user_id_type import UserIdType
@@ -20,15 +20,60 @@ class SQLAlchemyUserDatabase(SQLAlchemyUserDatabaseGeneric):
     Добавление новых методов в SQLAlchemyUserDatabase, для работы с пользователями.
 
     Methods:
-        get_users() Возвращает список пользователей.
+        get_users(after_id, limit) Возвращает страницу пользователей (keyset-пагинация по id).
+        stream_users(after_id, batch_size) Потоково отдаёт пользователей, не загружая всю таблицу.
     """
 
-    async def get_users(self) -> list["User"]:
-        """Возвращает список пользователей."""
-        statement = select(User).order_by(User.id)
+    async def get_users(
+        self,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> list["User"]:
+        """
+        Возвращает список пользователей, отсортированный по id.
+
+        Args:
+            after_id (int | None): Вернуть пользователей с id больше указанного (keyset-курсор)
+            limit (int | None): Максимальное количество пользователей
+
+        Returns:
+            list[User]: Пользователи
+        """
+        statement = select(User).order_by(User.id).limit(limit)
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
         results = await self.session.scalars(statement)
         return list(results.all())
 
+    async def stream_users(
+        self,
+        after_id: int | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator["User"]:
+        """
+        Потоково отдаёт пользователей, отсортированных по id, через серверный курсор.
+
+        Строки читаются из БД пачками по `batch_size`, поэтому потребление памяти
+        не зависит от размера таблицы.
+
+        Args:
+            after_id (int | None): Начать с пользователей с id больше указанного
+            batch_size (int): Размер пачки строк, читаемых из БД за раз
+
+        Yields:
+            User: Пользователь
+        """
+        statement = (
+            select(User)
+            .order_by(User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
+        results = await self.session.stream_scalars(statement)
+        async for user in results:
+            yield user
+
 
 class User(
     Base,
@@ -38,11 +83,23 @@ class User(
 ):
     """Таблица пользователей"""
 
+    __table_args__ = (
+        # Очистка неподтверждённых пользователей (core/auth/tasks.py:cleanup_unverified_users)
+        Index("ix_users_is_verified_created_at", "is_verified", "created_at"),
+    )
+
     first_name: Mapped[str] = mapped_column(
         String(64),
         comment="Имя пользователя",
     )
 
+    token_generation: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        comment="Поколение подписанных токенов: увеличение отзывает все выданные ранее",
+    )
+
     access_tokens: Mapped[list["AccessToken"]] = relationship(back_populates="user")
 
     @classmethod
@@ -52,3 +109,8 @@ class User(
 
     def __str__(self):
         return self.email
+
+
+# Поиск по email без учёта регистра (`get_by_email` fastapi-users: lower(email) = lower(:email)):
+# вход, регистрация, восстановление пароля и вход в админку
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
@@ -1,3 +1,9 @@
-__all__ = ("CrudManager",)
+__all__ = (
+    "CrudManager",
+    "QuerySpec",
+    "unit_of_work",
+)
 
 from .crud_manager import CrudManager
+from .query_spec import QuerySpec
+from .unit_of_work import unit_of_work
@@ -1,16 +1,50 @@
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from datetime import date, datetime
+
+from pydantic import BaseModel
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import CompileError
+from sqlalchemy.orm import InstrumentedAttribute, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from typing import (
+    ClassVar,
     Type,
     TypeVar,
     Sequence,
     Generic,
     Any,
+    Iterable,
+    Mapping,
+    Optional,
 )
 
 from models.base import Base
+from utils.cursor import decode_cursor, encode_cursor
+from .query_spec import QuerySpec
+
+
+# Максимум параметров в одном запросе (PostgreSQL: 32767, SQLite >= 3.32: 32766)
+MAX_BIND_PARAMS = 32766
+
+# Диалекты с поддержкой INSERT ... ON CONFLICT
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
 
 
 T = TypeVar("T", bound=Base)
@@ -23,6 +57,9 @@ class CrudManager(Generic[T]):
     Предоставляет базовые операции: создание, чтение, обновление, удаление.
     Поддерживает работу с любыми моделями, унаследованными от `Base`.
 
+    Для обработчиков только для чтения передавайте сессию из `get_read_db` —
+    методы `get_*` будут читать из реплики, а `create`/`update`/`delete` выбросят ошибку.
+
     Attributes:
         session (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД
         model_db (Type[T]): Модель, с которой будет работать менеджер
@@ -35,13 +72,37 @@ class CrudManager(Generic[T]):
         create(data): - Создаёт новую запись в БД.
         get_by_id(instance_id): - Получает запись по id.
         get_by_id_with_relations(instance_id, *relations): - Получает запись по id с подгруженными связями.
-        get_all_by_field(field, value): - Получает все записи по полю.
-        get_all_by_fields(**filters): - Получает все записи по нескольким полям.
-        get_all(): - Получает все записи модели.
+        get_all_by_field(field, value, spec): - Получает все записи по полю.
+        get_by_fields(spec, **filters): - Получает все записи по нескольким полям.
+        get_all(spec): - Получает все записи модели.
+        get_page(spec, *where, **filters): - Получает страницу записей (keyset-пагинация).
+        count(*where, estimate, **filters): - Считает записи (точно или по оценке планировщика).
         update(instance, data): - Обновляет существующую запись.
         delete(instance): - Удаляет запись из БД.
+        create_many(items, chunk_size): - Вставляет записи пачками (INSERT ... RETURNING).
+        upsert(items, conflict_fields, update_fields, chunk_size): - Вставляет или обновляет записи (ON CONFLICT).
+        update_many(data, *where, **filters): - Обновляет записи по условию.
+        delete_many(*where, **filters): - Удаляет записи по условию.
+
+    Массовые методы (`create_many`, `upsert`, `update_many`, `delete_many`) выполняют
+    запросы без загрузки экземпляров модели и делают один `commit` на весь вызов.
+
+    Внутри `unit_of_work(session)` (или с сессией из `get_uow_db`) методы записи
+    не фиксируют транзакцию, а только выполняют `flush`: обработчик, изменяющий
+    несколько записей, делает один `commit` в конце запроса.
+
+    Методы выборки принимают `QuerySpec`: ограничение и смещение, курсор, сортировку
+    и проекцию (только нужные поля, `Row` или dataclass вместо экземпляров модели).
+
+    Запросы `get_by_id`, `get_all_by_field`, `get_by_fields` и `get_all` без `QuerySpec`
+    строятся один раз на модель и набор полей (с параметрами вместо значений)
+    и берутся из кэша: поля проверяются при построении, а SQLAlchemy не вычисляет
+    ключ кэша компиляции заново.
     """
 
+    # (модель, ((поле, значение is None), ...)) -> готовый запрос с параметрами
+    _statement_cache: ClassVar[dict[tuple[Any, ...], Select]] = {}
+
     def __init__(
         self,
         session: AsyncSession,
@@ -50,20 +111,53 @@ class CrudManager(Generic[T]):
         self.session = session
         self.model_db = model_db
 
+    @property
+    def readonly(self) -> bool:
+        """True, если менеджер работает через сессию реплики (только для чтения)."""
+        return bool(self.session.info.get("readonly"))
+
+    @property
+    def in_unit_of_work(self) -> bool:
+        """True, если транзакцию фиксирует `unit_of_work`, а не методы менеджера."""
+        return bool(self.session.info.get("unit_of_work"))
+
+    async def _commit(self) -> None:
+        """Фиксирует изменения (в режиме единицы работы — только `flush`)."""
+        # Массовые запросы не проходят через flush — отмечаем запись для read-your-writes
+        self.session.info["has_writes"] = True
+        if self.in_unit_of_work:
+            await self.session.flush()
+        else:
+            await self.session.commit()
+
+    def _ensure_writable(self) -> None:
+        """
+        Raises:
+            RuntimeError: Если менеджер работает через сессию реплики
+        """
+        if self.readonly:
+            raise RuntimeError(
+                f"{type(self).__name__}({self.model_db.__name__}) работает через сессию "
+                f"реплики, запись невозможна — используйте сессию из get_db"
+            )
+
     async def create(self, data) -> T:
         """
         Создаёт новую запись в базе данных.
 
+        Значения, генерируемые БД (`id`, серверные значения по умолчанию), возвращаются
+        тем же `INSERT ... RETURNING` при `flush` — без отдельного `SELECT`.
+
         Args:
             data: Pydantic-схема с данными для создания
 
         Returns:
             T: Созданный экземпляр модели с заполненным `id` и `created_at`
         """
+        self._ensure_writable()
         instance = self.model_db(**data.model_dump())
         self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
+        await self._commit()
         return instance
 
     async def get_by_id(self, instance_id: int) -> T | None:
@@ -76,8 +170,8 @@ class CrudManager(Generic[T]):
         Returns:
             T | None: Экземпляр модели или None, если не найден
         """
-        stmt = select(self.model_db).where(self.model_db.id == instance_id)  # type: ignore
-        result = await self.session.execute(stmt)
+        stmt, params = self._cached_select({"id": instance_id})
+        result = await self.session.execute(stmt, params)
         return result.scalars().first()
 
     async def get_all_by_field_with_relations(
@@ -147,9 +241,14 @@ class CrudManager(Generic[T]):
             stmt = stmt.options(current_load)
 
         result = await self.session.execute(stmt)
-        return result.scalars().unique().all()
+        return result.scalars().all()
 
-    async def get_all_by_field(self, field: str, value: Any) -> Sequence[T]:
+    async def get_all_by_field(
+        self,
+        field: str,
+        value: Any,
+        spec: Optional[QuerySpec] = None,
+    ) -> Sequence[Any]:
         """
         Получает все записи по любому полю.
 
@@ -160,21 +259,21 @@ class CrudManager(Generic[T]):
         Args:
             field (str): Название поля модели (например: "email", "status", "user_id")
             value (Any): Значение для поиска (например: "Tom", "tom@email.com", 123)
+            spec (QuerySpec | None): Ограничение, сортировка и проекция выборки
 
         Raises:
             ValueError: Если указанное поле отсутствует в модели
 
         Returns:
-            Sequence[T]: Список экземпляров модели (может быть пустым)
+            Sequence[Any]: Экземпляры модели или строки проекции (может быть пустым)
         """
-        if not hasattr(self.model_db, field):
-            raise ValueError(f"Модель {self.model_db.__name__} не имеет поля '{field}'")
+        return await self._fetch(spec, {field: value})
 
-        stmt = select(self.model_db).where(getattr(self.model_db, field) == value)  # type: ignore
-        result = await self.session.execute(stmt)
-        return result.scalars().unique().all()
-
-    async def get_by_fields(self, **filters) -> Sequence[T]:
+    async def get_by_fields(
+        self,
+        spec: Optional[QuerySpec] = None,
+        **filters,
+    ) -> Sequence[Any]:
         """
         Получает все записи, соответствующие нескольким полям и значениям.
 
@@ -183,34 +282,129 @@ class CrudManager(Generic[T]):
         Используется для сложных выборок: например, заказы с определённым статусом и пользователем.
 
         Args:
+            spec (QuerySpec | None): Ограничение, сортировка и проекция выборки
             **filters: Пары "поле=значение" для фильтрации (например: status="paid", user_id=5)
 
         Raises:
             ValueError: Если одно из указанных полей отсутствует в модели
 
         Returns:
-            Sequence[T]: Список экземпляров модели, соответствующих всем условиям
+            Sequence[Any]: Экземпляры модели или строки проекции, соответствующие всем условиям
         """
-        stmt = select(self.model_db)
-        for field, value in filters.items():
-            if not hasattr(self.model_db, field):
-                raise ValueError(
-                    f"Модель {self.model_db.__name__} не имеет поля '{field}'"
-                )
-            stmt = stmt.where(getattr(self.model_db, field) == value)  # type: ignore
-        result = await self.session.execute(stmt)
-        return result.scalars().unique().all()
+        return await self._fetch(spec, filters)
 
-    async def get_all(self) -> Sequence[T]:
+    async def get_all(self, spec: Optional[QuerySpec] = None) -> Sequence[Any]:
         """
         Получает все записи указанной модели.
 
+        Без `spec` загружает всю таблицу — для больших таблиц передавайте `QuerySpec(limit=...)`
+        или используйте `get_page`.
+
+        Args:
+            spec (QuerySpec | None): Ограничение, сортировка и проекция выборки
+
         Returns:
-            Sequence[T]: Список всех экземпляров модели (может быть пустым)
+            Sequence[Any]: Экземпляры модели или строки проекции (может быть пустым)
         """
-        stmt = select(self.model_db)
-        result = await self.session.execute(stmt)
-        return result.scalars().unique().all()
+        return await self._fetch(spec, {})
+
+    async def get_page(
+        self,
+        spec: QuerySpec,
+        *where: ColumnElement[bool],
+        **filters: Any,
+    ) -> tuple[Sequence[Any], Optional[str]]:
+        """
+        Получает страницу записей с keyset-пагинацией.
+
+        Следующая страница запрашивается с `QuerySpec(after=next_cursor, ...)` и той же
+        сортировкой: условие `(поля сортировки) > (значения последней записи)` использует
+        индекс и не зависит от номера страницы, в отличие от `offset`.
+
+        Args:
+            spec (QuerySpec): Параметры выборки (`limit` обязателен)
+            *where (ColumnElement[bool]): Условия SQLAlchemy
+            **filters: Пары "поле=значение"
+
+        Returns:
+            tuple[Sequence[Any], str | None]: Записи страницы и курсор следующей (None — страница последняя)
+
+        Raises:
+            ValueError: Если не задан `limit`, курсор повреждён или проекция не включает поля сортировки
+        """
+        if spec.limit is None:
+            raise ValueError("get_page требует QuerySpec(limit=...)")
+
+        order = self._order(spec)
+        if spec.columns:
+            missing = [attr.key for attr, _ in order if attr.key not in spec.columns]
+            if missing:
+                raise ValueError(f"Проекция не включает поля сортировки: {missing}")
+
+        stmt = self._build_select(spec, [*where, *self._filter_clauses(filters)])
+        stmt = stmt.limit(spec.limit + 1)  # +1 строка, чтобы узнать, есть ли следующая страница
+        items = await self._execute(stmt, spec)
+
+        next_cursor = None
+        if len(items) > spec.limit:
+            items = items[: spec.limit]
+            last = items[-1]
+            next_cursor = encode_cursor(
+                {attr.key: getattr(last, attr.key) for attr, _ in order}
+            )
+        return items, next_cursor
+
+    async def count(
+        self,
+        *where: ColumnElement[bool],
+        estimate: bool = False,
+        **filters: Any,
+    ) -> int:
+        """
+        Считает записи, подходящие под условия.
+
+        Точный `COUNT(*)` читает все подходящие строки. С `estimate=True` в PostgreSQL
+        используется оценка планировщика: `pg_class.reltuples` для всей таблицы
+        или `EXPLAIN` для запроса с условиями. Оценка зависит от свежести статистики
+        (`ANALYZE`); в других СУБД всегда выполняется точный подсчёт.
+
+        Args:
+            *where (ColumnElement[bool]): Условия SQLAlchemy
+            estimate (bool): Вернуть оценку вместо точного значения
+            **filters: Пары "поле=значение"
+
+        Returns:
+            int: Количество записей (или его оценка)
+        """
+        clauses = [*where, *self._filter_clauses(filters)]
+        if estimate and self.session.get_bind().dialect.name == "postgresql":
+            estimated = await self._estimate_count(clauses)
+            if estimated is not None:
+                return estimated
+        stmt = select(func.count()).select_from(self.model_db).where(*clauses)
+        return await self.session.scalar(stmt)
+
+    async def _estimate_count(self, clauses: list[ColumnElement[bool]]) -> Optional[int]:
+        """Оценка количества строк планировщиком PostgreSQL (None — статистики нет)."""
+        if not clauses:
+            reltuples = await self.session.scalar(
+                text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": self.model_db.__table__.fullname},
+            )
+            # -1 (PostgreSQL 14+) или 0 — таблица ещё не анализировалась
+            return int(reltuples) if reltuples and reltuples > 0 else None
+
+        stmt = select(*self.model_db.__mapper__.primary_key).where(*clauses)
+        try:
+            compiled = stmt.compile(
+                dialect=self.session.get_bind().dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+        except (CompileError, NotImplementedError):
+            # Значение условия нельзя подставить в EXPLAIN литералом
+            return None
+        plan = await self.session.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     async def update(self, instance: T, data) -> T:
         """
@@ -225,9 +419,10 @@ class CrudManager(Generic[T]):
         Returns:
             T: Обновлённый экземпляр модели
         """
+        self._ensure_writable()
         for name, value in data.model_dump(exclude_unset=True).items():
             setattr(instance, name, value)
-        await self.session.commit()
+        await self._commit()
         return instance
 
     async def delete(self, instance: T) -> bool:
@@ -240,6 +435,346 @@ class CrudManager(Generic[T]):
         Returns:
             bool: Всегда `True`, если удаление прошло успешно
         """
+        self._ensure_writable()
         await self.session.delete(instance)
-        await self.session.commit()
+        await self._commit()
         return True
+
+    def _attribute(self, field: str) -> InstrumentedAttribute:
+        """
+        Raises:
+            ValueError: Если указанное поле отсутствует в модели
+        """
+        if not hasattr(self.model_db, field):
+            raise ValueError(f"Модель {self.model_db.__name__} не имеет поля '{field}'")
+        return getattr(self.model_db, field)
+
+    def _order(self, spec: QuerySpec) -> list[tuple[InstrumentedAttribute, bool]]:
+        """Поля сортировки (поле, по убыванию); при пагинации дополняется первичным ключом."""
+        order = [
+            (self._attribute(field.lstrip("-")), field.startswith("-"))
+            for field in spec.order_by
+        ]
+        if spec.paginated:
+            keys = {attr.key for attr, _ in order}
+            order.extend(
+                (self._attribute(column.key), False)
+                for column in self.model_db.__mapper__.primary_key
+                if column.key not in keys
+            )
+        return order
+
+    def _keyset_clause(
+        self,
+        order: list[tuple[InstrumentedAttribute, bool]],
+        cursor: str,
+    ) -> ColumnElement[bool]:
+        """
+        Условие "после позиции курсора" для сортировки `order`:
+        `a > :a OR (a = :a AND b > :b) OR ...` (с `<` для полей по убыванию).
+
+        Raises:
+            ValueError: Если курсор повреждён или создан для другой сортировки
+        """
+        position = decode_cursor(cursor)
+        try:
+            values = [self._cursor_value(attr, position[attr.key]) for attr, _ in order]
+        except KeyError as exc:
+            raise ValueError(f"Некорректный курсор: {cursor!r}") from exc
+
+        conditions = []
+        for i, (attr, descending) in enumerate(order):
+            equal = [order[j][0] == values[j] for j in range(i)]
+            after = attr < values[i] if descending else attr > values[i]
+            conditions.append(and_(*equal, after))
+        return or_(*conditions)
+
+    @staticmethod
+    def _cursor_value(attr: InstrumentedAttribute, value: Any) -> Any:
+        """Восстанавливает дату/время из курсора (в JSON они хранятся строкой ISO 8601)."""
+        if isinstance(value, str):
+            try:
+                python_type = attr.type.python_type
+            except NotImplementedError:
+                return value
+            if issubclass(python_type, datetime):
+                return datetime.fromisoformat(value)
+            if issubclass(python_type, date):
+                return date.fromisoformat(value)
+        return value
+
+    def _build_select(
+        self,
+        spec: QuerySpec,
+        clauses: list[ColumnElement[bool]],
+    ) -> Select:
+        """Запрос выборки по `QuerySpec` (без `limit`)."""
+        if spec.columns:
+            stmt = select(*(self._attribute(field) for field in spec.columns))
+        else:
+            stmt = select(self.model_db)
+        stmt = stmt.where(*clauses)
+
+        order = self._order(spec)
+        if spec.after is not None:
+            stmt = stmt.where(self._keyset_clause(order, spec.after))
+        if order:
+            stmt = stmt.order_by(
+                *(attr.desc() if descending else attr.asc() for attr, descending in order)
+            )
+        if spec.offset:
+            stmt = stmt.offset(spec.offset)
+        return stmt
+
+    async def _execute(self, stmt: Select, spec: QuerySpec) -> list[Any]:
+        """Выполняет выборку: экземпляры модели или строки проекции (`Row` / `spec.into`)."""
+        result = await self.session.execute(stmt)
+        if not spec.columns:
+            return list(result.scalars().all())
+        rows = result.all()
+        if spec.into is None:
+            return list(rows)
+        return [spec.into(**row._mapping) for row in rows]
+
+    async def _fetch(
+        self,
+        spec: Optional[QuerySpec],
+        filters: Mapping[str, Any],
+    ) -> list[Any]:
+        """Выборка по условиям и `QuerySpec` (None — все подходящие записи)."""
+        if spec is None:
+            stmt, params = self._cached_select(filters)
+            result = await self.session.execute(stmt, params)
+            return list(result.scalars().all())
+
+        stmt = self._build_select(spec, self._filter_clauses(filters))
+        if spec.limit is not None:
+            stmt = stmt.limit(spec.limit)
+        return await self._execute(stmt, spec)
+
+    def _cached_select(
+        self,
+        filters: Mapping[str, Any],
+    ) -> tuple[Select, dict[str, Any]]:
+        """
+        Запрос "поле == :поле AND ..." из кэша (строится при первом обращении)
+        и значения его параметров. Для None используется `IS NULL` без параметра.
+
+        Raises:
+            ValueError: Если одно из указанных полей отсутствует в модели
+        """
+        shape = tuple((field, value is None) for field, value in filters.items())
+        key = (self.model_db, shape)
+        stmt = self._statement_cache.get(key)
+        if stmt is None:
+            stmt = select(self.model_db).where(
+                *(
+                    self._attribute(field).is_(None)
+                    if is_null
+                    else self._attribute(field) == bindparam(field)
+                    for field, is_null in shape
+                )
+            )
+            self._statement_cache[key] = stmt
+        params = {field: value for field, value in filters.items() if value is not None}
+        return stmt, params
+
+    def _filter_clauses(self, filters: Mapping[str, Any]) -> list[ColumnElement[bool]]:
+        """
+        Условия "поле == значение" для фильтров.
+
+        Raises:
+            ValueError: Если одно из указанных полей отсутствует в модели
+        """
+        return [self._attribute(field) == value for field, value in filters.items()]
+
+    @staticmethod
+    def _values(data: BaseModel | Mapping[str, Any], **dump_kwargs) -> dict[str, Any]:
+        """Значения полей из Pydantic-схемы или словаря."""
+        if isinstance(data, BaseModel):
+            return data.model_dump(**dump_kwargs)
+        return dict(data)
+
+    def _chunks(
+        self,
+        rows: list[dict[str, Any]],
+        chunk_size: int,
+    ) -> Iterable[list[dict[str, Any]]]:
+        """Делит строки на пачки, не превышающие лимит параметров запроса."""
+        columns = max((len(row) for row in rows), default=1) or 1
+        size = max(1, min(chunk_size, MAX_BIND_PARAMS // columns))
+        for start in range(0, len(rows), size):
+            yield rows[start : start + size]
+
+    def _returning(self, returning: Optional[Sequence[str]]) -> list[Any]:
+        """Столбцы для RETURNING (по умолчанию — первичный ключ)."""
+        if returning is None:
+            return list(self.model_db.__mapper__.primary_key)
+        return [getattr(self.model_db, field) for field in returning]
+
+    async def create_many(
+        self,
+        items: Iterable[BaseModel | Mapping[str, Any]],
+        chunk_size: int = 1000,
+        returning: Optional[Sequence[str]] = None,
+    ) -> list[Row]:
+        """
+        Вставляет записи пачками: один `INSERT ... VALUES (...), (...) RETURNING` на пачку.
+
+        Все пачки выполняются в одной транзакции. Экземпляры модели не создаются.
+        Порядок возвращённых строк совпадает с порядком `items`
+        (`RETURNING` с `sort_by_parameter_order=True`).
+
+        Args:
+            items: Pydantic-схемы или словари с данными (с одинаковым набором полей)
+            chunk_size (int): Количество строк в одном запросе
+            returning (Sequence[str] | None): Поля, возвращаемые для вставленных строк
+                (по умолчанию — первичный ключ)
+
+        Returns:
+            list[Row]: Значения `returning` для вставленных строк, в порядке `items`
+        """
+        self._ensure_writable()
+        rows = [self._values(item) for item in items]
+        if not rows:
+            return []
+
+        columns = self._returning(returning)
+        inserted: list[Row] = []
+        stmt = insert(self.model_db).returning(*columns, sort_by_parameter_order=True)
+        for chunk in self._chunks(rows, chunk_size):
+            # executemany с RETURNING: SQLAlchemy собирает пачку в один INSERT (insertmanyvalues)
+            result = await self.session.execute(stmt, chunk)
+            inserted.extend(result.all())
+        await self._commit()
+        return inserted
+
+    async def upsert(
+        self,
+        items: Iterable[BaseModel | Mapping[str, Any]],
+        conflict_fields: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+        returning: Optional[Sequence[str]] = None,
+    ) -> list[Row]:
+        """
+        Вставляет записи, а при конфликте по `conflict_fields` обновляет существующие
+        (`INSERT ... ON CONFLICT DO UPDATE`, PostgreSQL и SQLite).
+
+        Args:
+            items: Pydantic-схемы или словари с данными (с одинаковым набором полей)
+            conflict_fields (Sequence[str]): Поля уникального индекса или ограничения
+            update_fields (Sequence[str] | None): Обновляемые при конфликте поля
+                (по умолчанию — все переданные, кроме `conflict_fields`; пустой список — `DO NOTHING`)
+            chunk_size (int): Количество строк в одном запросе
+            returning (Sequence[str] | None): Поля, возвращаемые для вставленных и обновлённых строк
+                (по умолчанию — первичный ключ)
+
+        Returns:
+            list[Row]: Значения `returning` (строки, пропущенные при `DO NOTHING`, не возвращаются)
+
+        Raises:
+            NotImplementedError: Если диалект БД не поддерживает ON CONFLICT
+        """
+        self._ensure_writable()
+        dialect = self.session.get_bind().dialect.name
+        if dialect not in UPSERT_INSERTS:
+            raise NotImplementedError(f"upsert не поддерживается для диалекта {dialect!r}")
+
+        rows = [self._values(item) for item in items]
+        if not rows:
+            return []
+        if update_fields is None:
+            update_fields = [field for field in rows[0] if field not in conflict_fields]
+
+        columns = self._returning(returning)
+        upserted: list[Row] = []
+        for chunk in self._chunks(rows, chunk_size):
+            stmt = UPSERT_INSERTS[dialect](self.model_db).values(chunk)
+            if update_fields:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(conflict_fields),
+                    set_={field: stmt.excluded[field] for field in update_fields},
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_fields))
+            result = await self.session.execute(stmt.returning(*columns))
+            upserted.extend(result.all())
+        await self._commit()
+        return upserted
+
+    async def update_many(
+        self,
+        data: BaseModel | Mapping[str, Any],
+        *where: ColumnElement[bool],
+        **filters: Any,
+    ) -> int:
+        """
+        Обновляет все записи, подходящие под условия, одним `UPDATE ... WHERE`.
+
+        Пример:
+            await CrudManager(session, User).update_many({"is_active": False}, is_verified=False)
+
+        Args:
+            data: Pydantic-схема (учитываются только переданные поля) или словарь с новыми значениями
+            *where (ColumnElement[bool]): Условия SQLAlchemy
+            **filters: Пары "поле=значение"
+
+        Returns:
+            int: Количество обновлённых записей
+
+        Raises:
+            ValueError: Если не задано ни одного условия или поле отсутствует в модели
+        """
+        self._ensure_writable()
+        clauses = [*where, *self._filter_clauses(filters)]
+        if not clauses:
+            raise ValueError("update_many без условий обновил бы всю таблицу")
+        values = self._values(data, exclude_unset=True)
+        if not values:
+            return 0
+
+        stmt = (
+            update(self.model_db)
+            .where(*clauses)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        await self._commit()
+        return result.rowcount
+
+    async def delete_many(
+        self,
+        *where: ColumnElement[bool],
+        **filters: Any,
+    ) -> int:
+        """
+        Удаляет все записи, подходящие под условия, одним `DELETE ... WHERE`.
+
+        Для удаления большого количества строк в фоновых задачах используйте
+        `ChunkedDeleter`: он удаляет пачками в коротких транзакциях.
+
+        Args:
+            *where (ColumnElement[bool]): Условия SQLAlchemy
+            **filters: Пары "поле=значение"
+
+        Returns:
+            int: Количество удалённых записей
+
+        Raises:
+            ValueError: Если не задано ни одного условия или поле отсутствует в модели
+        """
+        self._ensure_writable()
+        clauses = [*where, *self._filter_clauses(filters)]
+        if not clauses:
+            raise ValueError("delete_many без условий удалил бы всю таблицу")
+
+        stmt = (
+            delete(self.model_db)
+            .where(*clauses)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        await self._commit()
+        return result.rowcount
@@ -0,0 +1,67 @@
+from typing import Any, Callable, Optional, Sequence
+
+
+class QuerySpec:
+    """
+    Параметры выборки для методов чтения `CrudManager`.
+
+    Пример:
+        spec = QuerySpec(
+            limit=50,
+            order_by=("-created_at",),
+            columns=("id", "email", "created_at"),
+            after=cursor,
+        )
+        items, next_cursor = await CrudManager(session, User).get_page(spec, is_active=True)
+
+    Attributes:
+        limit (int | None): Максимальное количество записей
+        offset (int): Пропустить записей (для больших смещений используйте `after`)
+        order_by (Sequence[str]): Поля сортировки; `-` перед именем — по убыванию.
+            При пагинации первичный ключ добавляется в конец для однозначного порядка
+        columns (Sequence[str]): Загружаемые поля (проекция); пусто — экземпляры модели целиком.
+            Для `get_page` должны включать поля сортировки
+        into (Callable[..., Any] | None): Во что превращать строку проекции
+            (например, dataclass); None — `Row`
+        after (str | None): Курсор keyset-пагинации (`next_cursor` предыдущей страницы)
+
+    Args:
+        limit (int | None): Максимальное количество записей
+        offset (int): Пропустить записей
+        order_by (Sequence[str]): Поля сортировки
+        columns (Sequence[str]): Загружаемые поля
+        into (Callable[..., Any] | None): Тип строки проекции
+        after (str | None): Курсор keyset-пагинации
+    """
+
+    __slots__ = ("limit", "offset", "order_by", "columns", "into", "after")
+
+    def __init__(
+        self,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order_by: Sequence[str] = (),
+        columns: Sequence[str] = (),
+        into: Optional[Callable[..., Any]] = None,
+        after: Optional[str] = None,
+    ) -> None:
+        self.limit = limit
+        self.offset = offset
+        self.order_by = tuple(order_by)
+        self.columns = tuple(columns)
+        self.into = into
+        self.after = after
+
+    @property
+    def paginated(self) -> bool:
+        """True, если выборка ограничена (нужен однозначный порядок)."""
+        return self.limit is not None or bool(self.offset) or self.after is not None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if getattr(self, name) not in (None, 0, ())
+        )
+        return f"QuerySpec({fields})"
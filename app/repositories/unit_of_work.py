@@ -0,0 +1,41 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Единица работы: все изменения через `CrudManager` внутри блока выполняются
+    в одной транзакции.
+
+    Методы записи `CrudManager` в этом режиме только отправляют изменения в БД
+    (`flush`), а `commit` выполняется один раз при выходе из блока. При исключении
+    транзакция откатывается. Вложенный блок с той же сессией не фиксирует
+    транзакцию — это делает внешний.
+
+    Пример:
+        async with unit_of_work(session):
+            order = await CrudManager(session, Order).create(order_in)
+            await CrudManager(session, Product).update(product, stock_in)
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Yields:
+        AsyncSession: Та же сессия
+    """
+    if session.info.get("unit_of_work"):
+        yield session
+        return
+
+    session.info["unit_of_work"] = True
+    try:
+        yield session
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        session.info.pop("unit_of_work", None)
@@ -0,0 +1,43 @@
+# Запуск воркера очереди исходящих писем (отдельный процесс)
+__all__ = ("main",)
+
+import asyncio
+import logging
+import signal
+
+from contextlib import suppress
+
+from core.config import settings
+from core.db_helper import db_helper
+from services.mailing import create_outbox_worker, mail_renderer, smtp_pool
+
+
+logging.basicConfig(
+    level=settings.logging.log_level_value,
+    format=settings.logging.log_format,
+)
+
+
+async def run_worker() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with suppress(NotImplementedError):  # Windows
+            loop.add_signal_handler(sig, stop.set)
+
+    mail_renderer.precompile()
+    await smtp_pool.open()
+    try:
+        await create_outbox_worker(db_helper.session_factory).run(stop)
+    finally:
+        await smtp_pool.close()
+        mail_renderer.close()
+        await db_helper.dispose()
+
+
+def main():
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 __all__ = (
     "BaseSchema",
+    "CursorPage",
     "UserCreate",
     "UserUpdate",
     "UserRead",
 )
 
 from .base_schema import BaseSchema
+from .pagination import CursorPage
 from .user import UserCreate, UserUpdate, UserRead
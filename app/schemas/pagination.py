@@ -0,0 +1,15 @@
+from typing import Generic, TypeVar
+from pydantic import BaseModel, Field
+
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Страница результатов keyset-пагинации"""
+
+    items: list[T] = Field(description="Элементы страницы")
+    next_cursor: str | None = Field(
+        default=None,
+        description="Курсор следующей страницы (None — страница последняя)",
+    )
@@ -1,11 +1,23 @@
 __all__ = (
+    "MailRenderer",
+    "OutboxWorker",
+    "PreparedEmail",
+    "SMTPPool",
+    "build_email_message",
+    "create_outbox_worker",
+    "enqueue_email",
+    "mail_renderer",
+    "smtp_pool",
     "send_email",
     "send_email_confirmed",
     "send_verification_email",
     "send_reset_password",
 )
 
-from .send_email import send_email
+from .send_email import build_email_message, send_email
 from .send_email_confirmed import send_email_confirmed
 from .send_verification_email import send_verification_email
 from .send_reset_password import send_reset_password
+from .renderer import MailRenderer, mail_renderer
+from .smtp_pool import PreparedEmail, SMTPPool, smtp_pool
+from .outbox import OutboxWorker, create_outbox_worker, enqueue_email
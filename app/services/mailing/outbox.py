@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import random
+
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from models.outbox_email import OutboxEmail
+from models.user import User
+from .renderer import EmailRender, MailRenderer, mail_renderer
+from .send_email_confirmed import render_email_confirmed
+from .send_reset_password import render_reset_password
+from .send_verification_email import render_verification_email
+from .smtp_pool import PreparedEmail, SMTPPool, smtp_pool
+
+log = logging.getLogger(__name__)
+
+
+# Типы писем и функции, формирующие их из пользователя и параметров задания
+EMAIL_RENDERERS: dict[str, EmailRender] = {
+    "verification": render_verification_email,
+    "reset_password": render_reset_password,
+    "email_confirmed": render_email_confirmed,
+}
+
+
+async def enqueue_email(
+    session: AsyncSession,
+    kind: str,
+    user: User,
+    **params: str,
+) -> OutboxEmail:
+    """
+    Ставит письмо в очередь исходящих писем (outbox).
+
+    Рендеринг шаблона и отправку выполнит воркер `run_mail_worker.py`.
+
+    Параметры письма (ссылки с токенами сброса пароля и подтверждения email) хранятся
+    в `payload` только до отправки: после неё (или после статуса `dead`) воркер
+    оставляет в `payload` лишь id пользователя, а старые задания удаляет
+    `cleanup_outbox_emails`.
+
+    Транзакционность: внутри `unit_of_work` задание только отправляется в БД (`flush`)
+    и фиксируется вместе с остальными изменениями. Иначе оно фиксируется отдельным
+    `commit` — это не транзакционный outbox: хуки fastapi-users вызываются уже после
+    фиксации изменений пользователя, и при сбое между двумя фиксациями письмо
+    будет потеряно (его можно запросить повторно).
+
+    Args:
+        session (AsyncSession): Сессия основной БД
+        kind (str): Тип письма из `EMAIL_RENDERERS`
+        user (User): Получатель
+        **params (str): Параметры письма (например, `verification_link`)
+
+    Returns:
+        OutboxEmail: Созданное задание
+
+    Raises:
+        ValueError: Если тип письма неизвестен
+    """
+    if kind not in EMAIL_RENDERERS:
+        raise ValueError(f"Неизвестный тип письма: {kind!r}")
+
+    job = OutboxEmail(kind=kind, payload={"user_id": user.id, **params})
+    session.add(job)
+    if session.info.get("unit_of_work"):
+        await session.flush()
+    else:
+        await session.commit()
+    return job
+
+
+class OutboxWorker:
+    """
+    Воркер очереди исходящих писем.
+
+    Забирает пачку готовых заданий (`SELECT ... FOR UPDATE SKIP LOCKED`, поэтому несколько
+    воркеров не берут одно и то же задание), формирует письма через `MailRenderer`
+    (большие пачки — в пуле потоков) и отправляет их через пул SMTP-соединений:
+    пачка делится между `concurrency` SMTP-сессиями.
+
+    Каждое взятие задания увеличивает `attempts` и выдаёт аренду на `lease_seconds`:
+    если воркер упадёт, задание снова станет доступно по её окончании.
+    Неудачная отправка откладывается с экспоненциальной задержкой (`backoff_base * 2^n`,
+    не больше `backoff_max`); после `max_attempts` попыток задание получает статус `dead`.
+    У отправленных и `dead` заданий параметры письма (ссылки с токенами) удаляются из `payload`.
+
+    Attributes:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной БД
+        pool (SMTPPool): Пул SMTP-соединений
+        renderer (MailRenderer): Рендеринг писем
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной БД
+        pool (SMTPPool): Пул SMTP-соединений
+        renderer (MailRenderer): Рендеринг писем
+        batch_size (int): Сколько заданий брать за раз
+        concurrency (int): Количество параллельных SMTP-сессий на пачку
+        poll_interval (float): Пауза, если очередь пуста (в секундах)
+        lease_seconds (int): Время аренды взятого задания (в секундах)
+        max_attempts (int): Максимальное количество попыток
+        backoff_base (float): Задержка перед первой повторной попыткой (в секундах)
+        backoff_max (float): Максимальная задержка между попытками (в секундах)
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        pool: SMTPPool,
+        renderer: MailRenderer,
+        batch_size: int = 50,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        lease_seconds: int = 300,
+        max_attempts: int = 8,
+        backoff_base: float = 30,
+        backoff_max: float = 3600,
+    ) -> None:
+        self.session_factory = session_factory
+        self.pool = pool
+        self.renderer = renderer
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Обрабатывает очередь, пока не установлен `stop`.
+
+        Args:
+            stop (asyncio.Event): Событие остановки (например, по SIGTERM)
+        """
+        log.info("Mail outbox worker started")
+        while not stop.is_set():
+            try:
+                processed = await self.process_batch()
+            except Exception:
+                log.exception("Mail outbox worker: batch failed")
+                processed = 0
+            if not processed:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+        log.info("Mail outbox worker stopped")
+
+    async def process_batch(self) -> int:
+        """
+        Берёт и обрабатывает одну пачку заданий.
+
+        Returns:
+            int: Количество обработанных заданий
+        """
+        async with self.session_factory() as session:
+            jobs = await self._claim(session)
+            if not jobs:
+                return 0
+
+            ready: list[tuple[OutboxEmail, PreparedEmail]] = []
+            emails = await self.renderer.prepare_many(
+                await self._render_params(session, jobs)
+            )
+            for job, email in zip(jobs, emails):
+                if isinstance(email, Exception):
+                    # Письмо невозможно сформировать — повторные попытки не помогут
+                    log.warning("Mail outbox: job %r is dead: %r", job.id, email)
+                    self._finish(job, "dead")
+                    job.last_error = repr(email)
+                else:
+                    ready.append((job, email))
+
+            results = await self._send([message for _, message in ready])
+            now = datetime.now(timezone.utc)
+            for (job, _), error in zip(ready, results):
+                if error is None:
+                    self._finish(job, "sent")
+                    job.sent_at = now
+                    job.last_error = None
+                else:
+                    self._schedule_retry(job, error, now)
+
+            await session.commit()
+            return len(jobs)
+
+    async def _claim(self, session: AsyncSession) -> list[OutboxEmail]:
+        now = datetime.now(timezone.utc)
+        statement = (
+            select(OutboxEmail)
+            .where(
+                OutboxEmail.status.in_(("pending", "processing")),
+                OutboxEmail.next_attempt_at <= now,
+            )
+            .order_by(OutboxEmail.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list(await session.scalars(statement))
+        for job in jobs:
+            job.status = "processing"
+            job.attempts += 1
+            job.next_attempt_at = now + timedelta(seconds=self.lease_seconds)
+        await session.commit()
+        return jobs
+
+    @staticmethod
+    async def _render_params(
+        session: AsyncSession,
+        jobs: list[OutboxEmail],
+    ) -> list[tuple[EmailRender, dict[str, Any]]]:
+        """Функции формирования писем и их аргументы (пользователи загружаются одним запросом)."""
+        user_ids = {job.payload["user_id"] for job in jobs}
+        users = {
+            user.id: user
+            for user in await session.scalars(select(User).where(User.id.in_(user_ids)))
+        }
+        emails = []
+        for job in jobs:
+            params: dict[str, Any] = dict(job.payload)
+            params["user"] = users.get(params.pop("user_id"))
+            emails.append((_render_job(job.kind), params))
+        return emails
+
+    async def _send(self, messages: list[PreparedEmail]) -> list[Exception | None]:
+        """Отправляет письма, распределяя их между `concurrency` SMTP-сессиями."""
+        if not messages:
+            return []
+        chunks = [messages[i :: self.concurrency] for i in range(self.concurrency)]
+        chunk_results = await asyncio.gather(
+            *(self.pool.send_many(chunk) for chunk in chunks if chunk)
+        )
+        # Возвращаем результаты в исходном порядке писем
+        results: list[Exception | None] = [None] * len(messages)
+        for offset, chunk_result in enumerate(chunk_results):
+            results[offset :: self.concurrency] = chunk_result
+        return results
+
+    @staticmethod
+    def _finish(job: OutboxEmail, status: str) -> None:
+        """Завершает задание: параметры письма (ссылки с токенами) больше не нужны."""
+        job.status = status
+        job.payload = {"user_id": job.payload.get("user_id")}
+
+    def _schedule_retry(self, job: OutboxEmail, error: Exception, now: datetime) -> None:
+        job.last_error = repr(error)
+        if job.attempts >= self.max_attempts:
+            log.warning("Mail outbox: job %r is dead after %r attempts", job.id, job.attempts)
+            self._finish(job, "dead")
+            return
+        delay = min(self.backoff_base * 2 ** (job.attempts - 1), self.backoff_max)
+        job.status = "pending"
+        job.next_attempt_at = now + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _render_job(kind: str) -> EmailRender:
+    render = EMAIL_RENDERERS.get(kind)
+
+    def render_email(user: User | None, **params: Any) -> dict[str, str]:
+        if render is None:
+            raise LookupError(f"Неизвестный тип письма: {kind!r}")
+        if user is None:
+            raise LookupError("Пользователь не найден")
+        return render(user=user, **params)
+
+    return render_email
+
+
+def create_outbox_worker(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> OutboxWorker:
+    """
+    Создаёт воркер очереди исходящих писем с параметрами из настроек.
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной БД
+
+    Returns:
+        OutboxWorker: Воркер
+    """
+    return OutboxWorker(
+        session_factory=session_factory,
+        pool=smtp_pool,
+        renderer=mail_renderer,
+        batch_size=settings.mail_outbox.batch_size,
+        concurrency=settings.mail_outbox.concurrency,
+        poll_interval=settings.mail_outbox.poll_interval,
+        lease_seconds=settings.mail_outbox.lease_seconds,
+        max_attempts=settings.mail_outbox.max_attempts,
+        backoff_base=settings.mail_outbox.backoff_base,
+        backoff_max=settings.mail_outbox.backoff_max,
+    )
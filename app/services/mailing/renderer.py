@@ -0,0 +1,186 @@
+import asyncio
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
+
+from core.config import BASE_DIR, settings
+from core.templates import format_datetime
+from .send_email import build_email_message
+from .smtp_pool import PreparedEmail
+
+log = logging.getLogger(__name__)
+
+
+# Функция, формирующая письмо: возвращает параметры `send_email`
+EmailRender = Callable[..., dict[str, str]]
+
+
+class MailRenderer:
+    """
+    Рендеринг писем из шаблонов `templates/mailing`.
+
+    Отдельное окружение Jinja2 для писем: все шаблоны компилируются один раз при старте
+    (`precompile`) и хранятся в памяти, без проверки файлов на изменение при каждом письме.
+    Скомпилированный байткод можно сохранять на диск (`bytecode_cache_dir`),
+    чтобы новые процессы не компилировали шаблоны заново.
+
+    Пачки писем от `parallel_threshold` штук рендерятся и сериализуются (MIME)
+    в пуле потоков, не блокируя цикл событий.
+
+    Attributes:
+        env (Environment): Окружение Jinja2
+        parallel_threshold (int): Размер пачки, начиная с которого используется пул потоков
+
+    Args:
+        directory (Path): Каталог шаблонов
+        bytecode_cache_dir (Path | None): Каталог для байткода шаблонов (None — без кэша на диске)
+        parallel_threshold (int): Размер пачки, начиная с которого используется пул потоков
+        max_workers (int): Количество потоков
+    """
+
+    prefix = "mailing/"
+
+    def __init__(
+        self,
+        directory: Path,
+        bytecode_cache_dir: Optional[Path] = None,
+        parallel_threshold: int = 16,
+        max_workers: int = 2,
+    ) -> None:
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+
+        self.env = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(),
+            auto_reload=False,
+            cache_size=-1,
+            bytecode_cache=bytecode_cache,
+        )
+        self.env.filters["format_datetime"] = format_datetime
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers
+        self._templates: dict[str, Template] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def precompile(self) -> int:
+        """
+        Компилирует все шаблоны писем. Вызывается при старте приложения и воркера писем.
+
+        Returns:
+            int: Количество шаблонов
+        """
+        names = self.env.list_templates(
+            filter_func=lambda name: name.startswith(self.prefix)
+        )
+        for name in names:
+            self._templates[name] = self.env.get_template(name)
+        log.info("Mail renderer: %r templates compiled", len(names))
+        return len(names)
+
+    def get_template(self, name: str) -> Template:
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.env.get_template(name)
+        return template
+
+    def render(self, name: str, context: dict[str, Any]) -> str:
+        """
+        Рендерит шаблон письма.
+
+        Args:
+            name (str): Имя шаблона (например, `mailing/email-reset-password.html`)
+            context (dict[str, Any]): Контекст шаблона
+
+        Returns:
+            str: HTML письма
+        """
+        return self.get_template(name).render(context)
+
+    @staticmethod
+    def prepare(render: EmailRender, **params: Any) -> PreparedEmail:
+        """
+        Формирует и сериализует одно письмо.
+
+        Args:
+            render (EmailRender): Функция, формирующая письмо (например, `render_reset_password`)
+            **params: Её аргументы
+
+        Returns:
+            PreparedEmail: Готовое к отправке письмо
+        """
+        return PreparedEmail.from_message(build_email_message(**render(**params)))
+
+    def _prepare_chunk(
+        self,
+        emails: Sequence[tuple[EmailRender, dict[str, Any]]],
+    ) -> list[PreparedEmail | Exception]:
+        results: list[PreparedEmail | Exception] = []
+        for render, params in emails:
+            try:
+                results.append(self.prepare(render, **params))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    async def prepare_many(
+        self,
+        emails: Sequence[tuple[EmailRender, dict[str, Any]]],
+    ) -> list[PreparedEmail | Exception]:
+        """
+        Формирует и сериализует пачку писем.
+
+        Ошибка одного письма не прерывает остальные: вместо письма возвращается исключение.
+
+        Args:
+            emails (Sequence[tuple[EmailRender, dict]]): Функции формирования писем и их аргументы
+
+        Returns:
+            list[PreparedEmail | Exception]: Письма в том же порядке
+        """
+        if len(emails) < self.parallel_threshold:
+            return self._prepare_chunk(emails)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="mail-render",
+            )
+        loop = asyncio.get_running_loop()
+        size = -(-len(emails) // self.max_workers)  # деление с округлением вверх
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._executor, self._prepare_chunk, emails[i : i + size]
+                )
+                for i in range(0, len(emails), size)
+            )
+        )
+        return [email for chunk in chunks for email in chunk]
+
+    def close(self) -> None:
+        """Останавливает пул потоков."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Глобальный экземпляр для использования в приложении
+mail_renderer = MailRenderer(
+    directory=BASE_DIR / "templates",
+    bytecode_cache_dir=settings.mail_render.bytecode_cache_dir,
+    parallel_threshold=settings.mail_render.parallel_threshold,
+    max_workers=settings.mail_render.max_workers,
+)
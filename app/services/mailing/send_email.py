@@ -4,22 +4,23 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 from core.config import settings
+from .smtp_pool import smtp_options, smtp_pool
 
 
-async def send_email(
+def build_email_message(
     recipient: str,
     subject: str,
     plain_content: str,
     html_content: str = "",
-):
+) -> MIMEMultipart:
     """
-    Асинхронная отправка email через SMTP-сервер.
+    Формирует письмо (текст и, при наличии, HTML-версия).
 
     :param recipient: Кому отправляется письмо.
     :param subject: Тема письма.
     :param plain_content: Текст письма.
     :param html_content: HTML письма.
-    :return: None. Функция ничего не возвращает.
+    :return: Готовое к отправке письмо.
     """
 
     message = MIMEMultipart("alternative")
@@ -42,19 +43,36 @@ async def send_email(
         )
         message.attach(html_message)
 
-    if settings.smtp.use_real_smtp or settings.site.environment == "production":
-        await aiosmtplib.send(
-            message,
-            hostname=settings.smtp.host,
-            port=settings.smtp.port,
-            username=settings.smtp.username,
-            password=settings.smtp.password.get_secret_value(),
-            use_tls=settings.smtp.use_tls,
-        )
+    return message
+
+
+async def send_email(
+    recipient: str,
+    subject: str,
+    plain_content: str,
+    html_content: str = "",
+):
+    """
+    Асинхронная отправка email через SMTP-сервер.
+
+    Если пул SMTP-соединений открыт (в lifespan приложения), письмо отправляется через него,
+    иначе — отдельным подключением.
+
+    :param recipient: Кому отправляется письмо.
+    :param subject: Тема письма.
+    :param plain_content: Текст письма.
+    :param html_content: HTML письма.
+    :return: None. Функция ничего не возвращает.
+    """
+
+    message = build_email_message(
+        recipient=recipient,
+        subject=subject,
+        plain_content=plain_content,
+        html_content=html_content,
+    )
+
+    if smtp_pool.is_open:
+        await smtp_pool.send(message)
     else:
-        # Режим разработки — отправка в MailHog
-        await aiosmtplib.send(
-            message,
-            hostname="127.0.0.1",
-            port=1025,
-        )
+        await aiosmtplib.send(message, **smtp_options())
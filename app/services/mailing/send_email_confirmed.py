@@ -1,40 +1,51 @@
 from textwrap import dedent
 
 from core.config import settings
-from core.templates import templates
 from models.user import User
+from .renderer import mail_renderer
 from .send_email import send_email
 
+# Постоянные части письма (зависят только от сайта) формируются один раз
+SUBJECT = "Адрес электронной почты подтвержден"
+PLAIN_CONTENT = dedent(
+    """\
+    Уважаемый {recipient_name},
 
-async def send_email_confirmed(user: User):
+    Ваш адрес электронной почты подтверждён.
+
+    Спасибо за использование {site_name}!
+    © 2025 {site_name}
     """
-    Отправка письма пользователю о подтверждении email.
+)
+TEMPLATE_NAME = "mailing/email-verify/email-verified.html"
 
-    :param user: Пользователь.
-    :return: None. Функция ничего не возвращает.
+
+def render_email_confirmed(user: User) -> dict[str, str]:
     """
+    Формирует письмо о подтверждении email.
 
-    recipient = user.email
-    recipient_name = user.first_name
-    subject = "Адрес электронной почты подтвержден"
+    :param user: Пользователь.
+    :return: Параметры для `send_email` (recipient, subject, plain_content, html_content).
+    """
 
-    plain_content = dedent(
-        f"""\
-        Уважаемый {recipient_name},
+    context = {"user": user}
+    html_content = mail_renderer.render(TEMPLATE_NAME, context)
+    return {
+        "recipient": user.email,
+        "subject": SUBJECT,
+        "plain_content": PLAIN_CONTENT.format(
+            site_name=settings.site.site_name,
+            recipient_name=user.first_name,
+        ),
+        "html_content": html_content,
+    }
 
-        Ваш адрес электронной почты подтверждён.
 
-        Спасибо за использование {settings.site.site_name}!
-        © 2025 {settings.site.site_name}
-        """
-    )
+async def send_email_confirmed(user: User):
+    """
+    Отправка письма пользователю о подтверждении email.
 
-    template = templates.get_template("mailing/email-verify/email-verified.html")
-    context = {"user": user}
-    html_content = template.render(context)
-    await send_email(
-        recipient=recipient,
-        subject=subject,
-        plain_content=plain_content,
-        html_content=html_content,
-    )
+    :param user: Пользователь.
+    :return: None. Функция ничего не возвращает.
+    """
+    await send_email(**render_email_confirmed(user))
@@ -1,48 +1,69 @@
 from textwrap import dedent
 
 from core.config import settings
-from core.templates import templates
 from models.user import User
+from .renderer import mail_renderer
 from .send_email import send_email
 
+# Постоянные части письма (зависят только от сайта) формируются один раз
+SUBJECT = f"Сбросить пароль на сайте {settings.site.site_name}"
+PLAIN_CONTENT = dedent(
+    """\
+    Уважаемый {recipient_name},
 
-async def send_reset_password(
+    Для сброса пароля, пожалуйста, перейдите по ссылке:
+    {reset_password_link}
+
+    Спасибо за использование {site_name}!
+    © 2025 {site_name}
+    """
+)
+TEMPLATE_NAME = "mailing/email-reset-password.html"
+
+
+def render_reset_password(
     user: User,
     reset_password_link: str,
-):
+) -> dict[str, str]:
     """
-    Отправка пользователю письма со сбросом пароля.
+    Формирует письмо со сбросом пароля.
 
     :param user: Пользователь.
     :param reset_password_link: Ссылка для сброса пароля.
-    :return: None. Функция ничего не возвращает.
+    :return: Параметры для `send_email` (recipient, subject, plain_content, html_content).
     """
 
-    recipient = user.email
-    recipient_name = user.first_name
-    subject = f"Сбросить пароль на сайте {settings.site.site_name}"
-
-    plain_content = dedent(
-        f"""\
-        Уважаемый {recipient_name},
-
-        Для сброса пароля, пожалуйста, перейдите по ссылке:
-        {reset_password_link}
-
-        Спасибо за использование {settings.site.site_name}!
-        © 2025 {settings.site.site_name}
-        """
-    )
-
-    template = templates.get_template("mailing/email-reset-password.html")
     context = {
         "user": user,
         "reset_password_link": reset_password_link,
     }
-    html_content = template.render(context)
+    html_content = mail_renderer.render(TEMPLATE_NAME, context)
+    return {
+        "recipient": user.email,
+        "subject": SUBJECT,
+        "plain_content": PLAIN_CONTENT.format(
+            site_name=settings.site.site_name,
+            recipient_name=user.first_name,
+            reset_password_link=reset_password_link,
+        ),
+        "html_content": html_content,
+    }
+
+
+async def send_reset_password(
+    user: User,
+    reset_password_link: str,
+):
+    """
+    Отправка пользователю письма со сбросом пароля.
+
+    :param user: Пользователь.
+    :param reset_password_link: Ссылка для сброса пароля.
+    :return: None. Функция ничего не возвращает.
+    """
     await send_email(
-        recipient=recipient,
-        subject=subject,
-        plain_content=plain_content,
-        html_content=html_content,
+        **render_reset_password(
+            user=user,
+            reset_password_link=reset_password_link,
+        )
     )
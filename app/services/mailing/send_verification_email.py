@@ -1,48 +1,69 @@
 from textwrap import dedent
 
 from core.config import settings
-from core.templates import templates
 from models.user import User
+from .renderer import mail_renderer
 from .send_email import send_email
 
+# Постоянные части письма (зависят только от сайта) формируются один раз
+SUBJECT = f"Подтвердите адрес электронной почты для сайта {settings.site.site_name}"
+PLAIN_CONTENT = dedent(
+    """\
+    Уважаемый {recipient_name},
 
-async def send_verification_email(
+    Для подтверждения email, пожалуйста, перейдите по ссылке:
+    {verification_link}
+
+    Спасибо за регистрацию на {site_name}!
+    © 2025 {site_name}
+    """
+)
+TEMPLATE_NAME = "mailing/email-verify/email-verification.html"
+
+
+def render_verification_email(
     user: User,
     verification_link: str,
-):
+) -> dict[str, str]:
     """
-    Отправка пользователю письма с подтверждением email.
+    Формирует письмо с подтверждением email.
 
     :param user: Пользователь.
     :param verification_link: Ссылка для подтверждения email.
-    :return: None. Функция ничего не возвращает.
+    :return: Параметры для `send_email` (recipient, subject, plain_content, html_content).
     """
 
-    recipient = user.email
-    recipient_name = user.first_name
-    subject = f"Подтвердите адрес электронной почты для сайта {settings.site.site_name}"
-
-    plain_content = dedent(
-        f"""\
-        Уважаемый {recipient_name},
-
-        Для подтверждения email, пожалуйста, перейдите по ссылке:
-        {verification_link}
-
-        Спасибо за регистрацию на {settings.site.site_name}!
-        © 2025 {settings.site.site_name}
-        """
-    )
-
-    template = templates.get_template("mailing/email-verify/email-verification.html")
     context = {
         "user": user,
         "verification_link": verification_link,
     }
-    html_content = template.render(context)
+    html_content = mail_renderer.render(TEMPLATE_NAME, context)
+    return {
+        "recipient": user.email,
+        "subject": SUBJECT,
+        "plain_content": PLAIN_CONTENT.format(
+            site_name=settings.site.site_name,
+            recipient_name=user.first_name,
+            verification_link=verification_link,
+        ),
+        "html_content": html_content,
+    }
+
+
+async def send_verification_email(
+    user: User,
+    verification_link: str,
+):
+    """
+    Отправка пользователю письма с подтверждением email.
+
+    :param user: Пользователь.
+    :param verification_link: Ссылка для подтверждения email.
+    :return: None. Функция ничего не возвращает.
+    """
     await send_email(
-        recipient=recipient,
-        subject=subject,
-        plain_content=plain_content,
-        html_content=html_content,
+        **render_verification_email(
+            user=user,
+            verification_link=verification_link,
+        )
     )
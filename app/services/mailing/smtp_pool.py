@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import time
+
+from contextlib import asynccontextmanager, suppress
+from email.message import Message
+from email.utils import getaddresses
+from typing import Any, AsyncIterator, Sequence, Union
+
+import aiosmtplib
+
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+
+# Ошибки, после которых соединение нельзя использовать повторно
+_CONNECTION_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    OSError,
+)
+
+# Отказы сервера по конкретному письму: aiosmtplib сбрасывает конверт (RSET),
+# и соединение можно использовать дальше
+_MESSAGE_ERRORS = (
+    aiosmtplib.SMTPResponseException,
+    aiosmtplib.SMTPRecipientsRefused,
+)
+
+# Код ответа, с которым сервер закрывает соединение
+_SERVICE_NOT_AVAILABLE = 421
+
+
+class PreparedEmail:
+    """
+    Письмо, заранее сериализованное для передачи по SMTP.
+
+    Сериализация MIME (`Message.as_bytes`) — заметная CPU-работа; подготовленное письмо
+    можно сформировать в пуле потоков и отправить без повторной сериализации в цикле событий.
+    Тела `MIMEText(..., "utf-8")` кодируются base64, поэтому результат 7-битный
+    и подходит любому серверу.
+
+    Attributes:
+        sender (str): Адрес отправителя
+        recipients (list[str]): Адреса получателей
+        data (bytes): Письмо в формате RFC 5322
+    """
+
+    __slots__ = ("sender", "recipients", "data")
+
+    def __init__(self, sender: str, recipients: list[str], data: bytes) -> None:
+        self.sender = sender
+        self.recipients = recipients
+        self.data = data
+
+    @classmethod
+    def from_message(cls, message: Message) -> "PreparedEmail":
+        """
+        Сериализует письмо.
+
+        Args:
+            message (Message): Письмо
+
+        Returns:
+            PreparedEmail: Подготовленное письмо
+        """
+        recipients = [
+            address
+            for _, address in getaddresses(
+                message.get_all("To", []) + message.get_all("Cc", [])
+            )
+        ]
+        return cls(
+            sender=message["From"],
+            recipients=recipients,
+            data=message.as_bytes(policy=message.policy.clone(linesep="\r\n")),
+        )
+
+
+# Письмо для отправки через пул
+Email = Union[Message, PreparedEmail]
+
+
+async def deliver(smtp: aiosmtplib.SMTP, email: Email) -> None:
+    """Отправляет письмо через открытое соединение."""
+    if isinstance(email, PreparedEmail):
+        await smtp.sendmail(email.sender, email.recipients, email.data)
+    else:
+        await smtp.send_message(email)
+
+
+def smtp_options() -> dict[str, Any]:
+    """
+    Параметры подключения к SMTP-серверу из настроек.
+
+    В режиме разработки письма уходят в MailHog (`127.0.0.1:1025`, без авторизации).
+    """
+    if settings.smtp.use_real_smtp or settings.site.environment == "production":
+        return {
+            "hostname": settings.smtp.host,
+            "port": settings.smtp.port,
+            "username": settings.smtp.username,
+            "password": settings.smtp.password.get_secret_value(),
+            "use_tls": settings.smtp.use_tls,
+        }
+    # Режим разработки — отправка в MailHog
+    return {
+        "hostname": "127.0.0.1",
+        "port": 1025,
+    }
+
+
+class SMTPPool:
+    """
+    Пул постоянных авторизованных SMTP-соединений.
+
+    Вместо подключения, EHLO, STARTTLS и AUTH на каждое письмо соединения переиспользуются.
+    Количество одновременно используемых соединений ограничено `size`.
+    Соединение, простоявшее дольше `health_check_interval`, перед выдачей проверяется
+    командой NOOP; соединение, не прошедшее проверку, закрывается и заменяется новым.
+    В пул возвращается только соединение, на котором письмо отправлено или отклонено
+    сервером; после любой другой ошибки (обрыв, таймаут, отмена задачи) состояние
+    сессии неизвестно, и соединение закрывается.
+
+    Открывается и закрывается в lifespan приложения. Пока пул не открыт,
+    `send_email` отправляет письма отдельными подключениями (`aiosmtplib.send`).
+
+    Attributes:
+        size (int): Максимальное количество соединений
+        health_check_interval (float): Время простоя, после которого соединение проверяется NOOP (в секундах)
+        is_open (bool): Открыт ли пул
+
+    Args:
+        size (int): Максимальное количество соединений
+        health_check_interval (float): Время простоя, после которого соединение проверяется NOOP (в секундах)
+        timeout (float): Таймаут операций SMTP (в секундах)
+        **options: Параметры подключения `aiosmtplib.SMTP` (hostname, port, username, ...)
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        health_check_interval: float = 30,
+        timeout: float = 10,
+        **options: Any,
+    ) -> None:
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self.options = options
+        self.is_open = False
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+        self._semaphore = asyncio.Semaphore(size)
+
+    async def open(self) -> None:
+        """Открывает пул (соединения устанавливаются по мере необходимости)."""
+        self.is_open = True
+
+    async def close(self) -> None:
+        """Закрывает все свободные соединения. Вызывается при завершении работы приложения."""
+        self.is_open = False
+        idle, self._idle = self._idle, []
+        for smtp, _ in idle:
+            await self._disconnect(smtp)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(timeout=self.timeout, **self.options)
+        await smtp.connect()  # EHLO, STARTTLS и AUTH выполняются при подключении
+        return smtp
+
+    @staticmethod
+    async def _disconnect(smtp: aiosmtplib.SMTP) -> None:
+        with suppress(aiosmtplib.SMTPException, OSError):
+            if smtp.is_connected:
+                await smtp.quit()
+        smtp.close()
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            smtp, last_used = self._idle.pop()
+            if not smtp.is_connected:
+                continue
+            if time.monotonic() - last_used < self.health_check_interval:
+                return smtp
+            try:
+                await smtp.noop()
+                return smtp
+            except (*_CONNECTION_ERRORS, aiosmtplib.SMTPResponseException):
+                # Обрыв или ответ 4xx/5xx на NOOP — берём следующее соединение
+                await self._disconnect(smtp)
+            except BaseException:
+                smtp.close()
+                raise
+        return await self._connect()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Выдаёт соединение из пула на время блока `async with`.
+
+        Соединение возвращается в пул, если блок завершился успешно или сервер
+        отклонил письмо (`SMTPResponseException`, `SMTPRecipientsRefused`).
+        При любой другой ошибке, в том числе `CancelledError` и `TimeoutError`,
+        соединение закрывается.
+
+        Yields:
+            aiosmtplib.SMTP: Подключённый и авторизованный клиент
+        """
+        async with self._semaphore:
+            smtp = await self._checkout()
+            try:
+                yield smtp
+            except _MESSAGE_ERRORS as exc:
+                # Ошибка уровня письма (например, адрес отклонён) — соединение исправно,
+                # если только сервер не закрывает его сам (421)
+                if getattr(exc, "code", None) == _SERVICE_NOT_AVAILABLE:
+                    smtp.close()
+                else:
+                    self._release(smtp)
+                raise
+            except BaseException:
+                # Состояние сессии неизвестно (обрыв, таймаут, отмена) — не возвращаем в пул
+                smtp.close()
+                raise
+            else:
+                self._release(smtp)
+
+    def _release(self, smtp: aiosmtplib.SMTP) -> None:
+        if self.is_open and smtp.is_connected:
+            self._idle.append((smtp, time.monotonic()))
+        else:
+            smtp.close()
+
+    async def send(self, message: Email) -> None:
+        """
+        Отправляет письмо через соединение из пула.
+
+        Если соединение оказалось разорванным сервером, письмо отправляется ещё раз
+        через новое соединение.
+
+        Args:
+            message (Email): Письмо (`Message` или `PreparedEmail`)
+        """
+        try:
+            async with self.connection() as smtp:
+                await deliver(smtp, message)
+        except aiosmtplib.SMTPServerDisconnected:
+            async with self.connection() as smtp:
+                await deliver(smtp, message)
+
+    async def send_many(self, messages: Sequence[Email]) -> list[Exception | None]:
+        """
+        Отправляет пачку писем в рамках одной SMTP-сессии.
+
+        Ошибка одного письма не прерывает отправку остальных; при разрыве соединения
+        сессия переоткрывается, и письмо отправляется ещё раз (однократно).
+
+        Args:
+            messages (Sequence[Email]): Письма (`Message` или `PreparedEmail`)
+
+        Returns:
+            list[Exception | None]: Результат по каждому письму (None — отправлено)
+        """
+        results: list[Exception | None] = [None] * len(messages)
+        position = 0
+        retried = -1
+        while position < len(messages):
+            try:
+                async with self.connection() as smtp:
+                    while position < len(messages):
+                        try:
+                            await deliver(smtp, messages[position])
+                        except _CONNECTION_ERRORS:
+                            raise
+                        except aiosmtplib.SMTPException as exc:
+                            results[position] = exc
+                        position += 1
+            except _CONNECTION_ERRORS as exc:
+                log.warning("SMTP pool: connection lost during batch: %r", exc)
+                if retried == position:
+                    results[position] = exc
+                    position += 1
+                else:
+                    retried = position
+        return results
+
+
+# Глобальный экземпляр для использования в приложении
+smtp_pool = SMTPPool(
+    size=settings.smtp.pool_size,
+    health_check_interval=settings.smtp.health_check_interval,
+    timeout=settings.smtp.timeout,
+    **smtp_options(),
+)
@@ -1,3 +1,12 @@
-__all__ = ("camel_case_to_snake_case",)
+__all__ = (
+    "camel_case_to_snake_case",
+    "encode_cursor",
+    "decode_cursor",
+    "TrustedJSONResponse",
+    "trusted_response",
+    "type_adapter",
+)
 
 from .case_converter import camel_case_to_snake_case
+from .cursor import encode_cursor, decode_cursor
+from .serialization import TrustedJSONResponse, trusted_response, type_adapter
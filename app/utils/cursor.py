@@ -0,0 +1,36 @@
+import base64
+
+from typing import Any
+
+import orjson
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    """
+    Кодирует позицию keyset-пагинации в непрозрачную строку курсора.
+
+    >>> encode_cursor({"id": 42})
+    'eyJpZCI6NDJ9'
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(position)).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """
+    Декодирует строку курсора, созданную `encode_cursor`.
+
+    >>> decode_cursor("eyJpZCI6NDJ9")
+    {'id': 42}
+
+    Raises:
+        ValueError: Если курсор повреждён или имеет неверный формат
+    """
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        position = orjson.loads(base64.urlsafe_b64decode(cursor + padding))
+    except ValueError as exc:
+        raise ValueError(f"Некорректный курсор: {cursor!r}") from exc
+
+    if not isinstance(position, dict):
+        raise ValueError(f"Некорректный курсор: {cursor!r}")
+    return position
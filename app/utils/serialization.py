@@ -0,0 +1,129 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import Any, Callable, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+
+_MISSING = object()
+
+
+class TrustedJSONResponse(Response):
+    """Ответ с телом, уже сериализованным `trusted_response`."""
+
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=256)
+def type_adapter(type_: Any) -> TypeAdapter:
+    """
+    Общий `TypeAdapter` для типа: схема валидации и сериализатор строятся один раз.
+
+    Args:
+        type_: Тип (например, `CursorPage[UserRead]`, `list[UserRead]`)
+
+    Returns:
+        TypeAdapter: Адаптер типа
+    """
+    return TypeAdapter(type_)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@lru_cache(maxsize=256)
+def _constructor(type_: Any) -> Callable[[Any], Any]:
+    """
+    Функция, собирающая значение типа `type_` без валидации (`model_construct`):
+    модели Pydantic — из словарей или атрибутов объектов, рекурсивно по полям,
+    `list[...]` и `X | None` — поэлементно. Остальные значения не изменяются.
+    """
+    origin = get_origin(type_)
+    if origin is list:
+        (item_type,) = get_args(type_)
+        construct_item = _constructor(item_type)
+        return lambda data: [construct_item(item) for item in data]
+
+    if origin is Union or origin is UnionType:
+        args = [arg for arg in get_args(type_) if arg is not NoneType]
+        if len(args) != 1:
+            return _identity
+        construct_inner = _constructor(args[0])
+        return lambda data: None if data is None else construct_inner(data)
+
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        fields = [
+            (name, _constructor(field.annotation))
+            for name, field in type_.model_fields.items()
+        ]
+
+        def construct_model(data: Any) -> BaseModel:
+            if isinstance(data, type_):
+                return data
+            if isinstance(data, Mapping):
+                values = {name: data.get(name, _MISSING) for name, _ in fields}
+            else:
+                values = {name: getattr(data, name, _MISSING) for name, _ in fields}
+            # Отсутствующие поля получают значения по умолчанию
+            return type_.model_construct(
+                **{
+                    name: construct(values[name])
+                    for name, construct in fields
+                    if values[name] is not _MISSING
+                }
+            )
+
+        return construct_model
+
+    return _identity
+
+
+def trusted_response(
+    type_: Any,
+    data: Any,
+    status_code: int = 200,
+    validate: bool = False,
+) -> TrustedJSONResponse:
+    """
+    Сериализует доверенные данные (строки из БД) сразу в JSON-ответ.
+
+    По умолчанию данные не валидируются: значения собираются в модели через
+    `model_construct` (экземпляры моделей SQLAlchemy читаются по атрибутам,
+    в том числе во вложенных списках). Валидаторы полей (например, `EmailStr`)
+    не вызываются — это основная часть стоимости на больших списках. С `validate=True`
+    данные валидируются по `type_` одним вызовом (`from_attributes=True`).
+    Затем значение сериализуется в байты (`dump_json`, `by_alias=True`)
+    без промежуточных словарей.
+
+    Эндпоинт, вернувший готовый `Response`, FastAPI отдаёт как есть: повторная
+    валидация по `response_model` и `jsonable_encoder` не выполняются. `response_model`
+    в декораторе маршрута оставляйте — он описывает ответ в OpenAPI.
+
+    Пример:
+        @router.get("", response_model=CursorPage[UserRead])
+        async def get_users_list(...) -> Response:
+            return trusted_response(CursorPage[UserRead], {"items": users, "next_cursor": cursor})
+
+    Args:
+        type_: Тип ответа (тот же, что в `response_model`)
+        data: Данные: словари, экземпляры моделей SQLAlchemy или Pydantic
+        status_code (int): HTTP-статус ответа
+        validate (bool): Валидировать ли данные (для данных не из своей БД)
+
+    Returns:
+        TrustedJSONResponse: Ответ с готовым JSON-телом
+
+    Raises:
+        pydantic.ValidationError: Если `validate=True` и данные не соответствуют типу
+    """
+    adapter = type_adapter(type_)
+    if validate:
+        value = adapter.validate_python(data, from_attributes=True)
+    else:
+        value = _constructor(type_)(data)
+    return TrustedJSONResponse(
+        content=adapter.dump_json(value, by_alias=True),
+        status_code=status_code,
+    )
@@ -0,0 +1,103 @@
+"""
+Бенчмарк массовых операций `CrudManager`.
+
+Сравнивает циклы одиночных вызовов (`create`, `update`, `delete` — по запросу
+и `commit` на строку) с `create_many`, `upsert`,
+`update_many` и `delete_many` (несколько запросов на весь набор, без загрузки
+экземпляров модели).
+
+По умолчанию используется SQLite в памяти; для PostgreSQL передайте URL
+пустой тестовой БД в переменной окружения `BENCH_DATABASE_URL`
+(таблицы создаются и удаляются бенчмарком).
+
+Запуск (из корня репозитория):
+    PYTHONPATH=app python benchmarks/bench_crud_bulk.py
+"""
+
+import asyncio
+import os
+import time
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from models import Base, User
+from repositories import CrudManager
+
+NUMBER = 2_000
+DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+
+class UserRow(BaseModel):
+    email: str
+    hashed_password: str
+    first_name: str
+
+
+class UserName(BaseModel):
+    first_name: str
+
+
+def rows(tag: str) -> list[UserRow]:
+    return [
+        UserRow(email=f"{tag}-{i}@example.com", hashed_password="hash", first_name=tag)
+        for i in range(NUMBER)
+    ]
+
+
+def report(name: str, seconds: float) -> None:
+    print(f"{name:<40} {seconds:8.3f} с  {NUMBER / seconds:10.0f} строк/с")
+
+
+async def main() -> None:
+    engine_kwargs = {"poolclass": StaticPool} if DATABASE_URL.startswith("sqlite") else {}
+    engine = create_async_engine(DATABASE_URL, **engine_kwargs)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    print(f"{NUMBER} строк, {engine.dialect.name}")
+    async with session_factory() as session:
+        manager = CrudManager(session, User)
+
+        start = time.perf_counter()
+        for row in rows("loop"):
+            await manager.create(row)
+        report("create в цикле", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await manager.create_many(rows("bulk"))
+        report("create_many", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await manager.upsert(rows("bulk"), conflict_fields=["email"])
+        report("upsert (все строки конфликтуют)", time.perf_counter() - start)
+
+        users = (await session.scalars(select(User).where(User.first_name == "loop"))).all()
+        start = time.perf_counter()
+        for user in users:
+            await manager.update(user, UserName(first_name="loop-updated"))
+        report("update в цикле", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await manager.update_many({"first_name": "bulk-updated"}, first_name="bulk")
+        report("update_many", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for user in users:
+            await manager.delete(user)
+        report("delete в цикле", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await manager.delete_many(first_name="bulk-updated")
+        report("delete_many", time.perf_counter() - start)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
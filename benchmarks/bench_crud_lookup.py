@@ -0,0 +1,113 @@
+"""
+Бенчмарк частых выборок `CrudManager` (`get_by_id`, `get_all_by_field`, `get_by_fields`).
+
+Сравнивает пропускную способность (запросов в секунду):
+    - до: запрос строится заново на каждый вызов (`select()` + `getattr` по полям),
+      SQLAlchemy каждый раз вычисляет ключ кэша компиляции;
+    - после: методы `CrudManager` с готовыми запросами из кэша (параметры вместо значений).
+
+Таблица небольшая, чтобы в замере преобладали накладные расходы Python, а не БД.
+
+По умолчанию используется SQLite в памяти; для PostgreSQL передайте URL
+пустой тестовой БД в переменной окружения `BENCH_DATABASE_URL`
+(таблицы создаются и удаляются бенчмарком).
+
+Запуск (из корня репозитория):
+    PYTHONPATH=app python benchmarks/bench_crud_lookup.py
+"""
+
+import asyncio
+import os
+import random
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from models import Base, User
+from repositories import CrudManager
+
+ROWS = 1_000
+NUMBER = 5_000
+DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+
+async def rebuilt_by_id(session, instance_id):
+    stmt = select(User).where(User.id == instance_id)
+    return (await session.execute(stmt)).scalars().first()
+
+
+async def rebuilt_by_fields(session, **filters):
+    stmt = select(User).where(*(getattr(User, field) == value for field, value in filters.items()))
+    return (await session.execute(stmt)).scalars().all()
+
+
+async def measure(session, call) -> float:
+    """Запросов в секунду."""
+    start = time.perf_counter()
+    for i in range(NUMBER):
+        await call(i)
+        session.expunge_all()
+    return NUMBER / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    engine_kwargs = {"poolclass": StaticPool} if DATABASE_URL.startswith("sqlite") else {}
+    engine = create_async_engine(DATABASE_URL, **engine_kwargs)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        manager = CrudManager(session, User)
+        ids = [
+            row.id
+            for row in await manager.create_many(
+                {
+                    "email": f"user{i}@example.com",
+                    "hashed_password": "hash",
+                    "first_name": f"name{i % 100}",
+                }
+                for i in range(ROWS)
+            )
+        ]
+        random.seed(0)
+        picks = [random.choice(ids) for _ in range(NUMBER)]
+        names = [f"name{random.randrange(100)}" for _ in range(NUMBER)]
+
+        cases = [
+            (
+                "get_by_id",
+                lambda i: rebuilt_by_id(session, picks[i]),
+                lambda i: manager.get_by_id(picks[i]),
+            ),
+            (
+                "get_all_by_field",
+                lambda i: rebuilt_by_fields(session, first_name=names[i]),
+                lambda i: manager.get_all_by_field("first_name", names[i]),
+            ),
+            (
+                "get_by_fields (2 поля)",
+                lambda i: rebuilt_by_fields(session, first_name=names[i], is_active=True),
+                lambda i: manager.get_by_fields(first_name=names[i], is_active=True),
+            ),
+        ]
+
+        print(f"{engine.dialect.name}, {ROWS} строк, {NUMBER} запросов на замер")
+        print(f"{'метод':<24} {'до, запр/с':>12} {'после, запр/с':>14}")
+        for name, before_call, after_call in cases:
+            # Прогрев: компиляция запросов и подготовленные выражения драйвера
+            await before_call(0)
+            await after_call(0)
+            before = await measure(session, before_call)
+            after = await measure(session, after_call)
+            print(f"{name:<24} {before:>12.0f} {after:>14.0f}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
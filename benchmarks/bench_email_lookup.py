@@ -0,0 +1,91 @@
+"""
+Бенчмарк поиска пользователя по email (шаг входа до проверки пароля).
+
+Сравнивает задержку `get_by_email` (запрос fastapi-users `lower(email) = lower(:email)`)
+в зависимости от размера таблицы `users`:
+    - до: в БД только индекс `ix_users_email` по самому полю — полный просмотр таблицы;
+    - после: с индексом `ix_users_email_lower` по выражению `lower(email)`.
+
+Хеширование пароля не входит в замер: его стоимость не зависит от размера таблицы.
+
+По умолчанию используется SQLite в памяти; для PostgreSQL передайте URL
+пустой тестовой БД в переменной окружения `BENCH_DATABASE_URL`
+(таблицы создаются и удаляются бенчмарком).
+
+Запуск (из корня репозитория):
+    PYTHONPATH=app python benchmarks/bench_email_lookup.py
+"""
+
+import asyncio
+import os
+import random
+import time
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from models import Base, User
+
+SIZES = (1_000, 10_000, 100_000)
+LOOKUPS = 200
+DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+
+async def measure(session, user_db, emails: list[str]) -> float:
+    """Средняя задержка поиска (в миллисекундах)."""
+    start = time.perf_counter()
+    for email in emails:
+        user = await user_db.get_by_email(email)
+        assert user is not None
+        session.expunge_all()
+    return (time.perf_counter() - start) / len(emails) * 1000
+
+
+async def main() -> None:
+    engine_kwargs = {"poolclass": StaticPool} if DATABASE_URL.startswith("sqlite") else {}
+    engine = create_async_engine(DATABASE_URL, **engine_kwargs)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    print(f"{engine.dialect.name}, {LOOKUPS} поисков на замер")
+    print(f"{'строк':>8} {'до, мс':>10} {'после, мс':>10}")
+    total = 0
+    async with session_factory() as session:
+        for size in SIZES:
+            rows = [
+                {
+                    "email": f"User{i}@Example.com",
+                    "hashed_password": "hash",
+                    "first_name": "bench",
+                }
+                for i in range(total, size)
+            ]
+            for start in range(0, len(rows), 5_000):
+                await session.execute(insert(User), rows[start : start + 5_000])
+            await session.commit()
+            total = size
+            await session.execute(text("ANALYZE users"))
+
+            emails = [f"user{random.randrange(size)}@example.com" for _ in range(LOOKUPS)]
+
+            await session.execute(text("DROP INDEX ix_users_email_lower"))
+            before = await measure(session, User.get_db(session), emails)
+
+            await session.execute(
+                text("CREATE UNIQUE INDEX ix_users_email_lower ON users (lower(email))")
+            )
+            await session.execute(text("ANALYZE users"))
+            after = await measure(session, User.get_db(session), emails)
+            await session.commit()
+
+            print(f"{size:>8} {before:>10.3f} {after:>10.3f}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Микро-бенчмарк построителей ключа кэша.
+
+Сравнивает построители на основе `repr(kwargs)` + md5 с `make_key_builder`
+(явный список параметров, orjson, blake2b) на аргументах эндпоинта списка пользователей.
+
+Запуск (из корня репозитория):
+    PYTHONPATH=app python benchmarks/bench_key_builders.py
+"""
+
+import timeit
+
+from starlette.requests import Request
+
+from core.cache.key_builder import (
+    make_key_builder,
+    universal_list_key_builder,
+    user_key_builder,
+)
+from models.user import SQLAlchemyUserDatabase, User
+
+NUMBER = 100_000
+
+
+async def get_users_list(users_db, limit, cursor):
+    """Эндпоинт-заглушка: построителю ключа нужны только модуль и имя функции."""
+
+
+def main() -> None:
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/users",
+            "headers": [],
+            "query_string": b"limit=50&cursor=eyJpZCI6MTAwfQ",
+        }
+    )
+    kwargs = {
+        "users_db": SQLAlchemyUserDatabase(session=None, user_table=User),
+        "limit": 50,
+        "cursor": "eyJpZCI6MTAwfQ",
+    }
+    builders = {
+        "universal_list_key_builder (repr + md5)": universal_list_key_builder,
+        "user_key_builder (repr + md5)": user_key_builder,
+        'make_key_builder("limit", "cursor")': make_key_builder("limit", "cursor").bind(
+            get_users_list
+        ),
+    }
+
+    print(f"{NUMBER} ключей на построитель")
+    for name, builder in builders.items():
+        seconds = timeit.timeit(
+            lambda: builder(
+                get_users_list,
+                "fastapi-cache:users-list",
+                request=request,
+                response=None,
+                args=(),
+                kwargs=kwargs,
+            ),
+            number=NUMBER,
+        )
+        print(f"{name:<45} {seconds / NUMBER * 1e6:8.2f} мкс/ключ")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,13 @@ import pytest
 from typing import Any
 from httpx import AsyncClient
 from faker import Faker
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
+from core.redis_helper import redis_helper
+from models import User
 
 
 faker = Faker()
@@ -22,6 +27,12 @@ def prefix_users() -> str:
     return f"{settings.api.prefix}{settings.api.v1.prefix}{settings.api.v1.users}"
 
 
+@pytest.fixture(scope="module")
+def prefix_metrics() -> str:
+    """Префикс для metrics-роутеров."""
+    return f"{settings.api.prefix}{settings.api.v1.prefix}{settings.api.v1.metrics}"
+
+
 @pytest.fixture(scope="function")
 async def registered_user(
     client: AsyncClient,
@@ -62,3 +73,192 @@ async def logged_in_client(
     assert response.status_code == 204
     assert "fastapiusersauth" in response.cookies
     return client
+
+
+@pytest.fixture(scope="function")
+async def superuser_client(
+    client: AsyncClient,
+    registered_user: dict[str, Any],
+    prefix_auth: str,
+    test_session: AsyncSession,
+) -> AsyncClient:
+    """
+    Возвращает клиент с активной сессией суперпользователя.
+    """
+    await test_session.execute(
+        update(User)
+        .where(User.email == registered_user["email"])
+        .values(is_superuser=True)
+    )
+    await test_session.commit()
+
+    response = await client.post(
+        url=f"{prefix_auth}/login",
+        data={
+            "username": registered_user["email"],
+            "password": registered_user["password"],
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 204
+    return client
+
+
+class FakePipeline:
+    """Конвейер `FakeRedis`: команды выполняются при `execute()`."""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, tuple]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    def incr(self, key: str) -> "FakePipeline":
+        self.commands.append(("incr", (key,)))
+        return self
+
+    def ttl(self, key: str) -> "FakePipeline":
+        self.commands.append(("ttl", (key,)))
+        return self
+
+    def get(self, key: str) -> "FakePipeline":
+        self.commands.append(("get", (key,)))
+        return self
+
+    def smembers(self, key: str) -> "FakePipeline":
+        self.commands.append(("smembers", (key,)))
+        return self
+
+    def delete(self, *keys: str) -> "FakePipeline":
+        self.commands.append(("delete", keys))
+        return self
+
+    async def execute(self) -> list[Any]:
+        return [await getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class FakeRedis:
+    """
+    Минимальный асинхронный Redis в памяти для тестов кэша
+    (только команды, которые используют `core.cache` и кэш токенов).
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.expires: dict[str, int] = {}
+        self.published: list[tuple[str, bytes]] = []
+        self.available = True
+
+    def _check(self) -> None:
+        if not self.available:
+            raise RedisConnectionError("Redis is unavailable")
+
+    async def get(self, key: str) -> Any:
+        self._check()
+        return self.data.get(key)
+
+    async def mget(self, keys: list[str]) -> list[Any]:
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ex: int | None = None,
+        px: int | None = None,
+        nx: bool = False,
+    ) -> bool:
+        self._check()
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if ex or px:
+            self.expires[key] = ex or px // 1000
+        return True
+
+    async def ttl(self, key: str) -> int:
+        self._check()
+        if key not in self.data:
+            return -2
+        return self.expires.get(key, -1)
+
+    async def exists(self, *keys: str) -> int:
+        self._check()
+        return sum(key in self.data for key in keys)
+
+    async def delete(self, *keys: str) -> int:
+        self._check()
+        for key in keys:
+            self.expires.pop(key, None)
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key: str) -> int:
+        self._check()
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+    async def smembers(self, key: str) -> "set[bytes]":
+        self._check()
+        return set(self.data.get(key) or ())
+
+    async def sadd(self, key: str, *members: str) -> int:
+        self._check()
+        stored = self.data.setdefault(key, set())
+        added = {member.encode() for member in members} - stored
+        stored.update(added)
+        return len(added)
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        self._check()
+        if key not in self.data:
+            return False
+        self.expires[key] = seconds
+        return True
+
+    async def publish(self, channel: str, message: bytes) -> int:
+        self._check()
+        self.published.append((channel, message))
+        return 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def register_script(self, script: str):
+        """
+        Скрипты `SingleFlight` (снять блокировку, если значение совпадает)
+        и `TokenCache` (записать токен, если эпоха не изменилась).
+        """
+
+        async def release(keys: list[str], args: list[Any]) -> int:
+            self._check()
+            if self.data.get(keys[0]) != args[0]:
+                return 0
+            return await self.delete(keys[0])
+
+        async def set_token(keys: list[str], args: list[Any]) -> int:
+            self._check()
+            epoch_key, token_key, user_tokens_key = keys
+            epoch, entry, ttl, user_tokens_ttl = args
+            current = self.data.get(epoch_key) or 0
+            if str(current) != (epoch.decode() if isinstance(epoch, bytes) else str(epoch)):
+                return 0
+            await self.set(token_key, entry, ex=ttl)
+            await self.sadd(user_tokens_key, token_key)
+            await self.expire(user_tokens_key, user_tokens_ttl)
+            return 1
+
+        return set_token if "SADD" in script else release
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> FakeRedis:
+    """Подменяет клиент `redis_helper` на `FakeRedis`."""
+    redis = FakeRedis()
+    monkeypatch.setattr(redis_helper, "client", redis)
+    return redis
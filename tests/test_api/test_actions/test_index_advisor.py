@@ -0,0 +1,80 @@
+import pytest
+
+from pathlib import Path
+from unittest.mock import MagicMock
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from actions.index_advisor import (
+    IndexSuggestion,
+    advise_indexes,
+    collect_crud_filters,
+    render_operations,
+)
+from models import Base
+
+
+CRUD_USAGE = """
+manager = CrudManager(session, OutboxEmail)
+await manager.get_all_by_field("kind", "verification")
+await CrudManager(session, model_db=User).get_by_fields(first_name="Tom", email="tom@example.com")
+"""
+
+
+def test_collect_crud_filters(tmp_path: Path):
+    """
+    Поля фильтров CrudManager находятся в исходном коде.
+    """
+    source = tmp_path / "service.py"
+    source.write_text(CRUD_USAGE, encoding="utf-8")
+
+    assert collect_crud_filters([source]) == {
+        ("OutboxEmail", "kind"),
+        ("User", "first_name"),
+        ("User", "email"),
+    }
+
+
+@pytest.mark.anyio
+async def test_advise_indexes(tmp_path: Path):
+    """
+    Внешние ключи и поля фильтров без индекса попадают в рекомендации,
+    проиндексированные (email — уникальный индекс) — нет.
+    """
+    (tmp_path / "service.py").write_text(CRUD_USAGE, encoding="utf-8")
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text("DROP INDEX ix_access_tokens_user_id"))
+
+        suggestions = await advise_indexes(engine, source_dir=tmp_path)
+    finally:
+        await engine.dispose()
+
+    assert {(s.table, s.column) for s in suggestions} == {
+        ("access_tokens", "user_id"),
+        ("outbox_emails", "kind"),
+        ("users", "first_name"),
+    }
+
+
+def test_revision_creates_indexes_concurrently():
+    """
+    Ревизия создаёт и удаляет индексы с CONCURRENTLY внутри `autocommit_block()`,
+    как ревизии проекта.
+    """
+    suggestions = [
+        IndexSuggestion("access_tokens", "user_id", "внешний ключ на users"),
+        IndexSuggestion("users", "first_name", "фильтр CrudManager"),
+    ]
+    for code in render_operations(suggestions):
+        op = MagicMock()
+        namespace = {"op": op}
+        exec(compile("def run():\n    " + code, "<revision>", "exec"), namespace)
+        namespace["run"]()
+
+        op.get_context.return_value.autocommit_block.assert_called_once()
+        calls = op.create_index.call_args_list or op.drop_index.call_args_list
+        assert len(calls) == 2
+        assert all(call.kwargs["postgresql_concurrently"] is True for call in calls)
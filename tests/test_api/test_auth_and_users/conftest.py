@@ -0,0 +1,45 @@
+import pytest
+
+from pydantic import SecretStr
+
+from core.auth.revocation import TokenRevocation
+from core.auth.token_cache import TokenCache
+from core.config import settings
+
+
+@pytest.fixture(scope="function")
+def token_revocation(monkeypatch) -> TokenRevocation:
+    """
+    Отдельные список отозванных токенов и кэш токенов на время теста:
+    глобальные `token_revocation` и `token_cache` не изменяются.
+    """
+    revocation = TokenRevocation(prefix="test:auth", use_redis=False)
+    cache = TokenCache(use_redis=False)
+    for module in ("core.auth.strategy", "core.auth.user_manager"):
+        monkeypatch.setattr(f"{module}.token_revocation", revocation)
+        monkeypatch.setattr(f"{module}.token_cache", cache)
+    return revocation
+
+
+@pytest.fixture(scope="function")
+def redis_token_cache(monkeypatch, fake_redis) -> TokenCache:
+    """
+    Кэш токенов с уровнем Redis (`FakeRedis`) и активной (условно) подпиской
+    на инвалидации, подменённый на время теста.
+    """
+    cache = TokenCache(prefix="test:auth")
+    cache.invalidator._subscribed = True
+    for module in ("core.auth.strategy", "core.auth.user_manager", "core.auth.tasks"):
+        monkeypatch.setattr(f"{module}.token_cache", cache)
+    return cache
+
+
+@pytest.fixture(scope="function")
+def signed_strategy_settings(monkeypatch, token_revocation: TokenRevocation) -> None:
+    """Включает стратегию подписанных токенов (`access_token.strategy = "signed"`)."""
+    monkeypatch.setattr(settings.access_token, "strategy", "signed")
+    monkeypatch.setattr(
+        settings.access_token,
+        "signing_secret",
+        SecretStr("signing-secret-for-tests-0123456789abcdef"),
+    )
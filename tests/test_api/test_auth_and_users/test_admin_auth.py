@@ -0,0 +1,71 @@
+import pytest
+
+from typing import Any
+from urllib.parse import urlencode
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from admin.admin_auth import AdminAuth
+from core import db_helper
+from core.auth.backend import authentication_backend
+from core.auth.password_helper import password_helper
+from core.auth.strategy import get_signed_token_strategy
+from models import User
+
+
+def make_request(session: dict[str, Any], body: bytes = b"") -> Request:
+    """Запрос админки с сессией и телом формы."""
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/admin/login",
+        "headers": [(b"content-type", b"application/x-www-form-urlencoded")],
+        "query_string": b"",
+        "session": session,
+    }
+    return Request(scope, receive)
+
+
+@pytest.fixture(scope="function")
+async def superuser(test_session: AsyncSession, fake_user_data: dict[str, Any]) -> User:
+    user = User(
+        **{
+            **fake_user_data,
+            "hashed_password": password_helper.hash("admin-password"),
+            "is_superuser": True,
+            "is_verified": True,
+        }
+    )
+    test_session.add(user)
+    await test_session.commit()
+    return user
+
+
+@pytest.mark.anyio
+async def test_admin_login_with_signed_strategy(
+    monkeypatch,
+    test_engine,
+    signed_strategy_settings,
+    superuser: User,
+):
+    """
+    Вход в админку выдаёт и проверяет токен стратегией настроенного бэкенда
+    (подписанные токены), а не стратегией БД.
+    """
+    monkeypatch.setattr(authentication_backend, "get_strategy", get_signed_token_strategy)
+    monkeypatch.setattr(db_helper, "session_factory", async_sessionmaker(bind=test_engine))
+    admin_auth = AdminAuth(secret_key="admin-secret")
+    session: dict[str, Any] = {}
+
+    body = urlencode({"username": superuser.email, "password": "admin-password"}).encode()
+    assert await admin_auth.login(make_request(session, body)) is True
+
+    token = session["fastapiusersauth"]
+    assert get_signed_token_strategy()._decode(token)["sub"] == str(superuser.id)
+
+    assert await admin_auth.authenticate(make_request(session)) is True
+    assert session["user_id"] == str(superuser.id)
@@ -0,0 +1,81 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.chunked_delete import ChunkedDeleter
+from models import AccessToken, User
+
+
+@pytest.fixture(scope="function")
+async def expired_tokens(test_session: AsyncSession, test_user: User):
+    """
+    25 просроченных и 3 действующих токена тестового пользователя.
+    """
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    for i in range(25):
+        test_session.add(
+            AccessToken(token=f"expired-{test_user.id}-{i}", user=test_user, created_at=old)
+        )
+    for i in range(3):
+        test_session.add(AccessToken(token=f"fresh-{test_user.id}-{i}", user=test_user))
+    await test_session.commit()
+    return datetime.now(timezone.utc) - timedelta(days=1)
+
+
+async def count_tokens(session: AsyncSession, user: User) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(AccessToken).where(AccessToken.user_id == user.id)
+    )
+
+
+@pytest.mark.anyio
+async def test_chunked_delete_in_batches(
+    test_engine,
+    test_session: AsyncSession,
+    test_user: User,
+    expired_tokens: datetime,
+):
+    """
+    Просроченные токены удаляются пачками, действующие остаются.
+    """
+    deleter = ChunkedDeleter(async_sessionmaker(bind=test_engine), batch_size=10, pause=0)
+
+    report = await deleter.delete(
+        AccessToken,
+        AccessToken.user_id == test_user.id,
+        AccessToken.created_at < expired_tokens,
+    )
+
+    assert report.deleted == 25
+    assert report.batches == 3
+    assert report.completed
+    assert report.as_dict()["rows_per_second"] > 0
+    assert await count_tokens(test_session, test_user) == 3
+
+
+@pytest.mark.anyio
+async def test_chunked_delete_time_budget(
+    test_engine,
+    test_session: AsyncSession,
+    test_user: User,
+    expired_tokens: datetime,
+):
+    """
+    При исчерпании бюджета времени удаление прерывается после текущей пачки.
+    """
+    deleter = ChunkedDeleter(
+        async_sessionmaker(bind=test_engine), batch_size=10, pause=0, time_budget=0
+    )
+
+    report = await deleter.delete(
+        AccessToken,
+        AccessToken.user_id == test_user.id,
+        AccessToken.created_at < expired_tokens,
+    )
+
+    assert report.deleted == 10
+    assert report.batches == 1
+    assert not report.completed
+    assert await count_tokens(test_session, test_user) == 18
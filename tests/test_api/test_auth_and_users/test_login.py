@@ -2,6 +2,10 @@ import pytest
 
 from typing import Any
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import User
 
 
 @pytest.mark.anyio
@@ -25,6 +29,54 @@ async def test_login_success(
     assert "fastapiusersauth" in response.cookies
 
 
+@pytest.mark.anyio
+async def test_login_email_case_insensitive(
+    client: AsyncClient,
+    registered_user: dict[str, Any],
+    prefix_auth: str,
+):
+    """
+    Email при входе сравнивается без учёта регистра.
+    """
+    response = await client.post(
+        url=f"{prefix_auth}/login",
+        data={
+            "username": registered_user["email"].upper(),
+            "password": registered_user["password"],
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 204
+
+
+@pytest.mark.anyio
+async def test_get_by_email_uses_lower_email_index(
+    test_engine,
+    test_session: AsyncSession,
+    test_user: User,
+):
+    """
+    Запрос `get_by_email` fastapi-users (`lower(email) = lower(:email)`)
+    выполняется по индексу `ix_users_email_lower`.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        user = await User.get_db(test_session).get_by_email(test_user.email.upper())
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", capture)
+    assert user.id == test_user.id
+
+    (statement, parameters) = statements[-1]
+    async with test_engine.connect() as conn:
+        plan = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+    assert "ix_users_email_lower" in " ".join(row[-1] for row in plan)
+
+
 @pytest.mark.anyio
 async def test_login_invalid_credentials(
     client: AsyncClient,
@@ -15,3 +15,27 @@ async def test_logout_success(
 
     assert response.status_code == 204
     assert "fastapiusersauth" not in response.cookies
+
+
+@pytest.mark.anyio
+async def test_logout_revokes_cached_token(
+    logged_in_client: AsyncClient,
+    prefix_auth: str,
+    prefix_users: str,
+):
+    """
+    После выхода токен отклоняется, даже если он уже был в кэше токенов.
+    """
+    token = logged_in_client.cookies["fastapiusersauth"]
+
+    # Первый запрос кладёт токен в кэш, второй обслуживается из кэша
+    for _ in range(2):
+        response = await logged_in_client.get(url=f"{prefix_users}/me")
+        assert response.status_code == 200
+
+    response = await logged_in_client.post(url=f"{prefix_auth}/logout")
+    assert response.status_code == 204
+
+    logged_in_client.cookies.set("fastapiusersauth", token)
+    response = await logged_in_client.get(url=f"{prefix_users}/me")
+    assert response.status_code == 401
@@ -0,0 +1,224 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import db_helper
+from core.auth.tasks import cleanup_outbox_emails
+from core.config import BASE_DIR, settings
+from models import OutboxEmail, User
+from repositories import unit_of_work
+from services.mailing import (
+    MailRenderer,
+    OutboxWorker,
+    PreparedEmail,
+    enqueue_email,
+    mail_renderer,
+)
+from services.mailing.send_email_confirmed import render_email_confirmed
+from services.mailing.send_reset_password import render_reset_password
+from services.mailing.send_verification_email import render_verification_email
+
+
+@pytest.fixture(scope="function")
+async def outbox_session_factory(test_engine):
+    """
+    Фабрика сессий воркера. Очищает очередь до и после теста.
+    """
+    session_factory = async_sessionmaker(bind=test_engine, expire_on_commit=False)
+    async with session_factory() as session:
+        await session.execute(delete(OutboxEmail))
+        await session.commit()
+    yield session_factory
+    async with session_factory() as session:
+        await session.execute(delete(OutboxEmail))
+        await session.commit()
+
+
+def make_worker(session_factory, send_many: AsyncMock, **kwargs) -> OutboxWorker:
+    pool = MagicMock()
+    pool.send_many = send_many
+    return OutboxWorker(
+        session_factory=session_factory,
+        pool=pool,
+        renderer=mail_renderer,
+        **kwargs,
+    )
+
+
+@pytest.mark.anyio
+async def test_outbox_worker_sends_pending_emails(
+    outbox_session_factory,
+    test_session: AsyncSession,
+    test_user: User,
+):
+    """
+    Воркер отправляет письма из очереди и помечает их отправленными.
+    """
+    for _ in range(3):
+        await enqueue_email(
+            test_session,
+            "verification",
+            test_user,
+            verification_link="http://test/verify-email?token=abc",
+        )
+    send_many = AsyncMock(side_effect=lambda messages: [None] * len(messages))
+    worker = make_worker(outbox_session_factory, send_many, concurrency=2)
+
+    assert await worker.process_batch() == 3
+    assert await worker.process_batch() == 0
+    assert send_many.await_count == 2  # пачка разделена между двумя SMTP-сессиями
+
+    async with outbox_session_factory() as session:
+        jobs = (await session.scalars(select(OutboxEmail))).all()
+    assert {job.status for job in jobs} == {"sent"}
+    # Ссылки с токенами не хранятся после отправки
+    assert [job.payload for job in jobs] == [{"user_id": test_user.id}] * 3
+
+
+@pytest.mark.anyio
+async def test_outbox_worker_retries_and_gives_up(
+    outbox_session_factory,
+    test_session: AsyncSession,
+    test_user: User,
+):
+    """
+    Неудачная отправка откладывается, после `max_attempts` попыток письмо помечается dead.
+    """
+    job = await enqueue_email(
+        test_session,
+        "reset_password",
+        test_user,
+        reset_password_link="http://test/reset-password?token=abc",
+    )
+    send_many = AsyncMock(side_effect=lambda messages: [OSError()] * len(messages))
+    worker = make_worker(outbox_session_factory, send_many, max_attempts=2, backoff_base=0)
+
+    assert await worker.process_batch() == 1
+    async with outbox_session_factory() as session:
+        retried = await session.get(OutboxEmail, job.id)
+    assert retried.status == "pending"
+    assert retried.attempts == 1
+    assert "OSError" in retried.last_error
+
+    assert await worker.process_batch() == 1
+    async with outbox_session_factory() as session:
+        dead = await session.get(OutboxEmail, job.id)
+    assert dead.status == "dead"
+    assert dead.attempts == 2
+    assert dead.payload == {"user_id": test_user.id}
+
+
+@pytest.mark.anyio
+async def test_outbox_worker_unknown_user_is_dead(
+    outbox_session_factory,
+):
+    """
+    Письмо для несуществующего пользователя не отправляется и помечается dead.
+    """
+    async with outbox_session_factory() as session:
+        session.add(OutboxEmail(kind="email_confirmed", payload={"user_id": 10**9}))
+        await session.commit()
+    send_many = AsyncMock(return_value=[])
+    worker = make_worker(outbox_session_factory, send_many)
+
+    assert await worker.process_batch() == 1
+    send_many.assert_not_awaited()
+    async with outbox_session_factory() as session:
+        job = (await session.scalars(select(OutboxEmail))).first()
+    assert job.status == "dead"
+
+
+@pytest.mark.anyio
+async def test_enqueue_email_joins_unit_of_work(
+    outbox_session_factory,
+    test_session: AsyncSession,
+    test_user: User,
+):
+    """
+    Внутри `unit_of_work` задание фиксируется вместе с остальными изменениями
+    и откатывается вместе с ними.
+    """
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(test_session):
+            await enqueue_email(test_session, "email_confirmed", test_user)
+            raise RuntimeError("rollback")
+
+    async with outbox_session_factory() as session:
+        assert (await session.scalars(select(OutboxEmail))).all() == []
+
+
+@pytest.mark.anyio
+async def test_cleanup_outbox_emails(
+    outbox_session_factory,
+    monkeypatch,
+):
+    """
+    Отправленные и dead задания удаляются после срока хранения, ожидающие остаются.
+    """
+    monkeypatch.setattr(db_helper, "session_factory", outbox_session_factory)
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    async with outbox_session_factory() as session:
+        for status in ("sent", "dead", "pending"):
+            session.add(
+                OutboxEmail(
+                    kind="email_confirmed",
+                    payload={"user_id": 1},
+                    status=status,
+                    next_attempt_at=old,
+                )
+            )
+        session.add(OutboxEmail(kind="email_confirmed", payload={"user_id": 1}, status="sent"))
+        await session.commit()
+
+    report = await cleanup_outbox_emails()
+
+    assert report["deleted"] == 2
+    async with outbox_session_factory() as session:
+        jobs = (await session.scalars(select(OutboxEmail))).all()
+    assert sorted(job.status for job in jobs) == ["pending", "sent"]
+
+
+@pytest.mark.anyio
+async def test_mail_renderer_prepares_batch_in_threads(test_user: User):
+    """
+    Пачка писем рендерится и сериализуется в пуле потоков; ошибка одного письма не мешает остальным.
+    """
+    renderer = MailRenderer(directory=BASE_DIR / "templates", parallel_threshold=2)
+    assert renderer.precompile() >= 3
+
+    def broken(user: User) -> dict[str, str]:
+        raise LookupError("broken")
+
+    try:
+        emails = await renderer.prepare_many(
+            [
+                (render_email_confirmed, {"user": test_user}),
+                (broken, {"user": test_user}),
+                (render_email_confirmed, {"user": test_user}),
+            ]
+        )
+    finally:
+        renderer.close()
+
+    assert isinstance(emails[1], LookupError)
+    for email in (emails[0], emails[2]):
+        assert isinstance(email, PreparedEmail)
+        assert email.recipients == [test_user.email]
+        assert b"\r\n\r\n" in email.data
+
+
+@pytest.mark.anyio
+async def test_plain_content_with_braces_in_site_name(monkeypatch, test_user: User):
+    """Фигурные скобки в названии сайта не ломают текстовую часть писем."""
+    monkeypatch.setattr(settings.site, "site_name", "{Shop} }{")
+    emails = [
+        render_email_confirmed(test_user),
+        render_reset_password(test_user, reset_password_link="https://example.com/reset"),
+        render_verification_email(test_user, verification_link="https://example.com/verify"),
+    ]
+    for email in emails:
+        assert "© 2025 {Shop} }{" in email["plain_content"]
+        assert test_user.first_name in email["plain_content"]
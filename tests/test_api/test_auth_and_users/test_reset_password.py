@@ -3,17 +3,52 @@ import pytest
 from typing import Any
 from httpx import AsyncClient
 from unittest.mock import AsyncMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models import OutboxEmail
 
 
 @pytest.mark.anyio
 async def test_forgot_password_success(
+    client: AsyncClient,
+    test_session: AsyncSession,
+    prefix_auth: str,
+    registered_user: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    Письмо для сброса пароля ставится в очередь исходящих писем.
+    """
+    monkeypatch.setattr(settings.mail_outbox, "delivery", "outbox")
+    response = await client.post(
+        url=f"{prefix_auth}/forgot-password",
+        json={"email": registered_user["email"]},
+    )
+    assert response.status_code == 202
+
+    job = await test_session.scalar(
+        select(OutboxEmail)
+        .where(OutboxEmail.kind == "reset_password")
+        .order_by(OutboxEmail.id.desc())
+    )
+    assert job is not None
+    assert job.status == "pending"
+    assert "token=" in job.payload["reset_password_link"]
+
+
+@pytest.mark.anyio
+async def test_forgot_password_background_delivery(
     client: AsyncClient,
     prefix_auth: str,
     registered_user: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
 ):
     """
-    Отправка письма на почту для сброса пароля.
+    Отправка письма на почту для сброса пароля фоновой задачей.
     """
+    monkeypatch.setattr(settings.mail_outbox, "delivery", "background")
     with patch(
         target="services.mailing.send_reset_password.send_email",
         new_callable=AsyncMock,
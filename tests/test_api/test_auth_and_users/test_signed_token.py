@@ -0,0 +1,199 @@
+import time
+
+import orjson
+import pytest
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.revocation import TokenRevocation
+from core.auth.strategy import SignedTokenStrategy
+from core.auth.user_manager import UserManager
+from core.cache import BloomFilter
+from core.redis_helper import redis_helper
+from models import User
+from schemas.user import UserUpdate
+
+
+@pytest.fixture(scope="function")
+def user_manager(test_session: AsyncSession) -> UserManager:
+    return UserManager(User.get_db(test_session))
+
+
+@pytest.fixture(scope="function")
+def strategy(token_revocation: TokenRevocation) -> SignedTokenStrategy:
+    return SignedTokenStrategy(
+        secret="signing-secret-for-tests-0123456789abcdef", lifetime_seconds=3600
+    )
+
+
+@pytest.mark.anyio
+async def test_signed_token_roundtrip(
+    strategy: SignedTokenStrategy,
+    user_manager: UserManager,
+    test_user: User,
+):
+    """
+    Подписанный токен принимается; изменённый или чужой подписью — нет.
+    """
+    token = await strategy.write_token(test_user)
+
+    user = await strategy.read_token(token, user_manager)
+    assert user is not None and user.id == test_user.id
+
+    header, payload, signature = token.split(".")
+    assert await strategy.read_token(f"{header}.{payload}.{signature[::-1]}", user_manager) is None
+    other = SignedTokenStrategy(
+        secret="other-secret-for-tests-0123456789abcdef", lifetime_seconds=3600
+    )
+    assert await other.read_token(token, user_manager) is None
+
+
+@pytest.mark.anyio
+async def test_signed_token_logout(
+    strategy: SignedTokenStrategy,
+    user_manager: UserManager,
+    test_user: User,
+):
+    """
+    После выхода токен отозван, другие токены пользователя продолжают работать.
+    """
+    token = await strategy.write_token(test_user)
+    other_token = await strategy.write_token(test_user)
+
+    await strategy.destroy_token(token, test_user)
+
+    assert await strategy.read_token(token, user_manager) is None
+    assert await strategy.read_token(other_token, user_manager) is not None
+
+
+@pytest.mark.anyio
+async def test_revoke_all_user_tokens(
+    strategy: SignedTokenStrategy,
+    user_manager: UserManager,
+    test_user: User,
+):
+    """
+    Увеличение поколения отзывает все выданные ранее токены пользователя.
+    """
+    token = await strategy.write_token(test_user)
+    assert await strategy.read_token(token, user_manager) is not None
+
+    user = await user_manager.revoke_tokens(test_user)
+
+    assert await strategy.read_token(token, user_manager) is None
+    new_token = await strategy.write_token(user)
+    assert await strategy.read_token(new_token, user_manager) is not None
+
+
+@pytest.mark.anyio
+async def test_deactivation_revokes_tokens(
+    signed_strategy_settings,
+    strategy: SignedTokenStrategy,
+    user_manager: UserManager,
+    test_user: User,
+):
+    """
+    Деактивация пользователя отзывает его подписанные токены.
+    """
+    token = await strategy.write_token(test_user)
+    assert await strategy.read_token(token, user_manager) is not None
+
+    await user_manager.update(
+        UserUpdate(first_name=test_user.first_name, is_active=False), test_user, safe=False
+    )
+
+    assert await strategy.read_token(token, user_manager) is None
+
+
+@pytest.mark.anyio
+async def test_delete_revokes_tokens(
+    signed_strategy_settings,
+    strategy: SignedTokenStrategy,
+    token_revocation: TokenRevocation,
+    user_manager: UserManager,
+    test_user: User,
+):
+    """
+    Удаление пользователя отзывает его подписанные токены во всех воркерах.
+    """
+    token = await strategy.write_token(test_user)
+    payload = strategy._decode(token)
+
+    await user_manager.delete(test_user)
+
+    assert await token_revocation.is_revoked(payload["jti"], test_user.id, payload["gen"])
+    assert await strategy.read_token(token, user_manager) is None
+
+
+def test_bloom_filter():
+    """
+    Фильтр Блума не даёт ложноотрицательных ответов, доля ложноположительных — около заданной.
+    """
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"revoked-{i}")
+
+    assert all(f"revoked-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"valid-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+    bloom.clear()
+    assert "revoked-0" not in bloom
+
+
+class LoadPipeline:
+    """
+    Конвейер `TokenRevocation.load`: пока ответ Redis в пути,
+    воркер получает сообщения об отзыве.
+    """
+
+    def __init__(self, revocation: TokenRevocation, rows: list, messages: list[bytes]) -> None:
+        self.revocation = revocation
+        self.rows = rows
+        self.messages = messages
+
+    async def __aenter__(self) -> "LoadPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    def __getattr__(self, name: str):
+        return lambda *args, **kwargs: self
+
+    async def execute(self) -> list:
+        for message in self.messages:
+            self.revocation._handle(message)
+        return [0, 0, *self.rows]
+
+
+@pytest.mark.anyio
+async def test_revocations_during_load_not_lost(monkeypatch):
+    """
+    Отзывы, пришедшие по подписке во время перестроения состояния (`load`),
+    действуют и после подмены фильтра и поколений.
+    """
+    revocation = TokenRevocation(prefix="test:auth")
+    exp = time.time() + 3600
+    rows = [[(b"stored-jti", exp)], [(b"1:2", exp)]]
+    messages = [
+        orjson.dumps({"jti": "during-load-jti", "exp": exp}),
+        orjson.dumps({"user": "7", "gen": 3, "exp": exp}),
+    ]
+
+    class Client:
+        def pipeline(self, transaction: bool = True) -> LoadPipeline:
+            return LoadPipeline(revocation, rows, messages)
+
+        async def zscore(self, key: str, member: str):
+            return exp if member in ("stored-jti", "during-load-jti") else None
+
+    monkeypatch.setattr(redis_helper, "client", Client())
+    await revocation.load()
+
+    assert await revocation.is_revoked("stored-jti", 1, 5)
+    assert await revocation.is_revoked("during-load-jti", 1, 5)
+    assert await revocation.is_revoked("valid-jti", 1, 1)
+    assert await revocation.is_revoked("valid-jti", 7, 2)
+    assert not await revocation.is_revoked("valid-jti", 7, 3)
+    assert not revocation._loading
@@ -0,0 +1,121 @@
+import asyncio
+
+import aiosmtplib
+import pytest
+
+from services.mailing import PreparedEmail
+from services.mailing.smtp_pool import SMTPPool
+
+
+class FakeSMTP:
+    """Соединение SMTP без сети: записывает отправленные письма и команды."""
+
+    def __init__(self) -> None:
+        self.is_connected = True
+        self.sent: list[bytes] = []
+        self.noop_error: BaseException | None = None
+        self.send_error: BaseException | None = None
+        self.quit_called = False
+
+    async def noop(self) -> None:
+        if self.noop_error is not None:
+            raise self.noop_error
+
+    async def sendmail(self, sender, recipients, data) -> None:
+        if self.send_error is not None:
+            raise self.send_error
+        self.sent.append(data)
+
+    async def quit(self) -> None:
+        self.quit_called = True
+        self.is_connected = False
+
+    def close(self) -> None:
+        self.is_connected = False
+
+
+@pytest.fixture
+async def pool(monkeypatch) -> SMTPPool:
+    """Открытый пул, создающий соединения `FakeSMTP`."""
+    pool = SMTPPool(size=2, health_check_interval=30)
+    pool.connections = []
+
+    async def connect() -> FakeSMTP:
+        smtp = FakeSMTP()
+        pool.connections.append(smtp)
+        return smtp
+
+    monkeypatch.setattr(pool, "_connect", connect)
+    await pool.open()
+    yield pool
+    await pool.close()
+
+
+EMAIL = PreparedEmail(sender="from@example.com", recipients=["to@example.com"], data=b"mail")
+
+
+@pytest.mark.anyio
+async def test_connection_reused(pool: SMTPPool):
+    """После успешной отправки соединение возвращается в пул и используется снова."""
+    await pool.send(EMAIL)
+    await pool.send(EMAIL)
+    assert len(pool.connections) == 1
+    assert pool.connections[0].sent == [b"mail", b"mail"]
+
+
+@pytest.mark.anyio
+async def test_rejected_message_keeps_connection(pool: SMTPPool):
+    """Отказ сервера по письму (ответ 5xx) не закрывает соединение."""
+    async with pool.connection() as smtp:
+        pass
+    smtp.send_error = aiosmtplib.SMTPRecipientRefused(550, "No such user", "to@example.com")
+
+    with pytest.raises(aiosmtplib.SMTPRecipientRefused):
+        await pool.send(EMAIL)
+    assert smtp.is_connected
+    assert [connection for connection, _ in pool._idle] == [smtp]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "error",
+    [
+        asyncio.CancelledError(),
+        TimeoutError(),
+        RuntimeError("unexpected"),
+        aiosmtplib.SMTPServerDisconnected("gone"),
+        aiosmtplib.SMTPResponseException(421, "Service not available"),
+    ],
+)
+async def test_connection_closed_after_other_errors(pool: SMTPPool, error: BaseException):
+    """После отмены, таймаута, обрыва или ответа 421 соединение закрывается и не возвращается в пул."""
+    with pytest.raises(type(error)):
+        async with pool.connection() as smtp:
+            raise error
+    assert not smtp.is_connected
+    assert not pool._idle
+
+    async with pool.connection() as fresh:
+        assert fresh is not smtp
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "error",
+    [
+        aiosmtplib.SMTPResponseException(421, "Service not available"),
+        aiosmtplib.SMTPResponseException(500, "Command unrecognized"),
+        aiosmtplib.SMTPServerDisconnected("gone"),
+    ],
+)
+async def test_failed_health_check_replaces_connection(pool: SMTPPool, error: BaseException):
+    """Соединение, не прошедшее NOOP (обрыв или ответ 4xx/5xx), заменяется новым."""
+    pool.health_check_interval = 0
+    async with pool.connection() as stale:
+        pass
+    stale.noop_error = error
+
+    async with pool.connection() as smtp:
+        assert smtp is not stale
+    assert not stale.is_connected
+    assert [connection for connection, _ in pool._idle] == [smtp]
@@ -0,0 +1,103 @@
+import orjson
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import db_helper
+from core.auth.tasks import cleanup_unverified_users
+from core.auth.token_cache import TokenCache
+from models import User
+
+TOKEN = "raw-access-token"
+
+
+def deliver(fake_redis, cache: TokenCache) -> None:
+    """Доставляет воркеру `cache` все опубликованные инвалидации кэша токенов."""
+    for channel, message in fake_redis.published:
+        if channel == cache.invalidator.channel:
+            cache.invalidator._handle(message)
+
+
+@pytest.mark.anyio
+async def test_logout_evicts_token_on_other_workers(
+    fake_redis,
+    redis_token_cache: TokenCache,
+    test_user: User,
+):
+    """
+    Выход на одном воркере удаляет токен из памяти остальных воркеров,
+    а токен в открытом виде не попадает в канал инвалидаций.
+    """
+    other_worker = TokenCache(prefix="test:auth")
+    other_worker.invalidator._subscribed = True
+    _, version = await redis_token_cache.get(TOKEN)
+    await redis_token_cache.set(TOKEN, test_user, version=version)
+    user, _ = await other_worker.get(TOKEN)
+    assert user.id == test_user.id
+    assert other_worker.local.get(other_worker._token_key(TOKEN)) is not None
+
+    await redis_token_cache.delete(TOKEN)
+    deliver(fake_redis, other_worker)
+
+    assert other_worker.local.get(other_worker._token_key(TOKEN)) is None
+    assert (await other_worker.get(TOKEN))[0] is None
+    assert all(TOKEN.encode() not in message for _, message in fake_redis.published)
+    assert orjson.loads(fake_redis.published[-1][1])["keys"] == [
+        redis_token_cache._token_key(TOKEN)
+    ]
+
+
+@pytest.mark.anyio
+async def test_miss_started_before_invalidation_not_cached(
+    redis_token_cache: TokenCache,
+    test_user: User,
+):
+    """
+    Пользователь, прочитанный из БД до выхода или изменения пользователя,
+    не возвращается в кэш ни в памяти воркера, ни в Redis.
+    """
+    _, version = await redis_token_cache.get(TOKEN)
+    # Пока промах читает БД, токен удаляют (выход) на другом воркере
+    await TokenCache(prefix="test:auth").delete(TOKEN)
+    await redis_token_cache.set(TOKEN, test_user, version=version)
+
+    assert redis_token_cache.local.get(redis_token_cache._token_key(TOKEN)) is None
+    redis_token_cache.invalidator._subscribed = False
+    assert (await redis_token_cache.get(TOKEN))[0] is None
+
+    _, version = await redis_token_cache.get(TOKEN)
+    await redis_token_cache.invalidate_user(test_user.id)
+    await redis_token_cache.set(TOKEN, test_user, version=version)
+    assert (await redis_token_cache.get(TOKEN))[0] is None
+
+
+@pytest.mark.anyio
+async def test_cleanup_invalidates_deleted_users(
+    monkeypatch,
+    fake_redis,
+    test_engine,
+    test_session: AsyncSession,
+    redis_token_cache: TokenCache,
+    test_user: User,
+):
+    """Токены неподтверждённых пользователей, удалённых фоновой задачей, удаляются из кэша."""
+    monkeypatch.setattr(db_helper, "session_factory", async_sessionmaker(bind=test_engine))
+    await test_session.execute(
+        update(User)
+        .where(User.id == test_user.id)
+        .values(created_at=datetime.now(timezone.utc) - timedelta(days=30))
+    )
+    await test_session.commit()
+    _, version = await redis_token_cache.get(TOKEN)
+    await redis_token_cache.set(TOKEN, test_user, version=version)
+
+    report = await cleanup_unverified_users()
+
+    assert report["deleted"] == 1
+    assert redis_token_cache.local.get(redis_token_cache._token_key(TOKEN)) is None
+    assert redis_token_cache._token_key(TOKEN) not in fake_redis.data
+    assert orjson.loads(fake_redis.published[-1][1])["keys"] == [
+        redis_token_cache._token_key(TOKEN)
+    ]
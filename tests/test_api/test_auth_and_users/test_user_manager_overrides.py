@@ -0,0 +1,88 @@
+import hashlib
+import inspect
+import threading
+
+import pytest
+
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager
+from fastapi_users.password import PasswordHelper
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.user_manager import UserManager
+from models import User
+from schemas.user import UserCreate
+
+# Методы BaseUserManager, код которых повторяет UserManager (проверка пароля в пуле).
+# При обновлении fastapi-users сверьте UserManager с новым кодом и обновите хеши.
+MIRRORED_METHODS = {
+    "authenticate": "e453ea340730cf50c47dfa131f0708706fcaaf1d196c5dcb93c07dc023903188",
+    "reset_password": "f0c5df8b888017290be39b6cb3ea30567d28392e573a069875972729af73cb3e",
+}
+
+
+def test_mirrored_methods_match_fastapi_users():
+    """Код повторённых методов `BaseUserManager` не изменился с fastapi-users 15."""
+    digests = {
+        name: hashlib.sha256(inspect.getsource(getattr(BaseUserManager, name)).encode()).hexdigest()
+        for name in MIRRORED_METHODS
+    }
+    assert digests == MIRRORED_METHODS
+
+
+@pytest.fixture
+def hashing_threads(monkeypatch) -> list[str]:
+    """Имена потоков, в которых хешировались и проверялись пароли."""
+    threads: list[str] = []
+    hash_ = PasswordHelper.hash
+    verify_and_update = PasswordHelper.verify_and_update
+
+    def recording_hash(self, password):
+        threads.append(threading.current_thread().name)
+        return hash_(self, password)
+
+    def recording_verify_and_update(self, plain_password, hashed_password):
+        threads.append(threading.current_thread().name)
+        return verify_and_update(self, plain_password, hashed_password)
+
+    monkeypatch.setattr(PasswordHelper, "hash", recording_hash)
+    monkeypatch.setattr(PasswordHelper, "verify_and_update", recording_verify_and_update)
+    return threads
+
+
+@pytest.mark.anyio
+async def test_passwords_hashed_outside_event_loop(
+    test_session: AsyncSession,
+    hashing_threads: list[str],
+):
+    """
+    Регистрация, вход, сброс и смена пароля хешируют и проверяют пароли в пуле,
+    а не в потоке цикла событий.
+    """
+    tokens: list[str] = []
+
+    class Manager(UserManager):
+        """Менеджер без писем (хукам нужен запрос)."""
+
+        async def on_after_register(self, user, request=None): ...
+
+        async def on_after_forgot_password(self, user, token, request=None):
+            tokens.append(token)
+
+        async def on_after_reset_password(self, user, request=None): ...
+
+    manager = Manager(User.get_db(test_session))
+
+    user = await manager.create(
+        UserCreate(email="prehashed@example.com", password="Secret123!", first_name="Иван")
+    )
+    credentials = OAuth2PasswordRequestForm(username=user.email, password="Secret123!")
+    assert await manager.authenticate(credentials) == user
+
+    await manager.forgot_password(user)
+    user = await manager.reset_password(tokens[0], "NewSecret123!")
+    credentials = OAuth2PasswordRequestForm(username=user.email, password="NewSecret123!")
+    assert await manager.authenticate(credentials) == user
+
+    assert len(hashing_threads) == 6
+    assert threading.main_thread().name not in hashing_threads
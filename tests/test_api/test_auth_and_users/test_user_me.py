@@ -3,6 +3,8 @@ import pytest
 from typing import Any
 from httpx import AsyncClient
 
+from core.auth.token_cache import TokenCache
+
 
 @pytest.mark.anyio
 async def test_get_current_user_profile(
@@ -35,6 +37,10 @@ async def test_update_current_user_profile(
     """
     new_first_name = fake_user_data["first_name"]
 
+    # Токен попадает в кэш, PATCH выполняется для пользователя из кэша
+    response = await logged_in_client.get(url=f"{prefix_users}/me")
+    assert response.status_code == 200
+
     response = await logged_in_client.patch(
         url=f"{prefix_users}/me",
         json={"first_name": new_first_name},
@@ -44,6 +50,11 @@ async def test_update_current_user_profile(
 
     assert json["first_name"] == new_first_name
 
+    # Кэш токенов сброшен — /me возвращает актуальные данные
+    response = await logged_in_client.get(url=f"{prefix_users}/me")
+    assert response.status_code == 200
+    assert response.json()["first_name"] == new_first_name
+
 
 @pytest.mark.anyio
 async def test_update_current_user_profile_invalid_email(
@@ -88,3 +99,37 @@ async def test_get_current_user_profile_unauthorized(
     """
     response = await client.get(url=f"{prefix_users}/me")
     assert response.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_update_password_with_cached_user(
+    redis_token_cache: TokenCache,
+    logged_in_client: AsyncClient,
+    registered_user: dict[str, Any],
+    prefix_auth: str,
+    prefix_users: str,
+):
+    """
+    Тест: хеш пароля не хранится в кэше токенов, смена пароля через /me
+    для пользователя из кэша работает.
+    """
+    response = await logged_in_client.get(url=f"{prefix_users}/me")
+    assert response.status_code == 200
+    token = logged_in_client.cookies["fastapiusersauth"]
+    entry = redis_token_cache.local.get(redis_token_cache._token_key(token))
+    assert entry["user"]["email"] == registered_user["email"]
+    assert "hashed_password" not in entry["user"]
+
+    new_password = "New-password-123"
+    response = await logged_in_client.patch(
+        url=f"{prefix_users}/me",
+        json={"password": new_password, "first_name": registered_user["first_name"]},
+    )
+    assert response.status_code == 200
+
+    response = await logged_in_client.post(
+        url=f"{prefix_auth}/login",
+        data={"username": registered_user["email"], "password": new_password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 204
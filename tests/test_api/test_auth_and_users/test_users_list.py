@@ -1,6 +1,36 @@
+import orjson
 import pytest
 
+from types import SimpleNamespace
+
 from httpx import AsyncClient
+from faker import Faker
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import User
+from schemas.pagination import CursorPage
+from schemas.user import UserRead
+from utils.cursor import encode_cursor
+from utils.serialization import trusted_response
+
+
+faker = Faker()
+
+
+async def create_users(session: AsyncSession, count: int) -> list[User]:
+    """Создаёт `count` пользователей напрямую в БД."""
+    users = [
+        User(
+            email=faker.unique.email(),
+            hashed_password=faker.password(),
+            first_name=faker.first_name(),
+        )
+        for _ in range(count)
+    ]
+    session.add_all(users)
+    await session.commit()
+    return users
 
 
 @pytest.mark.anyio
@@ -13,7 +43,7 @@ async def test_get_users_list_unauthorized(
     """
     response = await client.get(url=prefix_users)
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["items"], list)
 
 
 @pytest.mark.anyio
@@ -26,4 +56,122 @@ async def test_get_users_list_authorized(
     """
     response = await logged_in_client.get(url=prefix_users)
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["items"], list)
+
+
+@pytest.mark.anyio
+async def test_get_users_list_pagination(
+    client: AsyncClient,
+    prefix_users: str,
+    test_session: AsyncSession,
+):
+    """
+    Список отдаётся страницами, следующая страница запрашивается по `next_cursor`.
+    """
+    await create_users(test_session, 3)
+
+    response = await client.get(url=prefix_users, params={"limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["items"]) == 2
+    assert first_page["next_cursor"] is not None
+
+    response = await client.get(
+        url=prefix_users,
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert second_page["items"]
+    assert second_page["items"][0]["id"] > first_page["items"][-1]["id"]
+
+
+@pytest.mark.anyio
+async def test_get_users_list_invalid_cursor(
+    client: AsyncClient,
+    prefix_users: str,
+):
+    """
+    Повреждённый курсор — 400.
+    """
+    response = await client.get(url=prefix_users, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "INVALID_CURSOR"
+
+
+@pytest.mark.anyio
+async def test_stream_users_list(
+    client: AsyncClient,
+    prefix_users: str,
+    test_session: AsyncSession,
+):
+    """
+    Потоковая выгрузка отдаёт всех пользователей в формате NDJSON по возрастанию id.
+    """
+    users = await create_users(test_session, 2)
+
+    response = await client.get(url=f"{prefix_users}/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [orjson.loads(line) for line in response.text.splitlines()]
+    ids = [row["id"] for row in rows]
+    assert ids == sorted(ids)
+    assert {user.id for user in users} <= set(ids)
+
+
+@pytest.mark.anyio
+async def test_get_users_list_trusted_response(
+    client: AsyncClient,
+    prefix_users: str,
+    test_session: AsyncSession,
+):
+    """
+    Страница сериализуется из строк БД напрямую; схема ответа остаётся в OpenAPI.
+    """
+    users = await create_users(test_session, 1)
+
+    response = await client.get(
+        url=prefix_users,
+        params={"limit": 1, "cursor": encode_cursor({"id": users[0].id - 1})},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    [item] = response.json()["items"]
+    assert item == {
+        "id": users[0].id,
+        "email": users[0].email,
+        "is_active": True,
+        "is_superuser": False,
+        "is_verified": False,
+        "first_name": users[0].first_name,
+    }
+    assert "hashed_password" not in item
+
+    openapi = (await client.get("/openapi.json")).json()
+    content = openapi["paths"][prefix_users]["get"]["responses"]["200"]["content"]
+    assert content["application/json"]["schema"]["$ref"].endswith("CursorPage_UserRead_")
+
+
+def test_trusted_response_validate():
+    """
+    Без валидации тело ответа совпадает с валидированным; `validate=True` проверяет данные.
+    """
+    row = SimpleNamespace(
+        id=1,
+        email="user@example.com",
+        hashed_password="hash",
+        is_active=True,
+        is_superuser=False,
+        is_verified=True,
+        first_name="Иван",
+    )
+    page = {"items": [row]}
+    trusted = trusted_response(CursorPage[UserRead], page)
+    validated = trusted_response(CursorPage[UserRead], page, validate=True)
+    assert trusted.body == validated.body
+    assert orjson.loads(trusted.body)["next_cursor"] is None
+
+    row.email = "not-an-email"
+    with pytest.raises(ValidationError):
+        trusted_response(CursorPage[UserRead], page, validate=True)
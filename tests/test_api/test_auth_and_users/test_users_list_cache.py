@@ -0,0 +1,129 @@
+import pytest
+
+from fastapi import FastAPI
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.decorator import cache
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import Response
+
+from core.cache import CachedResponse, ResponseCoder
+from core.cache.coder import current_serializer, response_serializer
+from core.cache.decorator import _with_cache_headers, _with_serializer
+from schemas.pagination import CursorPage
+from schemas.user import UserRead
+from utils.serialization import trusted_response
+
+
+def cached(func):
+    """`@cache` с сериализацией результата по модели ответа (как в `conditional_cache`)."""
+    return _with_serializer(cache(expire=60)(func), func)
+
+
+def make_page() -> CursorPage[UserRead]:
+    return CursorPage[UserRead](
+        items=[
+            UserRead(
+                id=1,
+                email="user@example.com",
+                first_name="Иван",
+                is_active=True,
+                is_superuser=False,
+                is_verified=True,
+            )
+        ],
+        next_cursor="abc",
+    )
+
+
+@pytest.fixture
+async def cached_client():
+    """Приложение с эндпоинтом, закэшированным через `ResponseCoder`."""
+    calls = []
+    app = FastAPI()
+
+    @app.get("/users", response_model=CursorPage[UserRead])
+    @_with_cache_headers
+    @cached
+    async def users() -> CursorPage[UserRead]:
+        calls.append(1)
+        return make_page()
+
+    @app.get("/users/trusted", response_model=CursorPage[UserRead])
+    @_with_cache_headers
+    @cached
+    async def trusted_users() -> Response:
+        calls.append(1)
+        return trusted_response(CursorPage[UserRead], make_page().model_dump())
+
+    FastAPICache.init(InMemoryBackend(), prefix="test", coder=ResponseCoder)
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+    ) as client:
+        yield client, calls
+    FastAPICache.reset()
+
+
+def test_response_coder_roundtrip():
+    """
+    В кэше хранится тело ответа; декодирование возвращает его без изменений.
+    """
+    page = make_page()
+    token = current_serializer.set(response_serializer(None, CursorPage[UserRead]))
+    try:
+        data = ResponseCoder.encode(page)
+    finally:
+        current_serializer.reset(token)
+    assert data == page.model_dump_json(by_alias=True).encode()
+
+    response = ResponseCoder.decode_as_type(data, type_=CursorPage[UserRead])
+    assert isinstance(response, CachedResponse)
+    assert response.body == data
+    assert response.media_type == "application/json"
+    assert ResponseCoder.encode(response) == data
+
+
+@pytest.mark.anyio
+async def test_cache_hit_returns_stored_bytes(cached_client):
+    """
+    Попадание отдаёт сохранённые байты с заголовками кэша, не вызывая эндпоинт.
+    """
+    client, calls = cached_client
+
+    miss = await client.get("/users")
+    assert miss.status_code == 200
+    assert miss.headers["X-FastAPI-Cache"] == "MISS"
+
+    hit = await client.get("/users")
+    assert hit.status_code == 200
+    assert hit.headers["X-FastAPI-Cache"] == "HIT"
+    assert hit.headers["ETag"] == miss.headers["ETag"]
+    assert hit.headers["content-type"] == "application/json"
+    assert hit.content == miss.content
+    assert len(calls) == 1
+
+    not_modified = await client.get(
+        "/users",
+        headers={"If-None-Match": hit.headers["ETag"]},
+    )
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.anyio
+async def test_cache_trusted_response(cached_client):
+    """
+    Готовый ответ `trusted_response` кэшируется как есть и получает заголовки кэша при промахе.
+    """
+    client, calls = cached_client
+
+    miss = await client.get("/users/trusted")
+    assert miss.status_code == 200
+    assert miss.headers["X-FastAPI-Cache"] == "MISS"
+    assert miss.content == make_page().model_dump_json(by_alias=True).encode()
+
+    hit = await client.get("/users/trusted")
+    assert hit.headers["X-FastAPI-Cache"] == "HIT"
+    assert hit.headers["ETag"] == miss.headers["ETag"]
+    assert hit.content == miss.content
+    assert len(calls) == 1
@@ -0,0 +1,93 @@
+import pytest
+
+from fastapi import FastAPI
+from fastapi_cache import FastAPICache
+from httpx import ASGITransport, AsyncClient
+
+from core.cache import (
+    CacheInvalidator,
+    LRUCache,
+    ResponseCoder,
+    TieredBackend,
+    conditional_cache,
+)
+from models import User
+from schemas.user import UserRead
+
+
+class UserWithSecret(UserRead):
+    """Схема шире модели ответа: лишнее поле не должно попасть в кэш."""
+
+    secret: str
+
+
+def make_user() -> User:
+    return User(
+        id=1,
+        email="coder@example.com",
+        first_name="Иван",
+        hashed_password="hash",
+        is_active=True,
+        is_superuser=False,
+        is_verified=True,
+    )
+
+
+@pytest.fixture
+def cache_app(fake_redis, monkeypatch):
+    """Приложение с закэшированными `conditional_cache` эндпоинтами поверх `FakeRedis`."""
+    monkeypatch.setattr("core.cache.decorator._cache_active", lambda: True)
+    invalidator = CacheInvalidator(local=LRUCache(max_size=100, ttl=60), channel="test:invalidate")
+    FastAPICache.init(TieredBackend(fake_redis, invalidator), prefix="test", coder=ResponseCoder)
+    app = FastAPI()
+
+    @app.get("/orm", response_model=UserRead)
+    @conditional_cache(expire=10, coalesce=False)
+    async def orm_user():
+        return make_user()
+
+    @app.get("/wider")
+    @conditional_cache(expire=10, coalesce=False)
+    async def wider_user() -> UserRead:
+        return UserWithSecret(**UserRead.model_validate(make_user()).model_dump(), secret="s3cr3t")
+
+    @app.get("/untyped", response_model=None)
+    @conditional_cache(expire=10, coalesce=False)
+    async def untyped():
+        return {"value": 1}
+
+    yield app
+    FastAPICache.reset()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/orm", "/wider"])
+async def test_cached_body_serialized_by_response_model(fake_redis, cache_app, path: str):
+    """
+    Результат сериализуется по `response_model` маршрута: ORM-объект кэшируется,
+    а поля вне модели ответа не попадают ни в кэш, ни в ответ из кэша.
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app=cache_app), base_url="http://test"
+    ) as client:
+        miss = await client.get(path)
+        hit = await client.get(path)
+
+    assert miss.status_code == hit.status_code == 200
+    assert hit.headers["x-fastapi-cache"] == "HIT"
+    assert hit.json() == miss.json() == UserRead.model_validate(make_user()).model_dump()
+    (cached,) = [value for key, value in fake_redis.data.items() if key.startswith("test:")]
+    assert b"secret" not in cached
+    assert b"hashed_password" not in cached
+
+
+@pytest.mark.anyio
+async def test_result_without_response_model_not_cached(fake_redis, cache_app):
+    """Результат маршрута без `response_model` не кэшируется по типу значения."""
+    transport = ASGITransport(app=cache_app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/untyped")).status_code == 500
+    assert not [key for key in fake_redis.data if key.startswith("test:")]
+
+    with pytest.raises(TypeError, match="response_model"):
+        ResponseCoder.encode({"value": 1})
@@ -0,0 +1,123 @@
+import asyncio
+
+import orjson
+import pytest
+
+from core.cache import CacheInvalidator, CacheTags, LRUCache, TieredBackend
+from core.cache import invalidation
+
+
+@pytest.fixture
+def invalidator() -> CacheInvalidator:
+    """Инвалидатор с активной (условно) подпиской."""
+    invalidator = CacheInvalidator(local=LRUCache(max_size=100, ttl=60), channel="test:invalidate")
+    invalidator._subscribed = True
+    return invalidator
+
+
+def invalidation_message(*keys: str) -> bytes:
+    return orjson.dumps({"keys": list(keys), "prefix": None})
+
+
+@pytest.mark.anyio
+async def test_tag_version_read_before_invalidation_not_cached(fake_redis, invalidator):
+    """
+    Версия тега, прочитанная из Redis до инвалидации (ответ MGET пришёл после
+    сообщения), не попадает в L1: следующий запрос читает новую версию.
+    """
+    tags = CacheTags(invalidator=invalidator, prefix="test:tags")
+    mget = fake_redis.mget
+
+    async def mget_racing_invalidation(keys):
+        values = await mget(keys)
+        # Другой воркер инвалидирует тег, пока ответ MGET ещё в пути
+        await fake_redis.incr("test:tags:users:list")
+        invalidator._handle(invalidation_message("test:tags:users:list"))
+        return values
+
+    fake_redis.mget = mget_racing_invalidation
+    assert await tags.versions(["users:list"]) == [0]
+    assert invalidator.local.get("test:tags:users:list") is None
+
+    fake_redis.mget = mget
+    assert await tags.versions(["users:list"]) == [1]
+    assert invalidator.local.get("test:tags:users:list") == 1
+
+
+@pytest.mark.anyio
+async def test_backend_value_read_before_invalidation_not_cached(
+    fake_redis, monkeypatch, invalidator
+):
+    """`TieredBackend` не кладёт в L1 значение, прочитанное до инвалидации ключа."""
+    backend = TieredBackend(fake_redis, invalidator)
+    await fake_redis.set("cache:key", b"old", ex=60)
+    pipeline_class = type(fake_redis.pipeline())
+    execute = pipeline_class.execute
+
+    async def execute_racing_invalidation(pipe):
+        result = await execute(pipe)
+        await fake_redis.set("cache:key", b"new", ex=60)
+        invalidator._handle(invalidation_message("cache:key"))
+        return result
+
+    monkeypatch.setattr(pipeline_class, "execute", execute_racing_invalidation)
+    assert await backend.get_with_ttl("cache:key") == (60, b"old")
+    assert invalidator.local.get("cache:key") is None
+
+    monkeypatch.setattr(pipeline_class, "execute", execute)
+    assert await backend.get_with_ttl("cache:key") == (60, b"new")
+    assert invalidator.local.get("cache:key")[1] == b"new"
+
+
+def test_malformed_messages_ignored(invalidator):
+    """Некорректные сообщения пропускаются и не ломают подписку."""
+    invalidator.local.set("key", 1)
+    for data in (b"not json", b"[1, 2]", b"42"):
+        invalidator._handle(data)
+    assert invalidator.local.get("key") == 1
+
+    invalidator._handle(invalidation_message("key"))
+    assert invalidator.local.get("key") is None
+
+
+class FakePubSub:
+    """Подписка, которая в первый раз падает с ошибкой не из Redis."""
+
+    attempts = 0
+
+    def __init__(self, invalidator: CacheInvalidator) -> None:
+        self.invalidator = invalidator
+
+    async def subscribe(self, channel: str) -> None:
+        FakePubSub.attempts += 1
+
+    async def listen(self):
+        if FakePubSub.attempts == 1:
+            raise RuntimeError("unexpected")
+        yield {"data": invalidation_message("key")}
+        await asyncio.Event().wait()
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.mark.anyio
+async def test_listener_survives_unexpected_errors(fake_redis, monkeypatch, invalidator):
+    """Исключение, не связанное с Redis, не останавливает инвалидацию: подписка восстанавливается."""
+    invalidator._subscribed = False
+    FakePubSub.attempts = 0
+    fake_redis.pubsub = lambda **kwargs: FakePubSub(invalidator)
+    sleep = asyncio.sleep
+    monkeypatch.setattr(invalidation.asyncio, "sleep", lambda delay: sleep(0))
+
+    invalidator.start()
+    try:
+        for _ in range(100):
+            if invalidator.active:
+                break
+            await sleep(0)
+        assert FakePubSub.attempts == 2
+        assert invalidator.active
+    finally:
+        monkeypatch.undo()
+        await invalidator.stop()
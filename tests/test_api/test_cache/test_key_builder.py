@@ -0,0 +1,78 @@
+import pytest
+
+from core.cache.key_builder import ParamsKeyBuilder, make_key_builder
+from models import User
+from schemas.user import UserRead
+
+
+async def get_users_list(users_db, limit, cursor):
+    """Эндпоинт: построителю нужны только его модуль, имя и параметры."""
+
+
+async def get_report(filters, tags):
+    """Эндпоинт со сложными параметрами."""
+
+
+def build(builder: ParamsKeyBuilder, func=get_users_list, **kwargs) -> str:
+    return builder(func, "test:users", request=None, response=None, args=(), kwargs=kwargs)
+
+
+def test_key_is_deterministic():
+    """Один и тот же набор аргументов даёт один и тот же ключ (в том числе в другом построителе)."""
+    builder = make_key_builder("limit", "cursor")
+    key = build(builder, limit=50, cursor="abc", users_db=object())
+
+    assert key == build(builder, limit=50, cursor="abc", users_db=object())
+    assert key == build(make_key_builder("limit", "cursor"), cursor="abc", limit=50)
+    assert key.startswith(f"test:users:{__name__}:get_users_list:")
+    assert key != build(builder, limit=50, cursor="abd")
+
+
+def test_key_depends_on_parameter_order_not_kwargs_order():
+    """
+    Порядок аргументов вызова и ключей словарей не влияет на ключ;
+    порядок параметров построителя и их значения — влияют.
+    """
+    builder = make_key_builder("filters", "tags")
+    key = build(builder, get_report, filters={"a": 1, "b": 2}, tags={"x", "y"})
+
+    assert key == build(builder, get_report, tags={"y", "x"}, filters={"b": 2, "a": 1})
+    assert key != build(
+        make_key_builder("tags", "filters"), get_report, filters={"a": 1, "b": 2}, tags={"x", "y"}
+    )
+
+    swapped = make_key_builder("limit", "cursor")
+    assert build(swapped, limit=1, cursor=2) != build(swapped, limit=2, cursor=1)
+
+
+def test_pydantic_models_are_canonical():
+    """Модели Pydantic кодируются по значениям полей."""
+    user = UserRead(
+        id=1,
+        email="user@example.com",
+        first_name="Иван",
+        is_active=True,
+        is_superuser=False,
+        is_verified=True,
+    )
+    builder = make_key_builder("user")
+    assert build(builder, user=user) == build(builder, user=user.model_copy())
+
+
+def test_orm_objects_rejected():
+    """ORM-объект нельзя однозначно закодировать: построитель сообщает об ошибке, а не использует `repr()`."""
+    builder = make_key_builder("user")
+    with pytest.raises(TypeError, match="User"):
+        build(builder, user=User(email="orm@example.com", hashed_password="hash"))
+
+
+def test_bound_builder_uses_prefix_computed_at_decoration():
+    """Привязанный к эндпоинту построитель использует префикс, вычисленный при декорировании."""
+    builder = make_key_builder("limit").bind(get_users_list)
+    assert builder.func_prefix == f"{__name__}:get_users_list"
+
+    async def wrapper(*args, **kwargs): ...
+
+    # Префикс не зависит от функции, переданной при вызове (например, обёртки `@cache`)
+    assert build(builder, wrapper, limit=10) == build(make_key_builder("limit"), limit=10)
+    assert build(make_key_builder().bind(get_users_list)) == f"test:users:{__name__}:get_users_list"
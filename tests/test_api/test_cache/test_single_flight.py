@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi_cache import FastAPICache
+from httpx import ASGITransport, AsyncClient
+
+from core.cache import (
+    CacheInvalidator,
+    LRUCache,
+    ResponseCoder,
+    TieredBackend,
+    conditional_cache,
+)
+from core.cache.single_flight import MISSING, SingleFlight
+
+
+@pytest.fixture
+def flights(fake_redis, monkeypatch) -> SingleFlight:
+    """`SingleFlight` поверх `FakeRedis`, подставленный в декоратор и бэкенд кэша."""
+    flights = SingleFlight(lock_ttl=5, poll_interval=0.01)
+    monkeypatch.setattr("core.cache.decorator.single_flight", flights)
+    monkeypatch.setattr("core.cache.backend.single_flight", flights)
+    return flights
+
+
+@pytest.fixture
+def cache_app(fake_redis, flights, monkeypatch):
+    """
+    Приложение с эндпоинтом, закэшированным `conditional_cache`
+    (single-flight и stale-while-revalidate) поверх `FakeRedis`.
+    """
+    monkeypatch.setattr("core.cache.decorator._cache_active", lambda: True)
+    invalidator = CacheInvalidator(local=LRUCache(max_size=100, ttl=60), channel="test:invalidate")
+    FastAPICache.init(TieredBackend(fake_redis, invalidator), prefix="test", coder=ResponseCoder)
+
+    state = {"calls": 0, "version": "v1", "release": asyncio.Event()}
+    state["release"].set()
+    app = FastAPI()
+
+    @app.get("/report")
+    @conditional_cache(expire=10, stale_ttl=60)
+    async def report() -> dict:
+        state["calls"] += 1
+        await state["release"].wait()
+        return {"version": state["version"]}
+
+    yield app, state
+    FastAPICache.reset()
+
+
+def data_sets(fake_redis) -> list[str]:
+    """Перехватывает `SET` записей кэша (без блокировок)."""
+    keys: list[str] = []
+    set_ = fake_redis.set
+
+    async def counting_set(key, value, **kwargs):
+        if not key.endswith((":lock", ":refresh")):
+            keys.append(key)
+        return await set_(key, value, **kwargs)
+
+    fake_redis.set = counting_set
+    return keys
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_compute_and_store_once(fake_redis, cache_app):
+    """
+    Одновременные промахи вызывают эндпоинт один раз, а запись сохраняется
+    в кэш один раз: `@cache` не сохраняет её повторно ни за владельца, ни за ожидающих.
+    """
+    app, state = cache_app
+    sets = data_sets(fake_redis)
+    state["release"].clear()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        requests = [asyncio.create_task(client.get("/report")) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        state["release"].set()
+        responses = await asyncio.gather(*requests)
+
+    assert [response.json() for response in responses] == [{"version": "v1"}] * 5
+    assert state["calls"] == 1
+    assert len(sets) == 1
+    # Блокировка single-flight снята
+    assert not [key for key in fake_redis.data if key.endswith(":lock")]
+
+
+@pytest.mark.anyio
+async def test_stale_entry_refreshed_after_response(fake_redis, flights, cache_app):
+    """
+    Устаревшая запись отдаётся сразу, обновляется после ответа одним запросом,
+    а блокировка обновления снимается.
+    """
+    app, state = cache_app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/report")).json() == {"version": "v1"}
+        (key,) = [key for key in fake_redis.data if key.startswith("test:")]
+        assert fake_redis.expires[key] == 70
+
+        # Срок свежести истёк, запись ещё можно отдавать устаревшей
+        fake_redis.expires[key] = 30
+        state["version"] = "v2"
+
+        response = await client.get("/report")
+        assert response.json() == {"version": "v1"}
+        assert response.headers["cache-control"] == "max-age=0"
+
+        # Фоновое обновление выполнено после ответа
+        assert state["calls"] == 2
+        assert fake_redis.expires[key] == 70
+        assert f"{key}:refresh" not in fake_redis.data
+        assert not flights._refreshing
+
+        assert (await client.get("/report")).json() == {"version": "v2"}
+        assert state["calls"] == 2
+
+
+@pytest.mark.anyio
+async def test_refresh_lock_is_exclusive(fake_redis, flights):
+    """Обновлять устаревшую запись может только один запрос, пока блокировка не снята."""
+    token = await flights.try_refresh("key")
+    assert token is not None
+    assert await flights.try_refresh("key") is None
+
+    other_worker = SingleFlight(lock_ttl=5)
+    assert await other_worker.try_refresh("key") is None
+
+    await flights.release_refresh("key", token)
+    assert "key:refresh" not in fake_redis.data
+    assert await other_worker.try_refresh("key") is not None
+
+
+@pytest.mark.anyio
+async def test_waiter_reads_value_computed_by_other_worker(fake_redis, flights):
+    """Пока блокировку держит другой воркер, запрос ждёт его результат в кэше."""
+    await fake_redis.set("key:lock", "other-worker")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return "computed"
+
+    async def load_cached():
+        value = await fake_redis.get("key")
+        return MISSING if value is None else value
+
+    async def other_worker_stores():
+        await asyncio.sleep(0.03)
+        await fake_redis.set("key", "from-other-worker")
+
+    task = asyncio.create_task(other_worker_stores())
+    assert await flights.run("key", compute, load_cached) == "from-other-worker"
+    await task
+    assert not calls
@@ -0,0 +1,98 @@
+import pytest
+
+from core.cache import CacheInvalidator, CacheTags, LRUCache, conditional_cache
+from core.cache.key_builder import tagged_key_builder
+from core.cache.tags import format_tags, validate_tags
+
+
+@pytest.fixture
+def tags() -> CacheTags:
+    """Теги с локальным уровнем (подписка на инвалидации считается активной)."""
+    invalidator = CacheInvalidator(local=LRUCache(max_size=100, ttl=60), channel="test:invalidate")
+    invalidator._subscribed = True
+    return CacheTags(invalidator=invalidator, prefix="test:tags")
+
+
+def test_format_tags():
+    """Шаблоны тегов заполняются аргументами эндпоинта, обычные теги не изменяются."""
+    assert format_tags(("users:list", "user:{id}"), {"id": 42}) == ["users:list", "user:42"]
+
+
+def test_validate_tags():
+    """Шаблоны проверяются по сигнатуре эндпоинта."""
+
+    async def endpoint(id: int, user: object) -> None: ...
+
+    validate_tags(("users:list", "user:{id}", "owner:{user.id}"), endpoint)
+
+    with pytest.raises(ValueError, match="user_id"):
+        validate_tags(("user:{user_id}",), endpoint)
+    with pytest.raises(ValueError):
+        validate_tags(("user:{}",), endpoint)
+    with pytest.raises(ValueError, match="Некорректный"):
+        validate_tags(("user:{id",), endpoint)
+
+    async def with_kwargs(**kwargs) -> None: ...
+
+    validate_tags(("user:{user_id}",), with_kwargs)
+
+
+def test_conditional_cache_validates_tags_on_decoration():
+    """Ошибка в шаблоне тега обнаруживается при декорировании, а не при запросе."""
+    with pytest.raises(ValueError, match="user_id"):
+
+        @conditional_cache(expire=60, tags=("user:{user_id}",))
+        async def get_user(id: int) -> None: ...
+
+    @conditional_cache(expire=60, tags=("user:{id}",))
+    async def get_user_by_id(id: int) -> None: ...
+
+
+@pytest.mark.anyio
+async def test_versions_and_invalidate(fake_redis, tags: CacheTags):
+    """
+    Инвалидация увеличивает версию тега в Redis и удаляет её из L1;
+    прочитанные версии запоминаются в L1.
+    """
+    assert await tags.versions(["users:list", "user:1"]) == [0, 0]
+    assert tags.invalidator.local.get("test:tags:users:list") == 0
+
+    await tags.invalidate("users:list")
+    assert fake_redis.data["test:tags:users:list"] == 1
+    assert tags.invalidator.local.get("test:tags:users:list") is None
+    assert len(fake_redis.published) == 1
+
+    assert await tags.versions(["users:list", "user:1"]) == [1, 0]
+
+    # Версии из L1 не требуют обращения к Redis
+    fake_redis.available = False
+    assert await tags.version_suffix(["users:list", "user:1"]) == "v1.0"
+
+
+@pytest.mark.anyio
+async def test_version_suffix_without_redis(fake_redis, tags: CacheTags):
+    """Без Redis суффикс случайный: запрос промахивается мимо кэша."""
+    fake_redis.available = False
+    first = await tags.version_suffix(["users:list"])
+    second = await tags.version_suffix(["users:list"])
+    assert first.startswith("miss-")
+    assert first != second
+
+
+@pytest.mark.anyio
+async def test_tagged_key_builder(fake_redis, monkeypatch, tags: CacheTags):
+    """Ключ записи содержит версии её тегов и меняется после инвалидации."""
+    monkeypatch.setattr("core.cache.key_builder.cache_tags", tags)
+
+    def base_builder(func, namespace, *, request=None, response=None, args, kwargs):
+        return f"{namespace}:{kwargs['id']}"
+
+    builder = tagged_key_builder(base_builder, ("users:list", "user:{id}"))
+
+    async def build(id: int) -> str:
+        return await builder(lambda: None, "ns", args=(), kwargs={"id": id})
+
+    assert await build(1) == "ns:1:v0.0"
+    await tags.invalidate("user:1")
+    assert await build(1) == "ns:1:v0.1"
+    assert await build(2) == "ns:2:v0.0"
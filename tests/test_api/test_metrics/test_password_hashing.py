@@ -0,0 +1,41 @@
+import asyncio
+import pytest
+
+from httpx import AsyncClient
+
+from core.auth.password_helper import ExecutorPasswordHelper
+
+
+@pytest.mark.anyio
+async def test_password_hashing_metrics_superuser(
+    superuser_client: AsyncClient,
+    prefix_metrics: str,
+):
+    """
+    Суперпользователь получает статистику пула хеширования паролей
+    (вход суперпользователя уже прошёл через пул).
+    """
+    response = await superuser_client.get(url=f"{prefix_metrics}/password-hashing")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["executor"] == "thread"
+    assert data["duration"]["count"] > 0
+
+
+@pytest.mark.anyio
+async def test_password_helper_concurrency_cap():
+    """
+    Одновременно выполняется не больше `max_concurrency` операций, остальные ждут в очереди.
+    """
+    helper = ExecutorPasswordHelper(max_workers=2, max_concurrency=1)
+    try:
+        hashes = await asyncio.gather(*(helper.hash_async("secret") for _ in range(3)))
+        assert helper.max_waiting == 2
+        assert helper.stats()["duration"]["count"] == 3
+
+        verified, _ = await helper.verify_and_update_async("secret", hashes[0])
+        assert verified
+        verified, _ = await helper.verify_and_update_async("wrong", hashes[0])
+        assert not verified
+    finally:
+        helper.shutdown()
@@ -0,0 +1,68 @@
+import pytest
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from httpx import AsyncClient
+
+from core.auth import tasks
+from core.config import settings
+from core.scheduler import ExclusiveJob
+
+
+@pytest.mark.anyio
+async def test_exclusive_job_records_last_run(monkeypatch: pytest.MonkeyPatch):
+    """
+    Задача выполняется и сохраняет время, длительность и результат последнего запуска.
+    """
+    monkeypatch.setattr(settings.scheduler, "distributed", False)
+    func = AsyncMock()
+    job = ExclusiveJob("test_job", func, timedelta(hours=1))
+
+    await job()
+
+    func.assert_awaited_once()
+    stats = await job.stats()
+    assert stats["status"] == "ok"
+    assert stats["runs"] == 1
+    assert stats["duration"] >= 0
+    assert stats["last_run_at"] is not None
+
+
+@pytest.mark.anyio
+async def test_exclusive_job_skipped_without_lock(monkeypatch: pytest.MonkeyPatch):
+    """
+    Если блокировку захватить нельзя (Redis недоступен), задача не выполняется.
+    """
+    monkeypatch.setattr(settings.scheduler, "distributed", True)
+    monkeypatch.setattr(
+        "core.scheduler.RedisLock.acquire",
+        AsyncMock(return_value=False),
+    )
+    func = AsyncMock()
+    job = ExclusiveJob("test_job", func, timedelta(hours=1))
+
+    await job()
+
+    func.assert_not_awaited()
+    assert job.skipped == 1
+
+
+@pytest.mark.anyio
+async def test_scheduler_metrics_superuser(
+    superuser_client: AsyncClient,
+    prefix_metrics: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    Суперпользователь получает состояние фоновых задач.
+    """
+    monkeypatch.setattr(settings.scheduler, "distributed", False)
+    monkeypatch.setitem(
+        tasks.exclusive_jobs,
+        "test_job",
+        ExclusiveJob("test_job", AsyncMock(), timedelta(hours=1)),
+    )
+    response = await superuser_client.get(url=f"{prefix_metrics}/scheduler")
+    assert response.status_code == 200
+    assert response.json()["test_job"]["runs"] == 0
@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from limits.aio.storage import MemoryStorage
+
+from core.limiter import Limiter
+from exceptions.handlers import register_errors_handlers
+from middleware import CustomRateLimitMiddleware
+
+
+def make_app(limiter: Limiter) -> FastAPI:
+    """Приложение с лимитами на `/api/login` и `/page` и лимитами по умолчанию на остальное."""
+    app = FastAPI(dependencies=[Depends(limiter.check)])
+    app.add_middleware(CustomRateLimitMiddleware)
+    register_errors_handlers(app)
+
+    @app.post("/api/login")
+    @limiter.limit("2/minute")
+    async def login() -> dict:
+        return {}
+
+    @app.get("/api/items")
+    async def items() -> dict:
+        return {}
+
+    @app.get("/page")
+    @limiter.limit("1/minute")
+    async def page() -> dict:
+        return {}
+
+    @app.get("/api/health")
+    @limiter.exempt
+    async def health() -> dict:
+        return {}
+
+    return app
+
+
+@pytest.mark.anyio
+async def test_limits_shared_between_workers():
+    """
+    Два воркера (два ограничителя) с общим хранилищем считают один лимит:
+    `2/minute` не превращается в `2×N/minute`.
+    """
+    storage = MemoryStorage()
+    workers = []
+    for _ in range(2):
+        limiter = Limiter(default_limits=["3/minute"])
+        limiter._limiter = type(limiter._limiter)(storage)
+        workers.append(make_app(limiter))
+
+    clients = [
+        AsyncClient(transport=ASGITransport(app=app), base_url="http://test") for app in workers
+    ]
+    try:
+        assert (await clients[0].post("/api/login")).status_code == 200
+        assert (await clients[1].post("/api/login")).status_code == 200
+
+        response = await clients[0].post("/api/login")
+        assert response.status_code == 429
+        assert response.json() == {"detail": "Слишком много запросов, попробуйте позже."}
+        assert (await clients[1].post("/api/login")).status_code == 429
+
+        # Лимиты по умолчанию считаются для каждого эндпоинта отдельно
+        for client in (*clients, clients[0]):
+            assert (await client.get("/api/items")).status_code == 200
+        assert (await clients[1].get("/api/items")).status_code == 429
+
+        for _ in range(5):
+            assert (await clients[0].get("/api/health")).status_code == 200
+
+        # Веб-страницы при превышении лимита перенаправляют на `/limit-exceeded`
+        assert (await clients[0].get("/page")).status_code == 200
+        response = await clients[1].get("/page")
+        assert response.status_code == 307
+        assert response.headers["location"] == "/limit-exceeded"
+    finally:
+        for client in clients:
+            await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_in_memory_fallback_when_redis_unavailable():
+    """
+    При недоступном Redis лимиты продолжают действовать: счётчики временно
+    ведутся в памяти процесса, а Redis пробуется снова через `retry_interval`.
+    """
+    limiter = Limiter(
+        storage_uri="async+redis://127.0.0.1:1/0",
+        storage_options={
+            "implementation": "redispy",
+            "wrap_exceptions": True,
+            "socket_timeout": 0.1,
+            "socket_connect_timeout": 0.1,
+        },
+        in_memory_fallback=True,
+        retry_interval=60,
+    )
+    app = make_app(limiter)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.post("/api/login")).status_code == 200
+        assert limiter._strategy() is limiter._fallback
+        assert (await client.post("/api/login")).status_code == 200
+        assert (await client.post("/api/login")).status_code == 429
+
+        # Через `retry_interval` снова используется Redis
+        limiter._storage_down_until = 0
+        assert limiter._strategy() is limiter._limiter
+
+
+@pytest.mark.anyio
+async def test_unavailable_storage_without_fallback_allows_requests():
+    """Без запасного хранилища недоступный Redis не блокирует запросы."""
+    limiter = Limiter(
+        storage_uri="async+redis://127.0.0.1:1/0",
+        storage_options={"implementation": "redispy", "wrap_exceptions": True},
+        in_memory_fallback=False,
+    )
+    app = make_app(limiter)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for _ in range(3):
+            assert (await client.post("/api/login")).status_code == 200
+
+
+class SlowStorage(MemoryStorage):
+    """Хранилище с задержкой ответа: считает одновременные запросы к нему."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def incr(self, *args, **kwargs) -> int:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return await super().incr(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.anyio
+async def test_endpoint_limits_hit_concurrently():
+    """
+    Все лимиты эндпоинта учитываются одним параллельным обращением к хранилищу,
+    а не по одному последовательному запросу на лимит.
+    """
+    storage = SlowStorage()
+    limiter = Limiter()
+    limiter._limiter = type(limiter._limiter)(storage)
+
+    async def login() -> dict:
+        return {}
+
+    limiter.limit("2/minute;5/hour")(login)
+    scope = {"client": ("10.0.0.1", 1234)}
+
+    assert await limiter.hit(scope, login) is None
+    assert storage.peak == 2
+    assert await limiter.hit(scope, login) is None
+    assert str(await limiter.hit(scope, login)) == "2 per 1 minute"
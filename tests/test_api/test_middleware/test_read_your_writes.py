@@ -0,0 +1,91 @@
+import pytest
+import uuid
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core.db_helper import DatabaseHelper, PrimarySession
+from middleware import ReadYourWritesMiddleware
+from models import User
+
+
+@pytest.fixture
+def helper(test_engine) -> DatabaseHelper:
+    """`DatabaseHelper` с репликой; запись идёт в тестовую БД."""
+    helper = DatabaseHelper(
+        url="sqlite+aiosqlite://",
+        replica_urls=["sqlite+aiosqlite://"],
+        read_your_writes_seconds=5,
+    )
+    helper.session_factory = async_sessionmaker(
+        bind=test_engine,
+        sync_session_class=PrimarySession,
+        expire_on_commit=False,
+    )
+    return helper
+
+
+@pytest.mark.anyio
+async def test_read_your_writes_per_client(helper: DatabaseHelper):
+    """
+    После записи основная БД используется для чтения только тем клиентом,
+    который записывал (по cookie), остальные читают из реплики.
+    """
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+
+    @app.get("/read")
+    async def read() -> dict:
+        factory = helper.get_read_session_factory()
+        return {"primary": factory == helper.primary_read_session}
+
+    @app.post("/write")
+    async def write() -> None:
+        async with helper.session_factory() as session:
+            session.add(
+                User(
+                    email=f"ryw-{uuid.uuid4().hex[:8]}@example.com",
+                    hashed_password="hash",
+                    first_name="ryw",
+                )
+            )
+            await session.commit()
+
+    transport = ASGITransport(app=app)
+    async with (
+        AsyncClient(transport=transport, base_url="http://test") as writer,
+        AsyncClient(transport=transport, base_url="http://test") as other,
+    ):
+        response = await writer.get("/read")
+        assert response.json() == {"primary": False}
+        assert "set-cookie" not in response.headers
+
+        response = await writer.post("/write")
+        assert response.status_code == 200
+        assert "last_write" in response.cookies
+
+        assert (await writer.get("/read")).json() == {"primary": True}
+        assert (await other.get("/read")).json() == {"primary": False}
+
+        writer.cookies.set("last_write", "broken")
+        assert (await writer.get("/read")).json() == {"primary": False}
+
+    await helper.dispose()
+
+
+@pytest.mark.anyio
+async def test_read_session_without_replicas_is_readonly(test_engine):
+    """
+    Без реплик сессия для чтения открывается в основной БД, но запись через неё запрещена.
+    """
+    helper = DatabaseHelper(url="sqlite+aiosqlite://")
+    helper.session_factory = async_sessionmaker(bind=test_engine, sync_session_class=PrimarySession)
+
+    async for session in helper.read_session_getter():
+        assert session.info["readonly"]
+        session.add(User(email="readonly@example.com", hashed_password="hash", first_name="ro"))
+        with pytest.raises(RuntimeError):
+            await session.flush()
+
+    await helper.dispose()
@@ -0,0 +1,42 @@
+import pytest
+
+from httpx import AsyncClient
+
+
+SECURITY_HEADERS = {
+    "x-content-type-options": "nosniff",
+    "x-frame-options": "DENY",
+    "x-xss-protection": "1; mode=block",
+    "referrer-policy": "no-referrer",
+    "permissions-policy": "geolocation=(), microphone=(), camera=()",
+}
+
+
+@pytest.mark.anyio
+async def test_security_headers_present(
+    client: AsyncClient,
+    prefix_users: str,
+):
+    """
+    Тест: заголовки безопасности добавляются к обычному ответу (в том числе к ошибке).
+    """
+    response = await client.get(url=f"{prefix_users}/me")
+    assert response.status_code == 401
+
+    for name, value in SECURITY_HEADERS.items():
+        assert response.headers[name] == value
+
+
+@pytest.mark.anyio
+async def test_security_headers_streaming_response(
+    client: AsyncClient,
+    prefix_users: str,
+):
+    """
+    Тест: заголовки безопасности добавляются к потоковому ответу и не дублируются.
+    """
+    response = await client.get(url=f"{prefix_users}/stream")
+    assert response.status_code == 200
+
+    for name, value in SECURITY_HEADERS.items():
+        assert response.headers.get_list(name) == [value]
@@ -0,0 +1,118 @@
+import pytest
+
+from faker import Faker
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import User
+from repositories import CrudManager
+
+
+faker = Faker()
+
+
+def user_rows(count: int, first_name: str) -> list[dict]:
+    return [
+        {
+            "email": faker.unique.email(),
+            "hashed_password": "hash",
+            "first_name": first_name,
+        }
+        for _ in range(count)
+    ]
+
+
+async def count_users(session: AsyncSession, first_name: str) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(User).where(User.first_name == first_name)
+    )
+
+
+@pytest.mark.anyio
+async def test_create_many_in_chunks(test_session: AsyncSession):
+    """
+    Записи вставляются пачками, возвращаются первичные ключи в порядке вставки.
+    """
+    rows = user_rows(7, "bulk-create")
+
+    inserted = await CrudManager(test_session, User).create_many(rows, chunk_size=3)
+
+    assert len(inserted) == 7
+    ids = [row.id for row in inserted]
+    assert ids == sorted(ids)
+    assert await count_users(test_session, "bulk-create") == 7
+
+
+@pytest.mark.anyio
+async def test_create_many_returns_rows_in_items_order(test_session: AsyncSession):
+    """
+    Возвращённые строки идут в порядке `items` (RETURNING с `sort_by_parameter_order`).
+    """
+    rows = list(reversed(user_rows(5, "bulk-order")))
+
+    inserted = await CrudManager(test_session, User).create_many(
+        rows, chunk_size=2, returning=["id", "email"]
+    )
+
+    assert [row.email for row in inserted] == [row["email"] for row in rows]
+
+
+@pytest.mark.anyio
+async def test_upsert_updates_on_conflict(test_session: AsyncSession):
+    """
+    Существующие записи обновляются, новые вставляются.
+    """
+    manager = CrudManager(test_session, User)
+    rows = user_rows(3, "bulk-upsert")
+    await manager.create_many(rows)
+
+    rows = [{**row, "first_name": "bulk-upserted"} for row in rows]
+    rows += user_rows(2, "bulk-upserted")
+    upserted = await manager.upsert(
+        rows,
+        conflict_fields=["email"],
+        update_fields=["first_name"],
+        returning=["email", "first_name"],
+    )
+
+    assert len(upserted) == 5
+    assert {row.first_name for row in upserted} == {"bulk-upserted"}
+    assert await count_users(test_session, "bulk-upsert") == 0
+    assert await count_users(test_session, "bulk-upserted") == 5
+
+    skipped = await manager.upsert(rows[:1], conflict_fields=["email"], update_fields=[])
+    assert skipped == []
+
+
+@pytest.mark.anyio
+async def test_update_and_delete_many(test_session: AsyncSession):
+    """
+    Записи обновляются и удаляются по фильтру без загрузки экземпляров.
+    """
+    manager = CrudManager(test_session, User)
+    await manager.create_many(user_rows(4, "bulk-update"))
+
+    updated = await manager.update_many(
+        {"is_active": False},
+        User.email.like("%@%"),
+        first_name="bulk-update",
+    )
+    assert updated == 4
+
+    deleted = await manager.delete_many(first_name="bulk-update", is_active=False)
+    assert deleted == 4
+    assert await count_users(test_session, "bulk-update") == 0
+
+
+@pytest.mark.anyio
+async def test_bulk_methods_require_filters(test_session: AsyncSession):
+    """
+    Обновление и удаление без условий запрещены.
+    """
+    manager = CrudManager(test_session, User)
+    with pytest.raises(ValueError):
+        await manager.update_many({"is_active": False})
+    with pytest.raises(ValueError):
+        await manager.delete_many()
+    with pytest.raises(ValueError):
+        await manager.delete_many(unknown_field=1)
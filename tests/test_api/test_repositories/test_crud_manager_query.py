@@ -0,0 +1,103 @@
+import pytest
+import uuid
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import User
+from repositories import CrudManager, QuerySpec
+
+
+@dataclass
+class UserBrief:
+    id: int
+    email: str
+
+
+@pytest.fixture(scope="function")
+async def query_users(test_session: AsyncSession) -> tuple[str, list[int]]:
+    """
+    5 пользователей с одинаковым (уникальным для теста) именем;
+    у двух — одинаковое время создания.
+    """
+    name = f"query-{uuid.uuid4().hex[:8]}"
+    now = datetime.now(timezone.utc)
+    created = [now, now - timedelta(hours=1), now - timedelta(hours=1), now - timedelta(hours=2), now]
+    rows = await CrudManager(test_session, User).create_many(
+        {
+            "email": f"{name}-{i}@example.com",
+            "hashed_password": "hash",
+            "first_name": name,
+            "created_at": created_at,
+        }
+        for i, created_at in enumerate(created)
+    )
+    return name, [row.id for row in rows]
+
+
+@pytest.mark.anyio
+async def test_limit_offset_and_projection(test_session: AsyncSession, query_users: tuple[str, list[int]]):
+    """
+    Выборка ограничивается, сортируется и возвращает только нужные поля.
+    """
+    name, ids = query_users
+    manager = CrudManager(test_session, User)
+
+    rows = await manager.get_by_fields(
+        QuerySpec(limit=2, offset=1, order_by=("-id",), columns=("id", "email")),
+        first_name=name,
+    )
+    assert [row.id for row in rows] == sorted(ids, reverse=True)[1:3]
+    assert set(rows[0]._fields) == {"id", "email"}
+
+    briefs = await manager.get_all_by_field(
+        "first_name",
+        name,
+        QuerySpec(columns=("id", "email"), into=UserBrief, order_by=("id",)),
+    )
+    assert [brief.id for brief in briefs] == ids
+    assert all(isinstance(brief, UserBrief) for brief in briefs)
+
+
+@pytest.mark.anyio
+async def test_get_page_keyset(test_session: AsyncSession, query_users: tuple[str, list[int]]):
+    """
+    Страницы по курсору проходят все записи по одному разу, в том числе
+    при одинаковых значениях поля сортировки.
+    """
+    name, ids = query_users
+    manager = CrudManager(test_session, User)
+    spec = QuerySpec(limit=2, order_by=("-created_at",), columns=("id", "created_at"))
+
+    seen = []
+    pages = 0
+    while True:
+        items, next_cursor = await manager.get_page(spec, first_name=name)
+        seen.extend(item.id for item in items)
+        pages += 1
+        if next_cursor is None:
+            break
+        spec.after = next_cursor
+
+    assert pages == 3
+    assert sorted(seen) == ids
+    assert len(seen) == len(set(seen))
+
+    with pytest.raises(ValueError):
+        await manager.get_page(QuerySpec(limit=2, after="broken"), first_name=name)
+    with pytest.raises(ValueError):
+        await manager.get_page(QuerySpec(limit=2, columns=("email",)))
+
+
+@pytest.mark.anyio
+async def test_count(test_session: AsyncSession, query_users: tuple[str, list[int]]):
+    """
+    Подсчёт по условиям; в SQLite оценка совпадает с точным значением.
+    """
+    name, ids = query_users
+    manager = CrudManager(test_session, User)
+
+    assert await manager.count(first_name=name) == 5
+    assert await manager.count(User.id.in_(ids[:2])) == 2
+    assert await manager.count(first_name=name, estimate=True) == 5
@@ -0,0 +1,45 @@
+import pytest
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import User
+from repositories import CrudManager
+
+
+@pytest.mark.anyio
+async def test_lookup_statements_are_cached(test_session: AsyncSession):
+    """
+    Запрос для набора полей строится один раз; значения передаются параметрами,
+    None — через IS NULL.
+    """
+    name = f"stmt-{uuid.uuid4().hex[:8]}"
+    manager = CrudManager(test_session, User)
+    rows = await manager.create_many(
+        {"email": f"{name}-{i}@example.com", "hashed_password": "hash", "first_name": name}
+        for i in range(3)
+    )
+    ids = [row.id for row in rows]
+
+    first, _ = manager._cached_select({"first_name": name, "is_active": True})
+    second, params = manager._cached_select({"first_name": "other", "is_active": False})
+    assert first is second
+    assert params == {"first_name": "other", "is_active": False}
+
+    users = await manager.get_by_fields(first_name=name, is_active=True)
+    assert sorted(user.id for user in users) == ids
+    assert [
+        user.id for user in await manager.get_all_by_field("email", f"{name}-1@example.com")
+    ] == ids[1:2]
+    assert (await manager.get_by_id(ids[2])).email == f"{name}-2@example.com"
+    assert await manager.get_by_id(-1) is None
+
+    null_stmt, params = manager._cached_select({"first_name": None})
+    assert "first_name IS NULL" in str(null_stmt) and params == {}
+    assert await manager.get_by_fields(first_name=None) == []
+
+    with pytest.raises(ValueError):
+        await manager.get_by_fields(unknown=1)
+    assert not any(
+        field == "unknown" for _, shape in CrudManager._statement_cache for field, _ in shape
+    )
@@ -0,0 +1,133 @@
+import pytest
+import uuid
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.dependencies import UnitOfWorkSession
+from core.db_helper import db_helper
+from models import User
+from repositories import CrudManager, unit_of_work
+
+
+class UserIn(BaseModel):
+    email: str
+    hashed_password: str = "hash"
+    first_name: str
+
+
+class UserPatch(BaseModel):
+    hashed_password: str
+
+
+@pytest.mark.anyio
+async def test_unit_of_work_commits_once(test_engine, test_session: AsyncSession):
+    """
+    Внутри единицы работы менеджер только выполняет flush: одна транзакция на блок,
+    серверные значения заполняются без SELECT после INSERT.
+    """
+    name = f"uow-{uuid.uuid4().hex[:8]}"
+    commits = []
+    statements = []
+    event.listen(test_session.sync_session, "after_commit", commits.append)
+    event.listen(
+        test_engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    manager = CrudManager(test_session, User)
+    async with unit_of_work(test_session):
+        assert manager.in_unit_of_work
+        users = [
+            await manager.create(
+                UserIn(email=f"{name}-{i}@example.com", first_name=name)
+            )
+            for i in range(3)
+        ]
+        assert all(
+            user.id is not None and user.created_at is not None for user in users
+        )
+        await manager.update(users[0], UserPatch(hashed_password="updated"))
+        await manager.delete(users[1])
+        assert (
+            await manager.update_many(
+                {"hashed_password": "bulk"}, User.id == users[2].id
+            )
+            == 1
+        )
+        assert commits == []
+
+    assert len(commits) == 1
+    assert not manager.in_unit_of_work
+    # Без SELECT users после INSERT (SELECT access_tokens — каскад при удалении)
+    assert not any(
+        statement.startswith("SELECT") and "FROM users" in statement
+        for statement in statements
+    )
+
+    # update_many не синхронизирует загруженные экземпляры
+    test_session.expunge_all()
+    rows = await manager.get_by_fields(first_name=name)
+    assert sorted((user.id, user.hashed_password) for user in rows) == [
+        (users[0].id, "updated"),
+        (users[2].id, "bulk"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_unit_of_work_rolls_back(test_session: AsyncSession):
+    """
+    При исключении изменения всего блока откатываются.
+    """
+    name = f"uow-{uuid.uuid4().hex[:8]}"
+    manager = CrudManager(test_session, User)
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(test_session):
+            await manager.create(UserIn(email=f"{name}-1@example.com", first_name=name))
+            async with unit_of_work(test_session):
+                await manager.create(
+                    UserIn(email=f"{name}-2@example.com", first_name=name)
+                )
+            raise RuntimeError("boom")
+
+    assert await manager.count(first_name=name) == 0
+
+
+@pytest.mark.anyio
+async def test_unit_of_work_dependency(test_engine, monkeypatch):
+    """
+    Зависимость `UnitOfWorkSession` фиксирует изменения обработчика до отправки ответа.
+    """
+    session_factory = async_sessionmaker(bind=test_engine, expire_on_commit=False)
+    monkeypatch.setattr(db_helper, "session_factory", session_factory)
+    name = f"uow-{uuid.uuid4().hex[:8]}"
+
+    app = FastAPI()
+
+    @app.post("/users")
+    async def create_users(session: UnitOfWorkSession) -> list[int]:
+        manager = CrudManager(session, User)
+        users = [
+            await manager.create(
+                UserIn(email=f"{name}-{i}@example.com", first_name=name)
+            )
+            for i in range(2)
+        ]
+        return [user.id for user in users]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.post("/users")
+    assert response.status_code == 200
+
+    async with session_factory() as session:
+        ids = (
+            await session.scalars(select(User.id).where(User.first_name == name))
+        ).all()
+    assert sorted(ids) == sorted(response.json())